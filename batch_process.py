@@ -0,0 +1,206 @@
+"""
+Headless batch scoring of recorded workout videos.
+
+Runs the ExerciseRecognitionSystem pipeline on video files without a window
+or webcam, fanning the files out across a multiprocessing pool with one
+MediaPipe Pose instance per worker. Results are written as JSON Lines, one
+object per video, with the rep count, per-rep timestamps (video time) and
+throughput stats.
+
+Example:
+    python batch_process.py sessions/*.mp4 --mode 3 --output squats.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2
+
+from config.settings import EXERCISE_MODES
+
+# Per-worker state, created once by _init_worker()
+_worker_system = None
+_worker_clock = None
+_worker_options = None
+
+
+class VideoClock:
+    """Clock that returns the timestamp of the video frame being processed"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _init_worker(options):
+    global _worker_system, _worker_clock, _worker_options
+    # Imported here so the parent process never loads MediaPipe
+    from main import ExerciseRecognitionSystem
+
+    cv2.setNumThreads(1)
+    _worker_clock = VideoClock()
+    # Offline scoring has no frame deadline and no idle time, so every frame gets real inference;
+    # each worker only scores one exercise mode, so it starts in that mode and loads only its
+    # profile's model (one Pose graph per worker)
+    _worker_system = ExerciseRecognitionSystem(clock=_worker_clock, adaptive_inference=False, idle_mode=False,
+                                               warm_models=False, exercise_mode=options["exercise_mode"])
+    _worker_options = options
+
+
+def _reset_system(system, exercise_mode):
+    """Give the shared Pose instance fresh detectors and calibration state for a new file"""
+    system.detectors = {mode: type(detector)() for mode, detector in system.detectors.items()}
+    for mode, detector in system.detectors.items():
+        system.attach_detector(mode, detector)
+    system.exercise_mode = exercise_mode
+    system.calibrating = False
+    system.countdown_start = None
+    system.capture_start = None
+    system.calibration_message = ""
+    system.latest_landmarks = None
+    system.reset_inference_state()
+    system.person_detectors = {}
+    # The previous video's person box must not crop this video's first frames
+    if system.roi is not None:
+        system.roi.reset()
+    system._crop_boxes.clear()
+
+
+def score_video(path):
+    """
+    Score one video file in the current worker.
+
+    Args:
+        path: Path to the video file
+
+    Returns:
+        dict: Rep count, rep timestamps, calibration outcome and throughput stats
+    """
+    system, clock, options = _worker_system, _worker_clock, _worker_options
+    exercise_mode = options["exercise_mode"]
+    _reset_system(system, exercise_mode)
+    detector = system.detectors[exercise_mode]
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return {"file": path, "error": "could not open video"}
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    frames = 0
+    frames_with_pose = 0
+    rep_times = []
+    calibration_requested = False
+    last_count = 0
+    started = time.perf_counter()
+    frame = None
+
+    try:
+        while True:
+            # Decode into the previous frame's buffer
+            ret, frame = cap.read(frame)
+            if not ret:
+                break
+            position_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            clock.now = position_ms / 1000.0 if position_ms > 0 else frames / fps
+            frames += 1
+
+            if not calibration_requested and clock.now >= options["calibration_start"]:
+                system.calibrate_current_detector()
+                system.countdown_seconds = options["countdown"]
+                system.instruction_seconds = min(system.instruction_seconds, options["countdown"])
+                calibration_requested = True
+
+            # Mirroring is applied to the landmarks; there is no display to flip pixels for
+            analysis = system.analyze_frame(frame, mirrored=options["mirror"])
+            if analysis.landmarks is not None:
+                frames_with_pose += 1
+            if system.calibrating:
+                # Only advances the countdown/capture state; the drawn overlay is discarded
+                system.process_calibration(frame)
+
+            if detector.counter != last_count:
+                rep_times.extend([round(clock.now, 3)] * (detector.counter - last_count))
+                last_count = detector.counter
+    finally:
+        cap.release()
+
+    elapsed = time.perf_counter() - started
+    video_seconds = frames / fps
+    return {
+        "file": path,
+        "exercise": EXERCISE_MODES[exercise_mode],
+        "calibrated": bool(detector.calibrated),
+        "calibration_message": system.calibration_message,
+        "rep_count": detector.counter,
+        "rep_times": rep_times,
+        "frames": frames,
+        "frames_with_pose": frames_with_pose,
+        "video_seconds": round(video_seconds, 3),
+        "processing_seconds": round(elapsed, 3),
+        "processing_fps": round(frames / elapsed, 2) if elapsed > 0 else None,
+        "realtime_factor": round(video_seconds / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score recorded workout videos without a window or webcam")
+    parser.add_argument("videos", nargs="+", help="video files to process")
+    parser.add_argument("--mode", type=int, required=True,
+                        choices=[mode for mode in EXERCISE_MODES if mode != 0],
+                        help="exercise mode (see EXERCISE_MODES in config/settings.py)")
+    parser.add_argument("--output", default="batch_results.jsonl",
+                        help="JSON Lines file receiving one result per video")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (one Pose instance each)")
+    parser.add_argument("--calibration-start", type=float, default=0.0,
+                        help="video time in seconds at which calibration is triggered")
+    parser.add_argument("--countdown", type=float, default=10.0,
+                        help="calibration countdown in seconds of video time before capture")
+    parser.add_argument("--no-mirror", action="store_true",
+                        help="do not mirror frames (the live app mirrors the webcam image)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = {
+        "exercise_mode": args.mode,
+        "calibration_start": args.calibration_start,
+        "countdown": args.countdown,
+        "mirror": not args.no_mirror,
+    }
+
+    workers = max(1, min(args.workers, len(args.videos)))
+    started = time.perf_counter()
+    total_frames = 0
+    total_video_seconds = 0.0
+    failures = 0
+
+    with open(args.output, "w") as output, \
+            multiprocessing.Pool(workers, initializer=_init_worker, initargs=(options,)) as pool:
+        for result in pool.imap_unordered(score_video, args.videos):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            if "error" in result:
+                failures += 1
+                print(f"[BATCH] {result['file']}: {result['error']}", file=sys.stderr)
+                continue
+            total_frames += result["frames"]
+            total_video_seconds += result["video_seconds"]
+            print(f"[BATCH] {result['file']}: {result['rep_count']} reps "
+                  f"({result['processing_fps']} fps)")
+
+    elapsed = time.perf_counter() - started
+    print(f"[BATCH] {len(args.videos) - failures}/{len(args.videos)} videos, {total_frames} frames "
+          f"in {elapsed:.1f}s ({total_frames / elapsed:.1f} fps, "
+          f"{total_video_seconds / elapsed:.1f}x realtime) with {workers} workers")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Benchmark suite for the per-frame hot paths.
+
+Each component runs in isolation on synthetic landmark sequences (see
+benchmarks/synthetic.py), so no camera is needed. Results are reported in
+frames per second and compared against a stored baseline; a component slower
+than the baseline by more than the tolerance is flagged as a regression and
+the script exits with status 1.
+
+Usage:
+    python -m benchmarks.run_benchmarks                  # run and compare
+    python -m benchmarks.run_benchmarks --save-baseline  # store this machine's numbers
+    python -m benchmarks.run_benchmarks --only detect    # components whose name contains "detect"
+
+Baselines are machine specific; save one per kiosk/CI hardware type.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generate_motion, RUNNING, PUSHUP, SQUAT, JUMPING_JACK
+from exercise_detectors import (
+    StationaryRunningDetector,
+    PushupDetector,
+    SquatDetector,
+    JumpingJackDetector
+)
+from pose_guide import PoseGuide
+from utils.angle_utils import calculate_angle, calculate_angles
+from utils.landmarks import LEFT_HIP, LEFT_KNEE, LEFT_ANKLE, LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DETECTORS = {
+    RUNNING: ("running", StationaryRunningDetector),
+    PUSHUP: ("pushup", PushupDetector),
+    SQUAT: ("squat", SquatDetector),
+    JUMPING_JACK: ("jumping_jack", JumpingJackDetector),
+}
+
+def measure(run, frames_per_run, min_time=0.5, repeats=3):
+    """
+    Time a benchmark body.
+
+    Args:
+        run: Callable processing frames_per_run frames per call
+        frames_per_run: Frames handled by one call of run
+        min_time: Minimum seconds per repeat; run is called in a loop until reached
+        repeats: Number of repeats; the best one is reported
+
+    Returns:
+        float: Frames per second of the fastest repeat
+    """
+    best = 0.0
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, calls * frames_per_run / elapsed)
+    return best
+
+def _as_frames(sequence):
+    """Per-frame detector inputs: landmark arrays, None where the pose was dropped"""
+    return [None if np.isnan(frame[0, 0]) else frame for frame in sequence]
+
+def _calibrated_detector(detector_class, sequence):
+    detector = detector_class()
+    detector.calibrate(sequence[0])
+    return detector
+
+def landmark_benchmarks(args):
+    """Benchmarks that only need NumPy: angles, detectors, key point extraction"""
+    benchmarks = {}
+    sequences = {mode: generate_motion(mode, frames=args.frames, noise=args.noise,
+                                       dropout=args.dropout, seed=args.seed)[0]
+                 for mode in DETECTORS}
+
+    squat = sequences[SQUAT]
+    points = squat[:, [LEFT_HIP, LEFT_KNEE, LEFT_ANKLE], :2]
+
+    def angle_loop():
+        for a, b, c in points:
+            calculate_angle(a, b, c)
+    benchmarks["calculate_angle"] = (angle_loop, len(points))
+    benchmarks["calculate_angles[sequence]"] = (
+        lambda: calculate_angles(squat, [(LEFT_HIP, LEFT_KNEE, LEFT_ANKLE),
+                                         (LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST)]),
+        len(squat))
+
+    for mode, (name, detector_class) in DETECTORS.items():
+        sequence = sequences[mode]
+        frames = _as_frames(sequence)
+        detector = _calibrated_detector(detector_class, sequence)
+        batch_detector = _calibrated_detector(detector_class, sequence)
+
+        def detect_loop(detector=detector, frames=frames):
+            for frame in frames:
+                detector.detect(frame)
+        benchmarks[f"detect[{name}]"] = (detect_loop, len(frames))
+        benchmarks[f"detect_batch[{name}]"] = (
+            lambda detector=batch_detector, sequence=sequence: detector.detect_batch(sequence),
+            len(sequence))
+
+    guide = PoseGuide()
+    frames = [frame for frame in _as_frames(sequences[SQUAT]) if frame is not None]
+
+    def key_point_loop():
+        for frame in frames:
+            guide.extract_key_points(frame, SQUAT)
+    benchmarks["extract_key_points"] = (key_point_loop, len(frames))
+    return benchmarks
+
+def rendering_benchmarks(args):
+    """Overlay and composition benchmarks; need OpenCV and the main module"""
+    try:
+        import cv2
+        import main
+        from utils.visualization import draw_landmarks, draw_message_bar
+    except ImportError as exc:
+        print(f"[BENCH] skipping rendering benchmarks: {exc}", file=sys.stderr)
+        return {}
+
+    width, height = args.width, args.height
+    sequence = generate_motion(SQUAT, frames=args.frames, noise=args.noise, seed=args.seed)[0]
+    rng = np.random.default_rng(args.seed)
+    frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    benchmarks = {}
+
+    def landmark_loop():
+        for landmarks in sequence[:100]:
+            draw_landmarks(frame, landmarks)
+    benchmarks["draw_landmarks"] = (landmark_loop, 100)
+
+    now = 1000.0
+    system = main.ExerciseRecognitionSystem(clock=lambda: now)
+    system.exercise_mode = SQUAT
+
+    def calibration_phase(seconds_into_countdown):
+        def run():
+            # Pin the calibration state machine at a fixed point of the countdown
+            system.calibrating = True
+            system.capture_start = None
+            system.countdown_start = now - seconds_into_countdown
+            system.process_calibration(frame)
+        return run
+    benchmarks["process_calibration[instructions]"] = (calibration_phase(2.0), 1)
+    benchmarks["process_calibration[countdown]"] = (calibration_phase(8.0), 1)
+
+    processed = frame.copy()
+    system.debug_mode = True
+    for stage in system.timings.STAGES:
+        system.timings.record(stage, 0.01)
+    compositor = main.create_compositor(width, height)
+    benchmarks["compose_canvas"] = (lambda: main.compose_canvas(system, compositor, processed), 1)
+    benchmarks["draw_message_bar"] = (lambda: draw_message_bar(frame, "Hold position! Capturing..."), 1)
+
+    def resize_flip():
+        resized = cv2.resize(frame, (width // 2, height // 2))
+        cv2.flip(resized, 1)
+    benchmarks["resize_flip[half]"] = (resize_flip, 1)
+    benchmarks["prepare_inference_frame"] = (lambda: system.prepare_inference_frame(frame), 1)
+    benchmarks.update(pose_backend_benchmarks(system.prepare_inference_frame(frame).copy()))
+    return benchmarks
+
+def pose_backend_benchmarks(rgb_frame):
+    """
+    Time the caller-side cost of each pose backend: a full inference for the
+    blocking solutions backend, only the submit for the asynchronous tasks backend
+    """
+    from config.settings import POSE_MODEL_VARIANT, POSE_MODEL_DIR, POSE_DELEGATE
+    from inference import create_pose_backend
+
+    benchmarks = {}
+    for name in ("solutions", "tasks"):
+        try:
+            backend = create_pose_backend(name, POSE_MODEL_VARIANT, POSE_MODEL_DIR, delegate=POSE_DELEGATE)
+        except (OSError, ValueError) as exc:
+            print(f"[BENCH] skipping pose backend {name}: {exc}", file=sys.stderr)
+            continue
+        benchmarks[f"pose_backend[{name}]"] = (lambda backend=backend: backend.process(rgb_frame), 1)
+    return benchmarks
+
+def compare(results, baseline, tolerance):
+    """Print a results table; return the names of components that regressed"""
+    regressions = []
+    print(f"{'component':36s} {'frames/s':>14s} {'baseline':>14s} {'ratio':>7s}")
+    for name, fps in results.items():
+        reference = baseline.get(name)
+        if reference:
+            ratio = fps / reference
+            flag = ""
+            if ratio < 1.0 - tolerance:
+                flag = "  REGRESSION"
+                regressions.append(name)
+            print(f"{name:36s} {fps:14,.0f} {reference:14,.0f} {ratio:7.2f}{flag}")
+        else:
+            print(f"{name:36s} {fps:14,.0f} {'-':>14s} {'-':>7s}")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the per-frame hot paths on synthetic motion")
+    parser.add_argument("--only", help="run only components whose name contains this text")
+    parser.add_argument("--frames", type=int, default=900, help="frames per synthetic sequence")
+    parser.add_argument("--noise", type=float, default=0.001, help="landmark jitter (normalized units)")
+    parser.add_argument("--dropout", type=float, default=0.02, help="probability of a frame without pose")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=1120, help="camera area width for rendering benchmarks")
+    parser.add_argument("--height", type=int, default=864, help="camera area height for rendering benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per timing repeat")
+    parser.add_argument("--repeats", type=int, default=3, help="timing repeats; the best is reported")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed slowdown before a component is flagged (0.15 = 15%%)")
+    parser.add_argument("--no-rendering", action="store_true", help="skip OpenCV/MediaPipe benchmarks")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    benchmarks = landmark_benchmarks(args)
+    if not args.no_rendering:
+        benchmarks.update(rendering_benchmarks(args))
+
+    results = {}
+    for name, (run, frames) in benchmarks.items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(run, frames, args.min_time, args.repeats)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"[BENCH] baseline saved to {args.baseline}")
+        return 0
+    if not baseline:
+        print("[BENCH] no baseline found; run with --save-baseline to create one")
+    if regressions:
+        print(f"[BENCH] {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
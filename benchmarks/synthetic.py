@@ -0,0 +1,202 @@
+"""
+Parametric synthetic landmark sequences for benchmarks and offline checks.
+
+generate_motion() produces (T, 33, 4) landmark arrays in the layout of
+utils.landmarks for squats, push-ups, jumping jacks and stationary running,
+with controllable cadence, noise and dropouts. The joints each detector looks
+at follow the real movement (knee and elbow angles, arm abduction, ankle
+spread and lift); the rest of the skeleton stays in a plausible standing or
+plank pose. Frames dropped by the simulated tracker are NaN.
+"""
+import numpy as np
+
+from utils.landmarks import (
+    NUM_LANDMARKS, NUM_FIELDS, LANDMARK_DTYPE, X, Y, VISIBILITY,
+    NOSE, LEFT_EYE_INNER, LEFT_EYE, LEFT_EYE_OUTER, RIGHT_EYE_INNER, RIGHT_EYE,
+    RIGHT_EYE_OUTER, LEFT_EAR, RIGHT_EAR, MOUTH_LEFT, MOUTH_RIGHT,
+    LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, RIGHT_ELBOW, LEFT_WRIST, RIGHT_WRIST,
+    LEFT_PINKY, RIGHT_PINKY, LEFT_INDEX, RIGHT_INDEX, LEFT_THUMB, RIGHT_THUMB,
+    LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE,
+    LEFT_HEEL, RIGHT_HEEL, LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX
+)
+
+# Exercise modes as in config.settings.EXERCISE_MODES
+RUNNING = 1
+PUSHUP = 2
+SQUAT = 3
+JUMPING_JACK = 4
+
+# Reps per minute used when no cadence is given
+DEFAULT_CADENCE = {
+    RUNNING: 150,
+    PUSHUP: 30,
+    SQUAT: 24,
+    JUMPING_JACK: 60,
+}
+
+# Standing pose in normalized image coordinates (person facing the camera)
+STANDING_POSE = {
+    NOSE: (0.500, 0.150),
+    LEFT_EYE_INNER: (0.510, 0.135), LEFT_EYE: (0.520, 0.135), LEFT_EYE_OUTER: (0.530, 0.135),
+    RIGHT_EYE_INNER: (0.490, 0.135), RIGHT_EYE: (0.480, 0.135), RIGHT_EYE_OUTER: (0.470, 0.135),
+    LEFT_EAR: (0.540, 0.145), RIGHT_EAR: (0.460, 0.145),
+    MOUTH_LEFT: (0.515, 0.170), MOUTH_RIGHT: (0.485, 0.170),
+    LEFT_SHOULDER: (0.560, 0.260), RIGHT_SHOULDER: (0.440, 0.260),
+    LEFT_ELBOW: (0.575, 0.400), RIGHT_ELBOW: (0.425, 0.400),
+    LEFT_WRIST: (0.570, 0.530), RIGHT_WRIST: (0.430, 0.530),
+    LEFT_PINKY: (0.572, 0.555), RIGHT_PINKY: (0.428, 0.555),
+    LEFT_INDEX: (0.568, 0.560), RIGHT_INDEX: (0.432, 0.560),
+    LEFT_THUMB: (0.562, 0.548), RIGHT_THUMB: (0.438, 0.548),
+    LEFT_HIP: (0.530, 0.550), RIGHT_HIP: (0.470, 0.550),
+    LEFT_KNEE: (0.530, 0.720), RIGHT_KNEE: (0.470, 0.720),
+    LEFT_ANKLE: (0.530, 0.890), RIGHT_ANKLE: (0.470, 0.890),
+    LEFT_HEEL: (0.532, 0.905), RIGHT_HEEL: (0.468, 0.905),
+    LEFT_FOOT_INDEX: (0.528, 0.925), RIGHT_FOOT_INDEX: (0.472, 0.925),
+}
+
+UPPER_ARM = 0.14
+FOREARM = 0.13
+THIGH = 0.17
+SHIN = 0.17
+
+def _base_sequence(frames):
+    sequence = np.zeros((frames, NUM_LANDMARKS, NUM_FIELDS), dtype=np.float64)
+    for index, (x, y) in STANDING_POSE.items():
+        sequence[:, index, X] = x
+        sequence[:, index, Y] = y
+    sequence[:, :, VISIBILITY] = 0.99
+    return sequence
+
+def _translate(sequence, indices, dx, dy):
+    sequence[:, indices, X] += np.asarray(dx)[:, None]
+    sequence[:, indices, Y] += np.asarray(dy)[:, None]
+
+def _squat(sequence, depth):
+    # Knee angle from ~175 degrees (standing) to ~70 degrees at full depth,
+    # drawn as a 2D side-view leg: ankles fixed, knees forward, hips down/back
+    knee_angle = np.radians(175.0 - depth * 105.0)
+    half = (np.pi - knee_angle) / 2
+    for hip, knee, ankle, side in ((LEFT_HIP, LEFT_KNEE, LEFT_ANKLE, 1), (RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE, -1)):
+        ankle_x, ankle_y = STANDING_POSE[ankle]
+        knee_x = ankle_x + side * SHIN * np.sin(half)
+        knee_y = ankle_y - SHIN * np.cos(half)
+        hip_x = knee_x - side * THIGH * np.sin(half)
+        hip_y = knee_y - THIGH * np.cos(half)
+        sequence[:, knee, X], sequence[:, knee, Y] = knee_x, knee_y
+        sequence[:, hip, X], sequence[:, hip, Y] = hip_x, hip_y
+    # Upper body follows the hips down
+    drop = sequence[:, LEFT_HIP, Y] - STANDING_POSE[LEFT_HIP][1]
+    upper_body = [i for i in range(LEFT_HIP)]
+    _translate(sequence, upper_body, np.zeros_like(drop), drop)
+
+def _pushup(sequence, depth):
+    # Plank seen from the side: wrists on the floor under the shoulders, elbow
+    # angle from ~170 degrees (top) to ~70 degrees (bottom); hips stay level
+    elbow_angle = np.radians(170.0 - depth * 100.0)
+    shoulder_height = np.sqrt(UPPER_ARM ** 2 + FOREARM ** 2 - 2 * UPPER_ARM * FOREARM * np.cos(elbow_angle))
+    floor_y = 0.80
+    shoulder_y = floor_y - shoulder_height
+    # Elbow sits off the shoulder-wrist line, on the circle of radius UPPER_ARM around the shoulder
+    cos_shoulder = (UPPER_ARM ** 2 + shoulder_height ** 2 - FOREARM ** 2) / (2 * UPPER_ARM * shoulder_height)
+    shoulder_angle = np.arccos(np.clip(cos_shoulder, -1.0, 1.0))
+
+    layout = {  # landmark: (x, y offset from the shoulder line)
+        NOSE: (0.22, -0.01), LEFT_EAR: (0.20, -0.01), RIGHT_EAR: (0.20, -0.01),
+        LEFT_HIP: (0.55, 0.03), RIGHT_HIP: (0.55, 0.03),
+        LEFT_KNEE: (0.70, None), RIGHT_KNEE: (0.70, None),
+        LEFT_ANKLE: (0.85, None), RIGHT_ANKLE: (0.85, None),
+    }
+    shoulder_x = 0.30
+    for index in range(NUM_LANDMARKS):
+        sequence[:, index, X] = shoulder_x
+        sequence[:, index, Y] = shoulder_y
+    for index, (x, dy) in layout.items():
+        sequence[:, index, X] = x
+        if dy is None:
+            # Legs slope from the hips down to the feet on the floor
+            fraction = (x - 0.55) / 0.30
+            sequence[:, index, Y] = (shoulder_y + 0.03) * (1 - fraction) + (floor_y - 0.02) * fraction
+        else:
+            sequence[:, index, Y] = shoulder_y + dy
+    for shoulder, elbow, wrist in ((LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST), (RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST)):
+        sequence[:, shoulder, X], sequence[:, shoulder, Y] = shoulder_x, shoulder_y
+        sequence[:, wrist, X], sequence[:, wrist, Y] = shoulder_x, floor_y
+        sequence[:, elbow, X] = shoulder_x + UPPER_ARM * np.sin(shoulder_angle)
+        sequence[:, elbow, Y] = shoulder_y + UPPER_ARM * np.cos(shoulder_angle)
+
+def _jumping_jack(sequence, phase):
+    # Arms swing from slightly inward at the sides to ~150 degrees overhead,
+    # feet jump from together to about 2.5 hip widths apart
+    abduction = np.radians(-10.0 + phase * 160.0)
+    for shoulder, elbow, wrist, side in ((LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, 1), (RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST, -1)):
+        shoulder_x, shoulder_y = STANDING_POSE[shoulder]
+        direction_x = side * np.sin(abduction)
+        direction_y = np.cos(abduction)
+        sequence[:, elbow, X] = shoulder_x + UPPER_ARM * direction_x
+        sequence[:, elbow, Y] = shoulder_y + UPPER_ARM * direction_y
+        sequence[:, wrist, X] = shoulder_x + (UPPER_ARM + FOREARM) * direction_x
+        sequence[:, wrist, Y] = shoulder_y + (UPPER_ARM + FOREARM) * direction_y
+    hip_width = STANDING_POSE[LEFT_HIP][0] - STANDING_POSE[RIGHT_HIP][0]
+    spread = hip_width * (1.0 + 1.5 * phase) / 2
+    for knee, ankle, heel, foot, side in ((LEFT_KNEE, LEFT_ANKLE, LEFT_HEEL, LEFT_FOOT_INDEX, 1),
+                                          (RIGHT_KNEE, RIGHT_ANKLE, RIGHT_HEEL, RIGHT_FOOT_INDEX, -1)):
+        for index in (ankle, heel, foot):
+            sequence[:, index, X] = 0.5 + side * spread
+        sequence[:, knee, X] = 0.5 + side * (hip_width / 2 + spread) / 2
+
+def _running(sequence, phase):
+    # Feet alternate: each step lifts one ankle ~0.12 above the floor
+    lift = 0.12 * np.sin(np.pi * phase * 2)
+    left_lift = np.clip(lift, 0.0, None)
+    right_lift = np.clip(-lift, 0.0, None)
+    _translate(sequence, [LEFT_KNEE], np.zeros_like(left_lift), -0.6 * left_lift)
+    _translate(sequence, [LEFT_ANKLE, LEFT_HEEL, LEFT_FOOT_INDEX], np.zeros_like(left_lift), -left_lift)
+    _translate(sequence, [RIGHT_KNEE], np.zeros_like(right_lift), -0.6 * right_lift)
+    _translate(sequence, [RIGHT_ANKLE, RIGHT_HEEL, RIGHT_FOOT_INDEX], np.zeros_like(right_lift), -right_lift)
+
+def generate_motion(exercise_mode, frames=900, fps=30.0, cadence=None, noise=0.001,
+                    dropout=0.0, rest_frames=30, seed=0):
+    """
+    Generate a synthetic landmark sequence for one exercise.
+
+    Args:
+        exercise_mode: 1 running, 2 push-up, 3 squat, 4 jumping jack
+        frames: Number of frames to generate
+        fps: Frame rate the cadence is expressed against
+        cadence: Reps (for running: steps of both feet) per minute; defaults per exercise
+        noise: Standard deviation of Gaussian jitter added to x/y, in normalized units
+        dropout: Probability that a frame has no pose (NaN row), as when tracking is lost
+        rest_frames: Frames of still starting pose before the motion starts (for calibration)
+        seed: Random seed for noise and dropouts
+
+    Returns:
+        tuple: (sequence, expected_reps) - float32 array of shape (frames, 33, 4)
+            and the number of complete reps in the generated motion
+    """
+    rng = np.random.default_rng(seed)
+    cadence = cadence or DEFAULT_CADENCE[exercise_mode]
+    time = np.maximum(np.arange(frames) - rest_frames, 0) / fps
+    cycles = time * cadence / 60.0
+    # 0 -> 1 -> 0 over each rep, starting from the rest position
+    phase = 0.5 * (1 - np.cos(2 * np.pi * cycles))
+
+    sequence = _base_sequence(frames)
+    if exercise_mode == SQUAT:
+        _squat(sequence, phase)
+    elif exercise_mode == PUSHUP:
+        _pushup(sequence, phase)
+    elif exercise_mode == JUMPING_JACK:
+        _jumping_jack(sequence, phase)
+    elif exercise_mode == RUNNING:
+        # One cycle is a step with each foot
+        _running(sequence, (cycles / 2) % 1.0)
+    else:
+        raise ValueError(f"Unknown exercise mode {exercise_mode}")
+
+    if noise:
+        sequence[:, :, X:Y + 1] += rng.normal(0.0, noise, size=(frames, NUM_LANDMARKS, 2))
+    if dropout:
+        sequence[rng.random(frames) < dropout] = np.nan
+
+    expected_reps = int(np.floor(cycles[-1])) if frames else 0
+    return sequence.astype(LANDMARK_DTYPE), expected_reps
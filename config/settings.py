@@ -23,6 +23,93 @@ EXERCISE_MODES = {
     4: "Jumping Jack",
 }
 
+# Calibration profiles
+CALIBRATION_PROFILES = True  # Save successful calibrations and reuse them when the same user returns
+CALIBRATION_STORE_PATH = "calibration_profiles.json"  # Profiles per user and exercise mode
+CALIBRATION_DEFAULT_USER = "default"  # User profiles are saved for unless --user is given
+CALIBRATION_MATCH_TOLERANCE = 0.35  # Max relative torso length change for a saved profile to be reused
+
 # MediaPipe settings
 POSE_MIN_DETECTION_CONFIDENCE = 0.4
 POSE_MIN_TRACKING_CONFIDENCE = 0.4
+POSE_BACKEND = "solutions"  # "solutions" (blocking mediapipe.solutions.pose) or "tasks" (PoseLandmarker, asynchronous LIVE_STREAM)
+POSE_MODEL_VARIANT = "full"  # "lite", "full" or "heavy"
+POSE_MODEL_DIR = "models"  # Where the tasks backend looks for pose_landmarker_<variant>.task
+POSE_DELEGATE = "CPU"  # Tasks backend delegate: "CPU" or "GPU"
+# OpenCV threads for inference preprocessing (None = OpenCV default); MediaPipe's
+# Python APIs don't expose the model interpreter's thread count
+INFERENCE_NUM_THREADS = None
+# Pose inference runs on its own downscaled copy of the camera frame, fitted inside
+# this size with the aspect ratio preserved (None = use the camera frame size)
+INFERENCE_MAX_WIDTH = 640
+INFERENCE_MAX_HEIGHT = 480
+
+# Per-exercise inference profiles: model variant, confidences and inference size
+# (min_detection_confidence, min_tracking_confidence, max_width, max_height) per
+# exercise mode; unset fields and unlisted modes use the settings above
+INFERENCE_PROFILES = {
+    1: {"model_variant": "lite"},  # Stationary Running: cadence matters more than precision
+    2: {"model_variant": "heavy"},  # Push-up: elbow angles are subtle
+    4: {"model_variant": "lite"},  # Jumping Jack: fast arm and leg swings
+}
+WARM_MODELS = True  # Load every profile's model at startup so exercise mode switches never stall
+
+# Region-of-interest cropping
+ROI_CROPPING = True  # Run pose inference on a crop around the person found in the previous frame
+ROI_PADDING = 0.25  # Margin around the person's landmarks, as a fraction of their bounding box size
+ROI_MAX_AREA = 0.6  # Use the full frame when the crop would cover more than this fraction of it
+
+# Adaptive inference
+ADAPTIVE_INFERENCE = True  # Skip pose inference on some frames when it can't keep up; landmarks are extrapolated in between
+INFERENCE_FRAME_BUDGET = 1.0 / 30  # Seconds of pose inference allowed per displayed frame on average
+INFERENCE_MAX_STRIDE = 4  # Run pose inference at least on every Nth frame
+
+# Idle mode
+IDLE_MODE = True  # Throttle pose inference while nobody is in front of the camera
+IDLE_AFTER_SECONDS = 30.0  # Seconds without a detected pose before going idle
+IDLE_POLL_INTERVAL = 1.0  # Seconds between presence checks while idle
+IDLE_INFERENCE_WIDTH = 320  # Presence checks run on a copy downscaled to fit this size
+IDLE_INFERENCE_HEIGHT = 240
+
+# Main loop
+PIPELINED_MODE = False  # Run capture, inference and display as separate threads (or pass --pipelined)
+PIPELINE_QUEUE_SIZE = 1  # Frames buffered between stages; older frames are dropped
+
+# Multi-person tracking (group classes; needs POSE_BACKEND = "tasks")
+MULTI_PERSON = False  # Track several people, each with their own detector, calibration and count
+MAX_PEOPLE = 4  # Most people detected per frame
+TRACK_MAX_DISTANCE = 0.15  # Largest torso movement between frames (fraction of the image) to keep a person's ID
+TRACK_MAX_MISSED = 15  # Frames a person's ID (and calibration) is kept while they are not detected
+
+# Station mode (station.py: several cameras on one machine)
+STATION_CAPTURE_WIDTH = 640  # Camera frames are captured and shared between processes at this size
+STATION_CAPTURE_HEIGHT = 480
+STATION_TILE_WIDTH = 640  # Size of each camera's tile in the station window
+STATION_TILE_HEIGHT = 480
+STATION_RING_SLOTS = 4  # Frames per shared-memory ring; a frame stays valid for this many frame periods minus one
+
+# Audio cues (main.py --audio; needs sounddevice and PortAudio)
+AUDIO_CUES = False  # Beep on reps, stage changes and the last seconds of the calibration countdown
+AUDIO_SAMPLE_RATE = 44100  # Output stream sample rate in Hz
+AUDIO_BLOCK_SIZE = 256  # Frames per audio callback (~6 ms at 44.1 kHz); smaller starts cues sooner
+AUDIO_VOLUME = 0.3  # Peak amplitude of the cue tones (0-1)
+AUDIO_STAGE_CUES = True  # Also tick on every stage change, not only on completed reps
+AUDIO_CUE_FILES = {}  # Cue name ("rep", "stage", "countdown", "go", "calibration_ok", ...) -> 16-bit WAV replacing its tone
+
+# Session history (utils/session_store.py)
+SESSION_HISTORY = True  # Store every rep, calibration result and session summary per user in SQLite
+SESSION_DB_PATH = "sessions.db"  # SQLite database (WAL mode)
+SESSION_BATCH_SIZE = 64  # Most rows the background writer commits per transaction
+SESSION_FLUSH_INTERVAL = 1.0  # Longest time in seconds a rep waits before it is written
+SESSION_MAX_PENDING = 10000  # Rows queued for the writer before further reps are dropped
+
+# Landmark streaming (main.py --send, network/server.py)
+NETWORK_PORT = 9750  # UDP port stations send landmark packets to
+NETWORK_HTTP_PORT = 9751  # HTTP port of the server's live count endpoint (0 = disabled)
+NETWORK_TICK_INTERVAL = 0.05  # Seconds of received packets the server scores per detector batch
+NETWORK_STATION_TIMEOUT = 60.0  # Stations silent for this long are dropped from the server
+NETWORK_REORDER_WINDOW = 256  # Packets this far behind a station's newest mean the station restarted
+
+# Performance metrics
+METRICS_WINDOW = 300  # Samples kept per stage for the rolling p50/p95/p99
+METRICS_DUMP_INTERVAL = 10.0  # Seconds between Prometheus metrics file writes (--metrics PATH)
\ No newline at end of file
@@ -1,6 +1,21 @@
-from exercise_detectors.stationary_running import StationaryRunningDetector
-from exercise_detectors.pushup import PushupDetector
-from exercise_detectors.squat import SquatDetector
-from exercise_detectors.jumping_jack import JumpingJackDetector
+import importlib
 
-# Import additional detectors here
\ No newline at end of file
+# Detector class -> module; a detector module is only imported when its class is first used,
+# and none of them import MediaPipe (landmark indices come from utils.landmarks)
+_DETECTORS = {
+    "StationaryRunningDetector": "exercise_detectors.stationary_running",
+    "PushupDetector": "exercise_detectors.pushup",
+    "SquatDetector": "exercise_detectors.squat",
+    "JumpingJackDetector": "exercise_detectors.jumping_jack",
+    # Register additional detectors here
+}
+
+__all__ = list(_DETECTORS)
+
+def __getattr__(name):
+    module = _DETECTORS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    detector = getattr(importlib.import_module(module), name)
+    globals()[name] = detector
+    return detector
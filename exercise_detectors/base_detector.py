@@ -1,5 +1,22 @@
+import numpy as np
+
+from exercise_detectors.telemetry import DetectorTelemetry
+from utils.events import RepCompleted, StageChanged, CalibrationFinished
+
+# State codes used by the vectorized state machine in detect_batch()
+_NO_STAGE = 0
+_ACTIVE = 1
+_REST = 2
+
 class BaseExerciseDetector:
     """Base class for all exercise detectors"""
+
+    # (name, decimals) of the per-frame values detect() writes into self.telemetry
+    TELEMETRY_FIELDS = ()
+    # Attributes calibrate() sets, saved and restored with calibration profiles
+    CALIBRATION_FIELDS = ()
+    # Telemetry field whose range over each rep is reported in RepCompleted events
+    KEY_ANGLE = None
     
     def __init__(self, name):
         self.name = name
@@ -7,18 +24,103 @@ class BaseExerciseDetector:
         self.stage = None
         self.calibrated = False
         self.calibration_data = {}
+        self.telemetry = DetectorTelemetry(self.TELEMETRY_FIELDS)
+        self.events = None  # optional EventBus receiving rep, stage and calibration events (attach_events())
+        self.person = None  # track ID in multi-person mode, reported with the events
+        self._stage_since = None  # event clock time the current stage was entered
+        self._previous_stage_since = None
+        self._angle_min = np.inf  # KEY_ANGLE range since the last counted rep
+        self._angle_max = -np.inf
         
     def detect(self, landmarks):
         """
         Detect exercise and return counter and stage
         
         Args:
-            landmarks: MediaPipe pose landmarks
+            landmarks: (33, 4) landmark array (see utils.landmarks), or None
             
         Returns:
             tuple: (counter, stage)
         """
         raise NotImplementedError("Subclasses must implement detect()")
+
+    def debug_info(self):
+        """Formatted telemetry of the last detect() call, for the debug panel"""
+        return self.telemetry.as_dict(stage=self.stage, counter=self.counter)
+
+    def attach_events(self, events, person=None):
+        """
+        Publish rep, stage and calibration events to an EventBus
+
+        Args:
+            events: EventBus (its clock timestamps the events)
+            person: Optional track ID reported with the events (multi-person mode)
+        """
+        if self.KEY_ANGLE is not None and self.events is None:
+            # Track the key angle's range per rep from the per-frame telemetry
+            self._key_angle_index = self.telemetry.fields.index(self.KEY_ANGLE)
+            self.telemetry.subscribe(self._track_key_angle)
+        self.events = events
+        self.person = person
+
+    def _track_key_angle(self, telemetry):
+        value = telemetry.values[self._key_angle_index]
+        if value < self._angle_min:
+            self._angle_min = value
+        if value > self._angle_max:
+            self._angle_max = value
+
+    def _set_stage(self, stage):
+        """Move the state machine to stage, publishing a StageChanged event"""
+        if self.events is not None:
+            now = self.events.clock()
+            self._previous_stage_since, self._stage_since = self._stage_since, now
+            self.events.publish(StageChanged(now, self.name, self.person, self.stage, stage))
+        self.stage = stage
+
+    def _count_rep(self):
+        """
+        Count a completed rep, publishing a RepCompleted event
+
+        Called right after _set_stage() moved back to the rest stage; the rep's
+        duration is the time since the active stage was entered, its angle range
+        covers every frame since the previous rep.
+        """
+        self.counter += 1
+        if self.events is not None:
+            now = self.events.clock()
+            duration = now - self._previous_stage_since if self._previous_stage_since is not None else None
+            angle_min = float(self._angle_min) if self._angle_min <= self._angle_max else None
+            angle_max = float(self._angle_max) if angle_min is not None else None
+            self._angle_min, self._angle_max = np.inf, -np.inf
+            self.events.publish(RepCompleted(now, self.name, self.person, self.counter, duration,
+                                             angle_min, angle_max))
+
+    def _calibration_finished(self, success):
+        """Publish the outcome of calibrate() and return it"""
+        if self.events is not None:
+            self.events.publish(CalibrationFinished(self.events.clock(), self.name, self.person, success,
+                                                    self.calibration_state() if success else {}))
+        return success
+
+    def detect_batch(self, landmark_sequence):
+        """
+        Score a whole landmark sequence at once, as repeated detect() calls would
+        
+        Features are computed vectorized over time and the stage state machine
+        runs as a single vectorized pass. Counter and stage are updated to their
+        values after the last frame, just like calling detect() on every frame.
+        No events are published; rep_indices tells where the reps happened.
+        
+        Args:
+            landmark_sequence: (T, 33, 4) landmark array; frames without a pose are NaN
+            
+        Returns:
+            tuple: (stages, rep_indices, counter) - object array with the stage
+                detect() would return for each frame, indices of the frames on
+                which a rep was counted, and the final counter
+        """
+        raise NotImplementedError("Subclasses must implement detect_batch()")
         
     def reset(self):
         """Reset the counter and stage"""
@@ -26,13 +128,15 @@ class BaseExerciseDetector:
         self.stage = None
         self.calibrated = False
         self.calibration_data = {}
+        self._stage_since = self._previous_stage_since = None
+        self._angle_min, self._angle_max = np.inf, -np.inf
         
     def calibrate(self, landmarks, key_points=None):
         """
         Calibrate the detector with user's specific body proportions
         
         Args:
-            landmarks: MediaPipe pose landmarks
+            landmarks: (33, 4) landmark array (see utils.landmarks), or None
             key_points: Optional dictionary with extracted key points for the exercise
             
         Returns:
@@ -43,5 +147,92 @@ class BaseExerciseDetector:
             self.calibration_data.update(key_points)
             
         # Default implementation - subclasses can override for more specific calibration
+        # and report their outcome with _calibration_finished()
+        self.calibrated = True
+        return True
+
+    def calibration_state(self):
+        """
+        Calibrated parameters, for saving in a calibration profile
+
+        Returns:
+            dict: CALIBRATION_FIELDS attribute -> value, for the attributes that are set
+        """
+        state = {}
+        for name in self.CALIBRATION_FIELDS:
+            value = getattr(self, name, None)
+            if value is not None:
+                state[name] = float(value)
+        return state
+
+    def restore_calibration(self, state, key_points=None):
+        """
+        Restore a saved calibration instead of calibrating from landmarks
+
+        Args:
+            state: Dict returned by calibration_state()
+            key_points: Optional key points saved with the calibration
+        """
+        for name in self.CALIBRATION_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        if key_points:
+            self.calibration_data.update(key_points)
         self.calibrated = True
-        return True
\ No newline at end of file
+        self._calibration_finished(True)
+
+    @staticmethod
+    def _frames_with_pose(landmark_sequence):
+        """Boolean mask of the frames in a (T, 33, 4) sequence that hold a pose"""
+        return ~np.isnan(landmark_sequence[:, :, :2]).any(axis=(1, 2))
+
+    def _run_stage_machine(self, enter, leave, active_stage, rest_stage, evaluated, status):
+        """
+        Vectorized equivalent of the two-stage hysteresis used by every detect()
+        
+        The machine starts in self.stage. From None or rest_stage it moves to
+        active_stage on an enter frame; from active_stage it moves to rest_stage
+        on a leave frame and counts a rep. enter and leave are never both true.
+        
+        Args:
+            enter: (T,) bool array of frames that satisfy the enter condition
+            leave: (T,) bool array of frames that satisfy the leave condition
+            active_stage: Stage entered on enter frames (e.g. 'down' for squats)
+            rest_stage: Stage entered on leave frames, where reps are counted
+            evaluated: (T,) bool array of frames on which detect() runs the machine
+            status: Stage string (or (T,) array of strings) returned for other frames
+            
+        Returns:
+            tuple: (stages, rep_indices, counter) as documented in detect_batch()
+        """
+        frames = len(enter)
+        events = np.zeros(frames, dtype=np.int8)
+        events[enter & evaluated] = _ACTIVE
+        events[leave & evaluated] = _REST
+
+        if self.stage == active_stage:
+            initial = _ACTIVE
+        elif self.stage == rest_stage:
+            initial = _REST
+        else:
+            initial = _NO_STAGE
+        if initial != _ACTIVE:
+            # Leave events before the machine first becomes active change nothing
+            active_frames = np.flatnonzero(events == _ACTIVE)
+            events[:active_frames[0] if len(active_frames) else frames] = _NO_STAGE
+
+        # Stage at each frame = code of the latest event so far (forward fill)
+        last_event = np.maximum.accumulate(np.where(events != _NO_STAGE, np.arange(frames), -1))
+        state = np.where(last_event >= 0, events[last_event], initial)
+        previous = np.concatenate(([initial], state[:-1]))
+        rep_indices = np.flatnonzero((previous == _ACTIVE) & (state == _REST))
+
+        labels = np.array([None, active_stage, rest_stage], dtype=object)
+        stages = labels[state]
+        skipped = ~evaluated
+        stages[skipped] = status[skipped] if isinstance(status, np.ndarray) else status
+
+        self.counter += len(rep_indices)
+        if frames:
+            self.stage = labels[state[-1]]
+        return stages, rep_indices, self.counter
\ No newline at end of file
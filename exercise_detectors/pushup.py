@@ -1,65 +1,77 @@
-import mediapipe as mp
+import numpy as np
+
 from exercise_detectors.base_detector import BaseExerciseDetector
+from utils.angle_utils import calculate_angle, calculate_angles
+from utils.landmarks import LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, LEFT_HIP, X, Y
 from config.settings import PUSHUP_ELBOW_ANGLE_THRESHOLD, PUSHUP_BODY_HORIZONTAL_THRESHOLD
 
-mp_pose = mp.solutions.pose
-
 class PushupDetector(BaseExerciseDetector):
+    TELEMETRY_FIELDS = (
+        ("elbow_angle", 2),
+        ("elbow_angle_threshold", 2),
+        ("shoulder_y", 4),
+        ("hip_y", 4),
+        ("body_horizontal_threshold", 4),
+        ("is_horizontal", None),
+    )
+    CALIBRATION_FIELDS = ("body_horizontal_threshold", "reference_body_alignment")
+    KEY_ANGLE = "elbow_angle"
+
     def __init__(self):
         super().__init__("Push-ups")
         self.elbow_angle_threshold = PUSHUP_ELBOW_ANGLE_THRESHOLD
         self.body_horizontal_threshold = PUSHUP_BODY_HORIZONTAL_THRESHOLD
-        self.last_debug_info = {}
 
     def calibrate(self, landmarks, key_points=None):
         super().calibrate(landmarks, key_points)
-        if landmarks and key_points:
+        if landmarks is not None and key_points:
             if 'body_alignment' in key_points:
                 self.reference_body_alignment = key_points['body_alignment']
                 self.body_horizontal_threshold = max(0.05, self.reference_body_alignment * 1.5)
             # Could add more calibration with elbows etc.
-            return True
-        return landmarks is not None
+            return self._calibration_finished(True)
+        return self._calibration_finished(landmarks is not None)
 
     def detect(self, landmarks):
-        if not landmarks:
-            self.last_debug_info = {"status": "No landmarks"}
+        if landmarks is None:
+            self.telemetry.set_status("No landmarks")
             return self.counter, "No landmarks"
 
-        left_shoulder = [landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].x,
-                         landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y]
-        left_elbow = [landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value].x,
-                      landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value].y]
-        left_wrist = [landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].x,
-                      landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].y]
+        left_shoulder = landmarks[LEFT_SHOULDER, X:Y + 1]
+        left_elbow = landmarks[LEFT_ELBOW, X:Y + 1]
+        left_wrist = landmarks[LEFT_WRIST, X:Y + 1]
 
-        elbow_angle = self.calculate_angle(left_shoulder, left_elbow, left_wrist)
+        elbow_angle = calculate_angle(left_shoulder, left_elbow, left_wrist)
 
-        shoulder_y = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y
-        hip_y = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y
+        shoulder_y = landmarks[LEFT_SHOULDER, Y]
+        hip_y = landmarks[LEFT_HIP, Y]
         is_horizontal = abs(shoulder_y - hip_y) < self.body_horizontal_threshold
 
-        # DEBUG INFO
-        self.last_debug_info = {
-            "elbow_angle": round(elbow_angle, 2),
-            "elbow_angle_threshold": round(self.elbow_angle_threshold, 2),
-            "shoulder_y": round(shoulder_y, 4),
-            "hip_y": round(hip_y, 4),
-            "body_horizontal_threshold": round(self.body_horizontal_threshold, 4),
-            "is_horizontal": is_horizontal,
-            "stage": self.stage,
-            "counter": self.counter
-        }
+        self.telemetry.update(elbow_angle, self.elbow_angle_threshold, shoulder_y, hip_y,
+                              self.body_horizontal_threshold, is_horizontal)
 
         if not is_horizontal:
             return self.counter, "Not in position"
 
         if self.stage is None or self.stage == 'up':
             if elbow_angle < self.elbow_angle_threshold:
-                self.stage = 'down'
+                self._set_stage('down')
         elif self.stage == 'down':
             if elbow_angle > self.elbow_angle_threshold:
-                self.stage = 'up'
-                self.counter += 1
+                self._set_stage('up')
+                self._count_rep()
+
+        return self.counter, self.stage
 
-        return self.counter, self.stage
\ No newline at end of file
+    def detect_batch(self, landmark_sequence):
+        sequence = np.asarray(landmark_sequence)
+        elbow_angle = calculate_angles(sequence, [(LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST)])[:, 0]
+        body_alignment = np.abs(sequence[:, LEFT_SHOULDER, Y] - sequence[:, LEFT_HIP, Y])
+        is_horizontal = body_alignment < self.body_horizontal_threshold
+        has_pose = self._frames_with_pose(sequence)
+        return self._run_stage_machine(
+            enter=elbow_angle < self.elbow_angle_threshold,
+            leave=elbow_angle > self.elbow_angle_threshold,
+            active_stage='down', rest_stage='up',
+            evaluated=has_pose & is_horizontal,
+            status=np.where(has_pose, "Not in position", "No landmarks").astype(object))
\ No newline at end of file
@@ -1,60 +1,66 @@
-import mediapipe as mp
+import numpy as np
+
 from exercise_detectors.base_detector import BaseExerciseDetector
-from utils.angle_utils import calculate_angle
+from utils.angle_utils import calculate_angle, calculate_angles
+from utils.landmarks import LEFT_HIP, LEFT_KNEE, LEFT_ANKLE, X, Y
 from config.settings import SQUAT_KNEE_ANGLE_THRESHOLD
 
-mp_pose = mp.solutions.pose
-
 class SquatDetector(BaseExerciseDetector):
+    TELEMETRY_FIELDS = (
+        ("knee_angle", 2),
+        ("knee_angle_threshold", 2),
+        ("hip_y", 4),
+        ("knee_y", 4),
+        ("ankle_y", 4),
+    )
+    CALIBRATION_FIELDS = ("reference_hip_height", "reference_hip_ankle_distance")
+    KEY_ANGLE = "knee_angle"
+
     def __init__(self):
         super().__init__("Squats")
         self.knee_angle_threshold = SQUAT_KNEE_ANGLE_THRESHOLD
-        self.last_debug_info = {}
 
     def calibrate(self, landmarks, key_points=None):
         super().calibrate(landmarks, key_points)
-        if landmarks and key_points:
+        if landmarks is not None and key_points:
             if 'hip_height' in key_points:
                 self.reference_hip_height = key_points['hip_height']
             if 'hip_ankle_distance' in key_points:
                 self.reference_hip_ankle_distance = key_points['hip_ankle_distance']
-            return True
-        return landmarks is not None
+            return self._calibration_finished(True)
+        return self._calibration_finished(landmarks is not None)
 
     def detect(self, landmarks):
-        if not landmarks:
-            self.last_debug_info = {"status": "No landmarks"}
+        if landmarks is None:
+            self.telemetry.set_status("No landmarks")
             return self.counter, "No landmarks"
         
         # Get hip, knee, and ankle points for angle calculation (Left side)
-        hip = [landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].x,
-               landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y]
-        knee = [landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].x,
-                landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].y]
-        ankle = [landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].x,
-                 landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y]
+        hip = landmarks[LEFT_HIP, X:Y + 1]
+        knee = landmarks[LEFT_KNEE, X:Y + 1]
+        ankle = landmarks[LEFT_ANKLE, X:Y + 1]
 
         # Calculate knee angle
         knee_angle = calculate_angle(hip, knee, ankle)
 
-        # DEBUG INFO for live panel
-        self.last_debug_info = {
-            "knee_angle": round(knee_angle, 2),
-            "knee_angle_threshold": round(self.knee_angle_threshold, 2),
-            "hip_y": round(hip[1], 4),
-            "knee_y": round(knee[1], 4),
-            "ankle_y": round(ankle[1], 4),
-            "stage": self.stage,
-            "counter": self.counter
-        }
+        self.telemetry.update(knee_angle, self.knee_angle_threshold, hip[1], knee[1], ankle[1])
 
         # Determine squat stage based on knee angle
         if self.stage is None or self.stage == 'up':
             if knee_angle < self.knee_angle_threshold:
-                self.stage = 'down'
+                self._set_stage('down')
         elif self.stage == 'down':
             if knee_angle > self.knee_angle_threshold:
-                self.stage = 'up'
-                self.counter += 1
+                self._set_stage('up')
+                self._count_rep()
+
+        return self.counter, self.stage
 
-        return self.counter, self.stage
\ No newline at end of file
+    def detect_batch(self, landmark_sequence):
+        sequence = np.asarray(landmark_sequence)
+        knee_angle = calculate_angles(sequence, [(LEFT_HIP, LEFT_KNEE, LEFT_ANKLE)])[:, 0]
+        return self._run_stage_machine(
+            enter=knee_angle < self.knee_angle_threshold,
+            leave=knee_angle > self.knee_angle_threshold,
+            active_stage='down', rest_stage='up',
+            evaluated=self._frames_with_pose(sequence), status="No landmarks")
\ No newline at end of file
@@ -1,54 +1,70 @@
-import mediapipe as mp
+import numpy as np
+
 from exercise_detectors.base_detector import BaseExerciseDetector
+from utils.landmarks import LEFT_ANKLE, RIGHT_ANKLE, Y
 from config.settings import RUNNING_ANKLE_HEIGHT_THRESHOLD
 
-mp_pose = mp.solutions.pose
-
 class StationaryRunningDetector(BaseExerciseDetector):
+    TELEMETRY_FIELDS = (
+        ("left_ankle_y", 4),
+        ("right_ankle_y", 4),
+        ("min_ankle_height", 4),
+        ("threshold", 4),
+    )
+    CALIBRATION_FIELDS = ("min_ankle_height",)
+
     def __init__(self):
         super().__init__("Stationary Running")
         self.min_ankle_height = None  # Calibrated once
         self.ankle_height_threshold = RUNNING_ANKLE_HEIGHT_THRESHOLD  # e.g., 0.10
-        self.last_debug_info = {}
 
     def calibrate(self, landmarks, key_points=None):
         """Calibrate the ankle height threshold based on the user's standing position."""
         super().calibrate(landmarks, key_points)
-        if landmarks:
-            left_ankle_y = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y
-            right_ankle_y = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].y
-            self.min_ankle_height = (left_ankle_y + right_ankle_y) / 2
+        if landmarks is not None:
+            left_ankle_y = landmarks[LEFT_ANKLE, Y]
+            right_ankle_y = landmarks[RIGHT_ANKLE, Y]
+            self.min_ankle_height = float(left_ankle_y + right_ankle_y) / 2
             self.calibrated = True
-            print(f"[CALIBRATION] min_ankle_height: {self.min_ankle_height:.4f}")
-            return True
+            return self._calibration_finished(True)
         self.calibrated = False
-        return False
+        return self._calibration_finished(False)
 
     def detect(self, landmarks):
-        if not landmarks or not self.calibrated or self.min_ankle_height is None:
-            self.last_debug_info = {"status": "Not calibrated"}
+        if landmarks is None or not self.calibrated or self.min_ankle_height is None:
+            self.telemetry.set_status("Not calibrated")
             return self.counter, "Not calibrated"
 
-        left_ankle_y = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y
-        right_ankle_y = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].y
+        left_ankle_y = landmarks[LEFT_ANKLE, Y]
+        right_ankle_y = landmarks[RIGHT_ANKLE, Y]
         threshold = self.min_ankle_height - self.ankle_height_threshold
 
-        self.last_debug_info = {
-            "left_ankle_y": round(left_ankle_y, 4),
-            "right_ankle_y": round(right_ankle_y, 4),
-            "min_ankle_height": round(self.min_ankle_height, 4),
-            "threshold": round(threshold, 4),
-            "stage": self.stage,
-            "counter": self.counter
-        }
+        self.telemetry.update(left_ankle_y, right_ankle_y, self.min_ankle_height, threshold)
 
         # State machine
         if self.stage is None or self.stage == 'down':
             if left_ankle_y < threshold or right_ankle_y < threshold:
-                self.stage = 'up'
+                self._set_stage('up')
         elif self.stage == 'up':
             if left_ankle_y > threshold and right_ankle_y > threshold:
-                self.stage = 'down'
-                self.counter += 1
+                self._set_stage('down')
+                self._count_rep()
+
+        return self.counter, self.stage
+
+    def detect_batch(self, landmark_sequence):
+        sequence = np.asarray(landmark_sequence)
+        if not self.calibrated or self.min_ankle_height is None:
+            evaluated = np.zeros(len(sequence), dtype=bool)
+            threshold = 0.0
+        else:
+            evaluated = self._frames_with_pose(sequence)
+            threshold = self.min_ankle_height - self.ankle_height_threshold
 
-        return self.counter, self.stage
\ No newline at end of file
+        left_ankle_y = sequence[:, LEFT_ANKLE, Y]
+        right_ankle_y = sequence[:, RIGHT_ANKLE, Y]
+        return self._run_stage_machine(
+            enter=(left_ankle_y < threshold) | (right_ankle_y < threshold),
+            leave=(left_ankle_y > threshold) & (right_ankle_y > threshold),
+            active_stage='up', rest_stage='down',
+            evaluated=evaluated, status="Not calibrated")
\ No newline at end of file
@@ -0,0 +1,68 @@
+import numpy as np
+
+class DetectorTelemetry:
+    """
+    Fixed-field record of a detector's per-frame debug values.
+
+    detect() writes the raw values into a preallocated float array; rounding
+    and the dict shown in the debug panel are only produced by as_dict(),
+    when the panel is drawn. Subscribers are called with the record after
+    every update (e.g. to stream it into a landmark recording).
+    """
+
+    def __init__(self, fields):
+        """
+        Args:
+            fields: Sequence of (name, decimals) pairs in record order; decimals
+                is the number of digits shown in the debug panel, or None for
+                flags shown as True/False
+        """
+        self.fields = tuple(name for name, _ in fields)
+        self.decimals = tuple(decimals for _, decimals in fields)
+        self.values = np.full(len(self.fields), np.nan)
+        self.status = None  # set instead of the values when the frame could not be evaluated
+        self._subscribers = []
+
+    def update(self, *values):
+        """Store one frame's values, in field order"""
+        self.values[:] = values
+        self.status = None
+        self._publish()
+
+    def set_status(self, status):
+        """Mark the frame as not evaluated (e.g. "No landmarks"); the values become NaN"""
+        self.values.fill(np.nan)
+        self.status = status
+        self._publish()
+
+    def subscribe(self, callback):
+        """Call callback(telemetry) after every update; the record is only valid during the call"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def _publish(self):
+        for callback in self._subscribers:
+            callback(self)
+
+    def as_dict(self, **extra):
+        """
+        Formatted view of the latest record for display
+
+        Args:
+            **extra: Additional entries appended after the fields (e.g. stage, counter)
+
+        Returns:
+            dict: Field name -> rounded value, or {"status": ...} for frames that
+                were not evaluated; empty before the first update
+        """
+        if self.status is not None:
+            return {"status": self.status}
+        if np.isnan(self.values).all():
+            return {}
+        info = {}
+        for name, decimals, value in zip(self.fields, self.decimals, self.values.tolist()):
+            info[name] = bool(value) if decimals is None else round(value, decimals)
+        info.update(extra)
+        return info
@@ -0,0 +1,8 @@
+from inference.scheduler import InferenceScheduler
+from inference.roi import RegionTracker
+from inference.presence import PresenceMonitor
+from inference.tracking import PersonTracker
+from inference.backends import PoseBackend, SolutionsPoseBackend, TasksPoseBackend, create_pose_backend
+from inference.profiles import InferenceProfile, ModelPool, build_profiles
+
+# Import additional inference helpers here
@@ -0,0 +1,188 @@
+"""
+Pose estimation backends.
+
+A backend turns an RGB frame into a (33, 4) landmark array (see
+utils.landmarks), so the rest of the app does not depend on which MediaPipe
+API or model produced it. MediaPipe is imported when a backend is created,
+not when this module is imported.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.landmarks import landmarks_to_array, NUM_LANDMARKS, NUM_FIELDS
+
+# Model variants, in order of increasing accuracy and cost
+MODEL_VARIANTS = ("lite", "full", "heavy")
+
+class PoseBackend:
+    """Base class for pose backends"""
+
+    # True if process() returns results of earlier frames instead of blocking on the current one
+    asynchronous = False
+
+    def __init__(self):
+        self.frames_submitted = 0
+        self.num_poses = 1  # most poses detected per frame
+
+    def process(self, rgb_frame):
+        """
+        Submit an RGB frame for pose estimation
+
+        Args:
+            rgb_frame: RGB uint8 image; only valid until process() returns
+
+        Returns:
+            tuple: (landmarks, frame_index) - (33, 4) landmark array or None, and
+                the index (value of frames_submitted when it was passed in) of the
+                frame those landmarks belong to. Asynchronous backends return the
+                newest finished frame, or (None, None) before the first result.
+        """
+        raise NotImplementedError("Subclasses must implement process()")
+
+    def process_all(self, rgb_frame):
+        """
+        Submit an RGB frame and return every detected pose, as process() does for one
+
+        Returns:
+            tuple: (poses, frame_index) - (K, 33, 4) landmark array with one row per
+                detected person (K may be 0), and the frame index as in process()
+        """
+        landmarks, frame_index = self.process(rgb_frame)
+        if landmarks is None:
+            return np.empty((0, NUM_LANDMARKS, NUM_FIELDS), dtype=np.float32), frame_index
+        return landmarks[np.newaxis], frame_index
+
+    def close(self):
+        """Release the model"""
+        pass
+
+
+class SolutionsPoseBackend(PoseBackend):
+    """Legacy mediapipe.solutions.pose.Pose; blocks until the frame is processed"""
+
+    def __init__(self, variant="full", min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        super().__init__()
+        import mediapipe as mp
+        self.pose = mp.solutions.pose.Pose(
+            model_complexity=MODEL_VARIANTS.index(variant),
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence)
+
+    def process(self, rgb_frame):
+        frame_index = self.frames_submitted
+        self.frames_submitted += 1
+        result = self.pose.process(rgb_frame)
+        return landmarks_to_array(result.pose_landmarks), frame_index
+
+    def close(self):
+        self.pose.close()
+
+
+class TasksPoseBackend(PoseBackend):
+    """
+    MediaPipe Tasks PoseLandmarker in LIVE_STREAM mode.
+
+    process() only queues the frame (the image is copied) and returns the most
+    recent result delivered to the landmarker's callback, so the caller never
+    waits for inference; frames arriving while the model is busy are dropped
+    by MediaPipe's flow limiter.
+    """
+
+    asynchronous = True
+
+    def __init__(self, model_path, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 min_presence_confidence=0.5, delegate="CPU", num_poses=1):
+        """
+        Args:
+            model_path: pose_landmarker_{lite,full,heavy}.task model bundle
+            delegate: "CPU" or "GPU"
+            num_poses: Maximum number of people detected per frame
+        """
+        super().__init__()
+        self.num_poses = num_poses
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Pose landmarker model not found: {model_path} (download it from "
+                "https://developers.google.com/mediapipe/solutions/vision/pose_landmarker)")
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions, vision
+
+        self._mp = mp
+        self._lock = threading.Lock()
+        self._latest = (np.empty((0, NUM_LANDMARKS, NUM_FIELDS), dtype=np.float32), None)
+        self._frame_indices = {}
+        self._last_timestamp = -1
+        options = vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path,
+                                     delegate=getattr(BaseOptions.Delegate, delegate)),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=num_poses,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_pose_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result)
+        self.landmarker = vision.PoseLandmarker.create_from_options(options)
+
+    def _on_result(self, result, image, timestamp_ms):
+        poses = np.empty((len(result.pose_landmarks), NUM_LANDMARKS, NUM_FIELDS), dtype=np.float32)
+        for index, pose_landmarks in enumerate(result.pose_landmarks):
+            poses[index] = landmarks_to_array(pose_landmarks)
+        with self._lock:
+            frame_index = self._frame_indices.pop(timestamp_ms, None)
+            # Results of frames submitted before this one will never arrive now
+            for stale in [t for t in self._frame_indices if t < timestamp_ms]:
+                del self._frame_indices[stale]
+            if frame_index is not None:
+                self._latest = (poses, frame_index)
+
+    def process_all(self, rgb_frame):
+        # LIVE_STREAM requires strictly increasing timestamps
+        timestamp_ms = max(int(time.perf_counter() * 1000), self._last_timestamp + 1)
+        self._last_timestamp = timestamp_ms
+        with self._lock:
+            self._frame_indices[timestamp_ms] = self.frames_submitted
+        self.frames_submitted += 1
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb_frame)
+        self.landmarker.detect_async(image, timestamp_ms)
+        with self._lock:
+            return self._latest
+
+    def process(self, rgb_frame):
+        poses, frame_index = self.process_all(rgb_frame)
+        return (poses[0] if len(poses) else None), frame_index
+
+    def close(self):
+        self.landmarker.close()
+
+
+def create_pose_backend(name, variant="full", model_dir="models", min_detection_confidence=0.5,
+                        min_tracking_confidence=0.5, delegate="CPU", num_poses=1):
+    """
+    Build a pose backend by name
+
+    Args:
+        name: "solutions" (blocking mediapipe.solutions.pose) or "tasks" (PoseLandmarker, LIVE_STREAM)
+        variant: Model variant, one of MODEL_VARIANTS
+        model_dir: Directory holding the pose_landmarker_<variant>.task bundles (tasks backend)
+        min_detection_confidence: Minimum pose detection confidence
+        min_tracking_confidence: Minimum landmark tracking confidence
+        delegate: Tasks backend delegate, "CPU" or "GPU"
+        num_poses: Maximum number of people detected per frame (tasks backend only)
+
+    Returns:
+        PoseBackend: The backend
+    """
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown pose model variant {variant!r}; expected one of {MODEL_VARIANTS}")
+    if name == "solutions":
+        if num_poses > 1:
+            raise ValueError("The solutions pose backend detects one person; use the tasks backend for num_poses > 1")
+        return SolutionsPoseBackend(variant, min_detection_confidence, min_tracking_confidence)
+    if name == "tasks":
+        model_path = os.path.join(model_dir, f"pose_landmarker_{variant}.task")
+        return TasksPoseBackend(model_path, min_detection_confidence, min_tracking_confidence,
+                                delegate=delegate, num_poses=num_poses)
+    raise ValueError(f"Unknown pose backend {name!r}; expected 'solutions' or 'tasks'")
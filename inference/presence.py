@@ -0,0 +1,52 @@
+class PresenceMonitor:
+    """
+    Tracks whether anyone is in front of the camera.
+
+    After idle_after seconds without a detected pose the monitor goes idle;
+    while idle, pose detection should only run every poll_interval seconds
+    (on a small frame), and the first detection wakes it up again.
+
+    Usage:
+        if monitor.idle and not monitor.should_poll(now):
+            ...skip the frame...
+        found = ...run inference...
+        monitor.update(now, found)
+    """
+
+    def __init__(self, idle_after=30.0, poll_interval=1.0):
+        """
+        Args:
+            idle_after: Seconds without a detected pose before going idle
+            poll_interval: Seconds between presence checks while idle
+        """
+        self.idle_after = idle_after
+        self.poll_interval = poll_interval
+        self.idle = False
+        self.last_seen = None
+        self.last_poll = None
+
+    def should_poll(self, timestamp):
+        """Whether an idle monitor should run a presence check now"""
+        return self.last_poll is None or timestamp - self.last_poll >= self.poll_interval
+
+    def update(self, timestamp, found):
+        """
+        Record the outcome of a pose detection.
+
+        Args:
+            timestamp: Frame time in seconds
+            found: True if a pose was detected
+        """
+        self.last_poll = timestamp
+        if found or self.last_seen is None:
+            # Start the idle countdown on the first frame too
+            self.last_seen = timestamp
+        if found:
+            self.idle = False
+        elif not self.idle and timestamp - self.last_seen >= self.idle_after:
+            self.idle = True
+
+    def wake(self, timestamp):
+        """Return to full-rate detection (e.g. on user input)"""
+        self.idle = False
+        self.last_seen = timestamp
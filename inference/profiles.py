@@ -0,0 +1,103 @@
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from inference.backends import create_pose_backend
+
+# Inference settings for one exercise mode
+InferenceProfile = namedtuple("InferenceProfile", [
+    "model_variant",
+    "min_detection_confidence",
+    "min_tracking_confidence",
+    "max_width",
+    "max_height",
+])
+
+def build_profiles(overrides, default):
+    """
+    Build the per-mode inference profiles.
+
+    Args:
+        overrides: Dict mapping exercise mode -> dict of InferenceProfile fields to override
+        default: InferenceProfile used for modes without overrides and for unset fields
+
+    Returns:
+        dict: Exercise mode -> InferenceProfile
+    """
+    return {mode: default._replace(**fields) for mode, fields in overrides.items()}
+
+
+class ModelPool:
+    """
+    One pose backend per distinct model configuration, kept loaded ("warm").
+
+    Profiles that share a model variant and confidences share a backend.
+    warm_up() builds every backend the profiles need and runs a frame through
+    each, so switching exercise mode never waits for a model to load.
+    """
+
+    def __init__(self, backend_name, model_dir, delegate, default_profile, num_poses=1):
+        """
+        Args:
+            backend_name: Pose backend ("solutions" or "tasks")
+            model_dir: Model directory for the tasks backend
+            delegate: Tasks backend delegate
+            default_profile: InferenceProfile whose model is used when another
+                profile's model cannot be loaded
+            num_poses: Maximum number of people each backend detects per frame
+        """
+        self.backend_name = backend_name
+        self.model_dir = model_dir
+        self.delegate = delegate
+        self.default_profile = default_profile
+        self.num_poses = num_poses
+        self._backends = {}
+
+    @staticmethod
+    def _model_key(profile):
+        return profile.model_variant, profile.min_detection_confidence, profile.min_tracking_confidence
+
+    def get(self, profile):
+        """Backend for a profile, loading its model if it isn't warm yet"""
+        key = self._model_key(profile)
+        backend = self._backends.get(key)
+        if backend is None:
+            try:
+                backend = create_pose_backend(
+                    self.backend_name, profile.model_variant, self.model_dir,
+                    min_detection_confidence=profile.min_detection_confidence,
+                    min_tracking_confidence=profile.min_tracking_confidence,
+                    delegate=self.delegate, num_poses=self.num_poses)
+            except OSError as exc:
+                # e.g. the model has to be downloaded and the kiosk is offline
+                if key == self._model_key(self.default_profile):
+                    raise
+                print(f"[POSE] could not load the {profile.model_variant} model ({exc}); "
+                      f"using the default {self.default_profile.model_variant} model", file=sys.stderr)
+                backend = self.get(self.default_profile)
+            self._backends[key] = backend
+        return backend
+
+    def warm_up(self, profiles):
+        """
+        Load the models of all profiles and run one blank frame through each
+
+        Args:
+            profiles: Iterable of InferenceProfile
+        """
+        warmed = set()
+        for profile in profiles:
+            backend = self.get(profile)
+            if id(backend) in warmed:
+                continue
+            warmed.add(id(backend))
+            height = profile.max_height or 256
+            width = profile.max_width or 256
+            backend.process(np.zeros((height, width, 3), dtype=np.uint8))
+
+    def close(self):
+        """Release all models"""
+        for backend in {id(backend): backend for backend in self._backends.values()}.values():
+            backend.close()
+        self._backends = {}
@@ -0,0 +1,116 @@
+import numpy as np
+
+from utils.landmarks import X, Y, Z, VISIBILITY
+
+class RegionTracker:
+    """
+    Crops pose inference to the region around the person found last frame.
+
+    The crop box is the landmarks' bounding box plus padding, in normalized
+    full-frame coordinates. It is sticky: it only moves when the person gets
+    close to its border or becomes much smaller than it, so the model sees a
+    stable view from frame to frame. Inference falls back to the full frame
+    when tracking is lost or when the crop would cover most of the frame
+    anyway; on a side where the person reaches the frame edge (and may be
+    partly outside it) the crop extends to that edge.
+    """
+
+    def __init__(self, padding=0.25, max_area=0.6, edge_margin=0.02, border_margin=0.05, visibility=0.3):
+        """
+        Args:
+            padding: Margin added around the landmarks on each side, as a fraction of their box size
+            max_area: Use the full frame when the crop would cover more than this fraction of it
+            edge_margin: Extend the crop to the frame edge on sides where the landmarks come this close to it
+            border_margin: Recompute the crop when the landmarks come this close to its border
+                (fraction of the crop size)
+            visibility: Minimum visibility of landmarks used for the box
+        """
+        self.padding = padding
+        self.max_area = max_area
+        self.edge_margin = edge_margin
+        self.border_margin = border_margin
+        self.visibility = visibility
+        self.box = None  # (x0, y0, x1, y1), normalized full-frame coordinates
+
+    def crop(self, frame):
+        """
+        Region of frame to run pose inference on.
+
+        Returns:
+            tuple: (image, box); image is a view of frame, box is None for the full frame
+        """
+        if self.box is None:
+            return frame, None
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = self.box
+        left, top = int(x0 * width), int(y0 * height)
+        right, bottom = int(np.ceil(x1 * width)), int(np.ceil(y1 * height))
+        if right - left < 2 or bottom - top < 2:
+            return frame, None
+        # Box in the pixel-aligned form the landmarks are mapped back with
+        return frame[top:bottom, left:right], (left / width, top / height, right / width, bottom / height)
+
+    def to_frame(self, landmarks, box):
+        """
+        Map landmarks detected on a crop back to normalized full-frame coordinates.
+
+        Args:
+            landmarks: (33, 4) landmark array normalized to the crop, or None
+            box: Box returned by crop(), or None if the full frame was used
+
+        Returns:
+            np.ndarray: Landmarks normalized to the full frame (updated in place), or None
+        """
+        if landmarks is None or box is None:
+            return landmarks
+        x0, y0, x1, y1 = box
+        landmarks[:, X] = x0 + landmarks[:, X] * (x1 - x0)
+        landmarks[:, Y] = y0 + landmarks[:, Y] * (y1 - y0)
+        # z uses the same scale as x, which was normalized by the crop width
+        landmarks[:, Z] *= x1 - x0
+        return landmarks
+
+    def update(self, landmarks):
+        """
+        Choose the crop for the next frame from this frame's full-frame landmarks.
+
+        Args:
+            landmarks: (33, 4) landmark array in full-frame coordinates, or None if tracking was lost
+        """
+        if landmarks is None:
+            self.box = None
+            return
+        visible = landmarks[:, VISIBILITY] >= self.visibility
+        if not visible.any():
+            self.box = None
+            return
+        xs = landmarks[visible, X]
+        ys = landmarks[visible, Y]
+        left, right = float(xs.min()), float(xs.max())
+        top, bottom = float(ys.min()), float(ys.max())
+
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            inset_x = (x1 - x0) * self.border_margin
+            inset_y = (y1 - y0) * self.border_margin
+            inside = (left >= x0 + inset_x and right <= x1 - inset_x and
+                      top >= y0 + inset_y and bottom <= y1 - inset_y)
+            # Keep the current box unless the person left it or shrank to a fraction of it
+            if inside and (right - left) * (bottom - top) * 4 >= (x1 - x0) * (y1 - y0):
+                return
+
+        pad_x = (right - left) * self.padding
+        pad_y = (bottom - top) * self.padding
+        margin = self.edge_margin
+        box = (0.0 if left <= margin else max(0.0, left - pad_x),
+               0.0 if top <= margin else max(0.0, top - pad_y),
+               1.0 if right >= 1.0 - margin else min(1.0, right + pad_x),
+               1.0 if bottom >= 1.0 - margin else min(1.0, bottom + pad_y))
+        if (box[2] - box[0]) * (box[3] - box[1]) > self.max_area:
+            self.box = None
+        else:
+            self.box = box
+
+    def reset(self):
+        """Go back to full-frame detection"""
+        self.box = None
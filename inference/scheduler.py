@@ -0,0 +1,116 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from utils.landmarks import X, Z
+
+class InferenceScheduler:
+    """
+    Runs pose inference only as often as the machine can afford.
+
+    The scheduler tracks pose inference latency (exponentially smoothed) and
+    picks a stride: inference runs on every stride-th frame so that the
+    average inference cost per displayed frame stays within the budget. On the
+    frames in between, landmarks are extrapolated from the recent inference
+    history, so overlays and detect() still update every displayed frame.
+    The stride drops back to 1 once inference gets fast enough again.
+
+    Usage:
+        if scheduler.should_infer():
+            landmarks = ...run inference...
+            scheduler.record_inference(timestamp, landmarks, latency)
+        else:
+            landmarks = scheduler.predict(timestamp)
+    """
+
+    def __init__(self, budget=1.0 / 30, max_stride=4, history=3, smoothing=0.2, headroom=0.8):
+        """
+        Args:
+            budget: Seconds of pose inference allowed per displayed frame
+            max_stride: Inference runs at least every max_stride-th frame
+            history: Number of recent inference results used for extrapolation
+            smoothing: Weight of the newest latency sample in the running average
+            headroom: The stride is only lowered once the lower stride would use
+                at most this fraction of the budget, so it doesn't flap
+        """
+        self.budget = budget
+        self.max_stride = max(1, max_stride)
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.stride = 1
+        self.latency = None
+        self._frames_since_inference = 0
+        self._history = deque(maxlen=max(2, history))
+
+    def should_infer(self):
+        """Whether pose inference should run on the current frame"""
+        return not self._history or self._frames_since_inference + 1 >= self.stride
+
+    def record_inference(self, timestamp, landmarks, latency):
+        """
+        Record an inference result and adapt the stride.
+
+        Args:
+            timestamp: Frame time in seconds
+            landmarks: (33, 4) landmark array, or None if no pose was found
+            latency: Seconds the inference took
+        """
+        self._frames_since_inference = 0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+
+        needed = min(self.max_stride, max(1, math.ceil(self.latency / self.budget)))
+        if needed > self.stride:
+            self.stride = needed
+        elif self.stride > 1 and self.latency / (self.stride - 1) <= self.budget * self.headroom:
+            self.stride -= 1
+
+        if landmarks is None:
+            # Don't extrapolate across a lost pose
+            self._history.clear()
+        else:
+            self._history.append((timestamp, landmarks))
+
+    def predict(self, timestamp):
+        """
+        Landmarks for a frame on which inference was skipped.
+
+        x, y and z are extrapolated along their least-squares velocity over the
+        history, from the newest result and at most one inference interval
+        ahead; visibility is carried over from the newest result.
+
+        Args:
+            timestamp: Frame time in seconds
+
+        Returns:
+            np.ndarray: Predicted (33, 4) landmark array, or None if there is no pose to predict from
+        """
+        self._frames_since_inference += 1
+        if not self._history:
+            return None
+        last_time, last = self._history[-1]
+        predicted = last.copy()
+        if len(self._history) < 2:
+            return predicted
+
+        times = np.array([t for t, _ in self._history])
+        times -= times.mean()
+        spread = float(np.dot(times, times))
+        if spread <= 0.0:
+            return predicted
+        points = np.stack([landmarks[:, X:Z + 1] for _, landmarks in self._history])
+        velocity = np.tensordot(times, points, axes=1) / spread
+        interval = (times[-1] - times[0]) / (len(times) - 1)
+        ahead = min(max(timestamp - last_time, 0.0), interval)
+        predicted[:, X:Z + 1] += velocity * ahead
+        return predicted
+
+    def reset(self):
+        """Forget the inference history and latency (e.g. after a mode change switches the model profile)"""
+        self._history.clear()
+        self._frames_since_inference = 0
+        self.latency = None
+        self.stride = 1
@@ -0,0 +1,87 @@
+import numpy as np
+
+from utils.landmarks import LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, X, Y
+
+TORSO = (LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP)
+
+class PersonTracker:
+    """
+    Links the poses detected in each frame to stable person IDs.
+
+    Every pose is reduced to its torso center; the distances between all
+    track and detection centers are computed in one array operation and
+    matched greedily, closest pairs first. Unmatched detections start new
+    tracks, and tracks unseen for more than max_missed frames are dropped.
+
+    Usage:
+        ids, removed = tracker.update(poses)  # poses: (K, 33, 4)
+    """
+
+    def __init__(self, max_distance=0.15, max_missed=15):
+        """
+        Args:
+            max_distance: Largest torso-center movement between frames (normalized
+                image units) for a detection to continue a track
+            max_missed: Frames a track survives without a matching detection
+        """
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.centers = np.zeros((0, 2))
+        self.missed = np.zeros(0, dtype=np.int64)
+        self._next_id = 1
+
+    def update(self, poses):
+        """
+        Assign the poses of a frame to tracks.
+
+        Args:
+            poses: (K, 33, 4) landmark array, one row per detected person
+
+        Returns:
+            tuple: (ids, removed) - list with the track id of each pose, in pose
+                order, and the list of track ids dropped in this update
+        """
+        centers = poses[:, TORSO, X:Y + 1].mean(axis=1) if len(poses) else np.zeros((0, 2))
+        detections = len(centers)
+        assignment = np.full(detections, -1)
+        track_matched = np.zeros(len(self.ids), dtype=bool)
+
+        if len(self.ids) and detections:
+            cost = np.linalg.norm(self.centers[:, np.newaxis] - centers[np.newaxis], axis=2)
+            candidates = np.flatnonzero(cost.ravel() <= self.max_distance)
+            # Closest pairs first; each track and each detection is used once
+            for flat in candidates[np.argsort(cost.ravel()[candidates], kind="stable")]:
+                track, detection = divmod(int(flat), detections)
+                if track_matched[track] or assignment[detection] >= 0:
+                    continue
+                track_matched[track] = True
+                assignment[detection] = track
+
+        matched = assignment >= 0
+        self.centers[assignment[matched]] = centers[matched]
+        self.missed[track_matched] = 0
+        self.missed[~track_matched] += 1
+
+        new = np.flatnonzero(~matched)
+        if len(new):
+            new_ids = np.arange(self._next_id, self._next_id + len(new))
+            self._next_id += len(new)
+            assignment[new] = np.arange(len(self.ids), len(self.ids) + len(new))
+            self.ids = np.concatenate((self.ids, new_ids))
+            self.centers = np.concatenate((self.centers, centers[new]))
+            self.missed = np.concatenate((self.missed, np.zeros(len(new), dtype=np.int64)))
+
+        ids = self.ids[assignment].tolist()
+        expired = self.missed > self.max_missed
+        removed = self.ids[expired].tolist()
+        if removed:
+            keep = ~expired
+            self.ids, self.centers, self.missed = self.ids[keep], self.centers[keep], self.missed[keep]
+        return ids, removed
+
+    def reset(self):
+        """Forget all tracks"""
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.centers = np.zeros((0, 2))
+        self.missed = np.zeros(0, dtype=np.int64)
@@ -1,8 +1,15 @@
+import time
+
+# Startup milestones (time to first frame / first landmarks) are measured from here
+PROCESS_START = time.perf_counter()
+
+import argparse
+import sys
+import threading
+from collections import deque, namedtuple
+
 import cv2
-import mediapipe as mp
 import numpy as np
-import time
-import tkinter as tk
 
 # Project module imports
 from exercise_detectors import (
@@ -15,12 +22,84 @@ from utils.visualization import (
     draw_landmarks,
     draw_exercise_info,
     draw_calibration_status,
+    draw_performance_panel,
+    draw_message_bar,
+    draw_person_label,
+)
+from utils.compositor import FrameCompositor
+from utils.frame_buffers import FrameBufferPool, FrameSlotPool
+from utils.pipeline import FramePipeline
+from utils.landmarks import mirror_landmarks
+from utils.recording import LandmarkRecorder, pack_calibration_state
+from network.client import LandmarkSender
+from utils.calibration_store import CalibrationStore, is_plausible
+from utils.metrics import StageTimer
+from utils.events import EventBus, RepCompleted, CalibrationFinished, CalibrationCountdown, log_event
+from utils.audio_cues import AudioCues
+from utils.session_store import SessionStore
+from config.settings import (
+    EXERCISE_MODES,
+    CALIBRATION_PROFILES,
+    CALIBRATION_STORE_PATH,
+    CALIBRATION_DEFAULT_USER,
+    CALIBRATION_MATCH_TOLERANCE,
+    POSE_MIN_DETECTION_CONFIDENCE,
+    POSE_MIN_TRACKING_CONFIDENCE,
+    POSE_BACKEND,
+    POSE_MODEL_VARIANT,
+    POSE_MODEL_DIR,
+    POSE_DELEGATE,
+    INFERENCE_NUM_THREADS,
+    INFERENCE_PROFILES,
+    WARM_MODELS,
+    PIPELINED_MODE,
+    PIPELINE_QUEUE_SIZE,
+    INFERENCE_MAX_WIDTH,
+    INFERENCE_MAX_HEIGHT,
+    ROI_CROPPING,
+    ROI_PADDING,
+    ROI_MAX_AREA,
+    ADAPTIVE_INFERENCE,
+    INFERENCE_FRAME_BUDGET,
+    INFERENCE_MAX_STRIDE,
+    IDLE_MODE,
+    IDLE_AFTER_SECONDS,
+    IDLE_POLL_INTERVAL,
+    IDLE_INFERENCE_WIDTH,
+    IDLE_INFERENCE_HEIGHT,
+    MULTI_PERSON,
+    MAX_PEOPLE,
+    TRACK_MAX_DISTANCE,
+    TRACK_MAX_MISSED,
+    NETWORK_PORT,
+    AUDIO_CUES,
+    AUDIO_SAMPLE_RATE,
+    AUDIO_BLOCK_SIZE,
+    AUDIO_VOLUME,
+    AUDIO_STAGE_CUES,
+    AUDIO_CUE_FILES,
+    SESSION_HISTORY,
+    SESSION_DB_PATH,
+    SESSION_BATCH_SIZE,
+    SESSION_FLUSH_INTERVAL,
+    SESSION_MAX_PENDING,
+    METRICS_WINDOW,
+    METRICS_DUMP_INTERVAL,
 )
-from config.settings import EXERCISE_MODES, POSE_MIN_DETECTION_CONFIDENCE, POSE_MIN_TRACKING_CONFIDENCE
 from pose_guide import PoseGuide
+from inference import (
+    InferenceScheduler,
+    RegionTracker,
+    PresenceMonitor,
+    PersonTracker,
+    InferenceProfile,
+    ModelPool,
+    build_profiles,
+)
 
 def get_screen_size():
     try:
+        import tkinter as tk
         root = tk.Tk()
         root.withdraw()
         width = root.winfo_screenwidth()
@@ -30,15 +109,102 @@ def get_screen_size():
     except Exception:
         return 1280, 720
 
+def get_inference_size(width, height, max_width=INFERENCE_MAX_WIDTH, max_height=INFERENCE_MAX_HEIGHT):
+    """
+    Size of the pose-inference copy of a width x height frame.
+
+    The aspect ratio is preserved so MediaPipe's normalized landmarks map
+    directly back onto the original frame.
+    """
+    scale = 1.0
+    if max_width:
+        scale = min(scale, max_width / width)
+    if max_height:
+        scale = min(scale, max_height / height)
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
 PANEL_WIDTH = 400
 
+# Output of the inference stage, consumed by the render stage
+# (predicted is True when inference was skipped and the landmarks were extrapolated,
+# idle is True while nobody is in front of the camera and inference is throttled,
+# people lists every tracked Person in multi-person mode and is None otherwise)
+FrameAnalysis = namedtuple("FrameAnalysis", ["landmarks", "count", "stage", "predicted", "idle", "people"],
+                           defaults=(None,))
+
+# One tracked person in multi-person mode
+Person = namedtuple("Person", ["track_id", "landmarks", "count", "stage"])
+
+# One webcam read: the unmirrored camera image and the mirrored display frame
+# slot: FrameSlotPool slot holding raw and display (pipelined mode), else None
+CameraFrame = namedtuple("CameraFrame", ["raw", "display", "slot"], defaults=(None,))
+
 class ExerciseRecognitionSystem:
-    def __init__(self):
-        self.mp_pose = mp.solutions.pose
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=POSE_MIN_DETECTION_CONFIDENCE,
-            min_tracking_confidence=POSE_MIN_TRACKING_CONFIDENCE)
+    def __init__(self, clock=time.time, recorder=None, metrics_path=None, adaptive_inference=ADAPTIVE_INFERENCE,
+                 idle_mode=IDLE_MODE, warm_models=WARM_MODELS, background_loading=False, started_at=None,
+                 record_telemetry=False, calibration_store=None, user=CALIBRATION_DEFAULT_USER,
+                 multi_person=MULTI_PERSON, events=None, exercise_mode=0):
+        """
+        Args:
+            clock: Callable returning the current time in seconds; calibration
+                timing runs on this clock (video time in batch mode)
+            recorder: Optional LandmarkRecorder receiving every frame's landmarks
+                and calibration events
+            metrics_path: Optional file periodically rewritten with per-stage
+                latency metrics in Prometheus text format
+            adaptive_inference: Skip pose inference on some frames when it is slower
+                than INFERENCE_FRAME_BUDGET, extrapolating landmarks in between
+            idle_mode: Throttle pose inference after IDLE_AFTER_SECONDS without a
+                detected pose, until someone steps in front of the camera
+            warm_models: Load the models of all INFERENCE_PROFILES up front instead
+                of on the first frame of each exercise mode
+            background_loading: Load and warm up the pose models on a background
+                thread; until they are ready frames are shown without inference
+            started_at: Optional time.perf_counter() value at launch; when given,
+                startup milestones (models loaded, first frame, first landmarks)
+                are measured from it and reported
+            record_telemetry: Also stream every detector telemetry record to the recorder
+            calibration_store: Optional CalibrationStore; successful calibrations are
+                saved to it (its file is written on a background thread) and reused
+                (after a one-frame plausibility check) when the user selects the
+                exercise again
+            user: User the calibration profiles are saved for
+            multi_person: Detect up to MAX_PEOPLE people per frame (tasks backend),
+                link them to stable IDs and give each their own detector and
+                calibration; adaptive inference and ROI cropping are not used
+            events: Optional EventBus the detectors publish rep, stage and calibration
+                events to; by default a bus that logs calibration results is created
+            exercise_mode: Exercise mode to start in; its profile's model is the one
+                loaded at startup (with warm_models=False, the only one loaded until
+                the mode changes)
+        """
+        self.clock = clock
+        self.recorder = recorder
+        self.timings = StageTimer(METRICS_WINDOW, metrics_path=metrics_path,
+                                  metrics_interval=METRICS_DUMP_INTERVAL, started_at=started_at)
+        self.default_profile = InferenceProfile(
+            POSE_MODEL_VARIANT, POSE_MIN_DETECTION_CONFIDENCE, POSE_MIN_TRACKING_CONFIDENCE,
+            INFERENCE_MAX_WIDTH, INFERENCE_MAX_HEIGHT)
+        self.profiles = build_profiles(INFERENCE_PROFILES, self.default_profile)
+        self.models = ModelPool(POSE_BACKEND, POSE_MODEL_DIR, POSE_DELEGATE, self.default_profile,
+                                num_poses=MAX_PEOPLE if multi_person else 1)
+        self.pose = None  # backend of the latest inference
+        self.models_ready = threading.Event()
+        self._model_error = None
+        self._loader = None
+        # The starting mode's model first; the default one is only needed up front when warming them all
+        warm_profiles = [self.profiles.get(exercise_mode, self.default_profile)]
+        if warm_models:
+            warm_profiles.append(self.default_profile)
+            warm_profiles.extend(self.profiles.values())
+        if background_loading:
+            self._loader = threading.Thread(target=self._load_models, args=(warm_profiles,),
+                                            name="model-loader", daemon=True)
+            self._loader.start()
+        else:
+            self._load_models(warm_profiles)
+            if self._model_error is not None:
+                raise self._model_error
 
         self.detectors = {
             1: StationaryRunningDetector(),
@@ -46,11 +212,22 @@ class ExerciseRecognitionSystem:
             3: SquatDetector(),
             4: JumpingJackDetector()
         }
+        self.record_telemetry = record_telemetry and recorder is not None
+        if events is None:
+            events = EventBus(clock)
+            events.subscribe(log_event, kinds=(CalibrationFinished,))
+        self.events = events
+        for mode, detector in self.detectors.items():
+            self.attach_detector(mode, detector)
 
-        self.exercise_mode = 0  # Start with camera test mode
+        self.exercise_mode = exercise_mode  # Camera test mode (0) unless told otherwise
+        self.calibration_store = calibration_store
+        self.user = user
+        self.saved_calibration = None  # profile of the current mode awaiting its plausibility check
 
         self.calibrating = False
         self.countdown_start = None
+        self.countdown_announced = None  # last countdown second published on the event bus
         self.countdown_seconds = 10
         self.instruction_seconds = 7
         self.capture_start = None
@@ -60,31 +237,320 @@ class ExerciseRecognitionSystem:
         self.pose_guide = PoseGuide()
         self.latest_landmarks = None
         self.debug_mode = False
+        # Inference-stage image buffers (only touched by the thread running analyze_frame)
+        self.buffers = FrameBufferPool()
+        self.scheduler = None
+        if adaptive_inference and not multi_person:
+            self.scheduler = InferenceScheduler(INFERENCE_FRAME_BUDGET, INFERENCE_MAX_STRIDE)
+        self.roi = RegionTracker(ROI_PADDING, ROI_MAX_AREA) if ROI_CROPPING and not multi_person else None
+        # Multi-person mode: track id -> that person's detector for the current exercise mode
+        self.tracker = PersonTracker(TRACK_MAX_DISTANCE, TRACK_MAX_MISSED) if multi_person else None
+        self.person_detectors = {}
+        self.latest_people = []
+        # Set by change_exercise_mode(); the scheduler and tracker are only touched by the
+        # thread running analyze_frame(), which resets them before its next frame
+        self._reset_inference_state = False
+        self.presence = PresenceMonitor(IDLE_AFTER_SECONDS, IDLE_POLL_INTERVAL) if idle_mode else None
+        # Crop boxes of recently submitted frames, for asynchronous backends whose
+        # results arrive a few frames later
+        self._crop_boxes = deque(maxlen=16)
+
+        # Guards detector and calibration state when inference and rendering
+        # run on different threads (pipelined mode)
+        self.lock = threading.RLock()
+
+    def _load_models(self, profiles):
+        try:
+            # Running a frame through each model here keeps its one-time graph setup off the first live frame
+            self.models.warm_up(profiles)
+            self.pose = self.models.get(profiles[0])
+            self.mark_startup("models_loaded")
+        except Exception as exc:
+            self._model_error = exc
+        finally:
+            self.models_ready.set()
+
+    def attach_detector(self, mode, detector, person=None):
+        """Connect a new detector to the event bus (and the recorder, when recording telemetry)"""
+        detector.attach_events(self.events, person)
+        if self.record_telemetry and person is None:
+            detector.telemetry.subscribe(
+                lambda telemetry: self.recorder.record_telemetry(self.clock(), mode, telemetry.values))
+
+    def mark_startup(self, milestone):
+        """Record and report a startup milestone the first time it is reached"""
+        elapsed = self.timings.mark(milestone)
+        if elapsed is not None:
+            print(f"[STARTUP] {milestone}: {elapsed:.2f}s", file=sys.stderr)
+
+    def close(self):
+        """Wait for a background model load to finish, release the models and stop the event consumers"""
+        if self._loader is not None:
+            self._loader.join()
+        self.models.close()
+        self.events.close()
+
+    def process_frame(self, frame, cam_width, cam_height, inference_frame=None):
+        """
+        Analyze a frame and draw the overlays on it.
+
+        Args:
+            frame: BGR display frame
+            cam_width: Width of the camera area in pixels
+            cam_height: Height of the camera area in pixels
+            inference_frame: Optional unmirrored camera image to run pose inference
+                on; frame must then be its mirror image
+        """
+        if inference_frame is None:
+            analysis = self.analyze_frame(frame)
+        else:
+            analysis = self.analyze_frame(inference_frame, mirrored=True)
+        return self.render_frame(frame, analysis, cam_width, cam_height)
+
+    def analyze_frame(self, frame, mirrored=False):
+        """
+        Run pose inference and the active detector on a frame without drawing on it.
+
+        Args:
+            frame: BGR camera frame
+            mirrored: True if frame is the unmirrored camera image while the display
+                (and the detectors' calibration) use the mirror view; the flip is
+                applied to the landmarks instead of the pixels
+
+        Returns:
+            FrameAnalysis: (33, 4) landmark array (or None) plus the detector's count and stage
+        """
+        if not self.models_ready.is_set():
+            # Still loading: the frame is shown as is
+            return FrameAnalysis(None, 0, "Unknown", False, False)
+        if self._model_error is not None:
+            raise self._model_error
+
+        timings = self.timings
+        timestamp = self.clock()
+        if self._reset_inference_state:
+            self._reset_inference_state = False
+            self.reset_inference_state()
+        scheduler = self.scheduler
+        presence = self.presence
+        idle = presence is not None and presence.idle and not self.calibrating
+        if idle and not presence.should_poll(timestamp):
+            # Nobody around: skip the pose pipeline until the next presence check
+            return FrameAnalysis(None, 0, "Unknown", False, True, [] if self.tracker is not None else None)
+        if self.tracker is not None:
+            return self._analyze_people(frame, mirrored, timestamp, idle)
 
-    def process_frame(self, frame, cam_width, cam_height):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = self.pose.process(rgb_frame)
+        # Calibration always captures real inference results
+        predicted = (not idle and scheduler is not None and not self.calibrating and
+                     not scheduler.should_infer())
+        if predicted:
+            landmarks = scheduler.predict(timestamp)
+        else:
+            if idle:
+                landmarks, _ = self.infer(frame, mirrored, (IDLE_INFERENCE_WIDTH, IDLE_INFERENCE_HEIGHT))
+            else:
+                landmarks, latency = self.infer(frame, mirrored)
+                if scheduler is not None:
+                    scheduler.record_inference(timestamp, landmarks, latency)
+            if presence is not None:
+                presence.update(timestamp, landmarks is not None)
+                idle = presence.idle
+            if landmarks is not None and "first_landmarks" not in timings.milestones:
+                self.mark_startup("first_landmarks")
         count = 0
         stage = "Unknown"
 
-        if result.pose_landmarks:
-            frame = draw_landmarks(frame, result.pose_landmarks, self.mp_pose, self.mp_drawing)
-            self.latest_landmarks = result.pose_landmarks.landmark
+        with self.lock:
+            self.latest_landmarks = landmarks
+            if self.saved_calibration is not None and landmarks is not None and not predicted:
+                self._apply_saved_calibration(timestamp, landmarks)
+            if self.recorder is not None:
+                self.recorder.record_frame(timestamp, landmarks, self.exercise_mode, self.calibrating,
+                                           predicted=predicted)
+            if landmarks is not None and not self.calibrating and self.exercise_mode != 0:
+                detector = self.detectors.get(self.exercise_mode)
+                if detector and getattr(detector, 'calibrated', False):
+                    start = time.perf_counter()
+                    count, stage = detector.detect(landmarks)
+                    timings.lap("detect", start)
+
+        return FrameAnalysis(landmarks, count, stage, predicted, idle)
+
+    def _analyze_people(self, frame, mirrored, timestamp, idle):
+        """Multi-person analyze_frame(): one inference pass, then a tracked detector per person"""
+        max_size = (IDLE_INFERENCE_WIDTH, IDLE_INFERENCE_HEIGHT) if idle else None
+        poses, _ = self.infer(frame, mirrored, max_size)
+        if self.presence is not None:
+            self.presence.update(timestamp, len(poses) > 0)
+            idle = self.presence.idle
+        ids, removed = self.tracker.update(poses)
+
+        start = time.perf_counter()
+        people = []
+        total = 0
+        with self.lock:
+            for track_id in removed:
+                self.person_detectors.pop(track_id, None)
+            for track_id, landmarks in zip(ids, poses):
+                count = 0
+                stage = "Not calibrated"
+                detector = self.person_detectors.get(track_id)
+                if detector is not None and not self.calibrating:
+                    count, stage = detector.detect(landmarks)
+                    total += count
+                people.append(Person(track_id, landmarks, count, stage))
+            self.latest_people = people
+            landmarks = people[0].landmarks if people else None
+            self.latest_landmarks = landmarks
+            if self.recorder is not None:
+                self.recorder.record_frame(timestamp, landmarks, self.exercise_mode, self.calibrating)
+        self.timings.lap("detect", start)
+        return FrameAnalysis(landmarks, total, f"{len(people)} people", False, idle, people)
+
+    def _calibrate_people(self):
+        """
+        Give every tracked person a detector calibrated on their current pose.
+
+        The mode's shared detector is calibrated with the first person as well,
+        so the status panel reflects the group.
+
+        Returns:
+            int: Number of people calibrated
+        """
+        self.person_detectors = {}
+        shared = self.detectors.get(self.exercise_mode)
+        if shared is None:
+            return 0
+        for person in self.latest_people:
+            detector = type(shared)()
+            self.attach_detector(self.exercise_mode, detector, person.track_id)
+            key_points = self.pose_guide.extract_key_points(person.landmarks, self.exercise_mode)
+            if detector.calibrate(person.landmarks, key_points):
+                self.person_detectors[person.track_id] = detector
+        if self.person_detectors:
+            first = self.latest_people[0]
+            shared.calibrate(first.landmarks, self.pose_guide.extract_key_points(first.landmarks, self.exercise_mode))
+        return len(self.person_detectors)
+
+    def infer(self, frame, mirrored=False, max_size=None):
+        """
+        Run the pose model on a frame.
+
+        Args:
+            frame: BGR camera frame
+            mirrored: Mirror the landmarks (see analyze_frame)
+            max_size: Optional (width, height) the inference copy must fit in,
+                instead of the current profile's size
+
+        Returns:
+            tuple: (33, 4) landmark array or None (in multi-person mode a (K, 33, 4)
+                array of every detected pose), and the seconds pose.process took
+                (only the submit time for asynchronous backends)
+        """
+        timings = self.timings
+        start = time.perf_counter()
+        profile = self.current_profile()
+        pose = self.models.get(profile)
+        if pose is not self.pose:
+            # Exercise mode switched models; pending crop boxes belong to the old one
+            self.pose = pose
+            self._crop_boxes.clear()
+        if max_size is None:
+            max_size = (profile.max_width, profile.max_height)
+        # Only the region around the previously found person goes through preprocessing and the model
+        image, box = self.roi.crop(frame) if self.roi is not None else (frame, None)
+        rgb_frame = self.prepare_inference_frame(image, max_size)
+        start = timings.lap("color_convert", start)
+        if self.tracker is not None:
+            # Everyone is found in one pass, so the model's cost doesn't grow with the group
+            poses, _ = self.pose.process_all(rgb_frame)
+            latency = time.perf_counter() - start
+            timings.record("pose_process", latency)
+            return (mirror_landmarks(poses) if mirrored else poses), latency
+        self._crop_boxes.append((self.pose.frames_submitted, box))
+        # One landmark array per frame; detectors, calibration and drawing all share it
+        landmarks, frame_index = self.pose.process(rgb_frame)
+        latency = time.perf_counter() - start
+        timings.record("pose_process", latency)
+
+        if self.roi is not None and landmarks is not None:
+            # Map back with the crop of the frame the result belongs to
+            box = next((box for index, box in self._crop_boxes if index == frame_index), False)
+            landmarks = None if box is False else self.roi.to_frame(landmarks.copy(), box)
+        if self.roi is not None:
+            self.roi.update(landmarks)
+        if mirrored:
+            landmarks = mirror_landmarks(landmarks)
+        return landmarks, latency
+
+    def current_profile(self):
+        """InferenceProfile of the active exercise mode"""
+        return self.profiles.get(self.exercise_mode, self.default_profile)
+
+    def prepare_inference_frame(self, frame, max_size=None):
+        """
+        Build the downscaled RGB copy of a camera frame that pose inference runs on.
+
+        Resizing happens before colour conversion so the conversion only touches
+        the small image; the source frame itself is left untouched. Both steps
+        write into preallocated buffers, so the returned image is only valid
+        until the next call.
+        """
+        height, width = frame.shape[:2]
+        if max_size is None:
+            inference_width, inference_height = get_inference_size(width, height)
+        else:
+            inference_width, inference_height = get_inference_size(width, height, *max_size)
+        if (inference_width, inference_height) != (width, height):
+            frame = cv2.resize(frame, (inference_width, inference_height),
+                               dst=self.buffers.get("inference_bgr", (inference_height, inference_width, 3)),
+                               interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.buffers.get("inference_rgb", frame.shape))
+
+    def render_frame(self, frame, analysis, cam_width, cam_height):
+        """
+        Draw landmarks, exercise info and calibration overlays for an analyzed frame.
+
+        Args:
+            frame: BGR camera frame the analysis was computed on
+            analysis: FrameAnalysis returned by analyze_frame()
+            cam_width: Width of the camera area in pixels
+            cam_height: Height of the camera area in pixels
+
+        Returns:
+            frame: The frame with overlays drawn
+        """
+        start = time.perf_counter()
+        with self.lock:
+            frame = self._render_frame(frame, analysis, cam_width, cam_height)
+        self.timings.lap("overlay", start)
+        return frame
+
+    def _render_frame(self, frame, analysis, cam_width, cam_height):
+        if not self.models_ready.is_set():
+            return draw_calibration_status(frame, "Loading pose model...")
+        if analysis.idle:
+            return draw_calibration_status(frame, "Step in front of the camera to start.")
+
+        if analysis.people is not None:
+            for person in analysis.people:
+                frame = draw_landmarks(frame, person.landmarks)
+                frame = draw_person_label(frame, person.track_id, person.count, person.landmarks)
+        elif analysis.landmarks is not None:
+            frame = draw_landmarks(frame, analysis.landmarks)
+        if analysis.landmarks is not None:
             if not self.calibrating:
                 if self.exercise_mode == 0:
                     status_message = "Select an exercise using 'm' or press 'c' to start camera testing."
                     frame = draw_calibration_status(frame, status_message)
                 else:
                     detector = self.detectors.get(self.exercise_mode)
-                    if detector and getattr(detector, 'calibrated', False):
-                        count, stage = detector.detect(self.latest_landmarks)
-                    elif detector:
+                    if detector and not getattr(detector, 'calibrated', False):
                         status_message = "Press 'c' to calibrate for this exercise."
                         frame = draw_calibration_status(frame, status_message)
-        else:
-            self.latest_landmarks = None
 
-        frame = draw_exercise_info(frame, EXERCISE_MODES.get(self.exercise_mode, "Unknown"), count, stage)
+        frame = draw_exercise_info(frame, EXERCISE_MODES.get(self.exercise_mode, "Unknown"),
+                                   analysis.count, analysis.stage)
         frame = self.process_calibration(frame)
 
         # Draw debug line for stationary running's ANKLE threshold
@@ -107,7 +573,53 @@ class ExerciseRecognitionSystem:
         self.exercise_mode = (self.exercise_mode + 1) % len(EXERCISE_MODES)
         if self.exercise_mode in self.detectors:
             self.detectors[self.exercise_mode] = type(self.detectors[self.exercise_mode])()
+            self.attach_detector(self.exercise_mode, self.detectors[self.exercise_mode])
             # Reset latest_landmarks to avoid carrying over
+        self.person_detectors = {}
+        # The new mode may run another model profile with its own latency
+        self._reset_inference_state = True
+        self._load_saved_calibration()
+
+    def reset_inference_state(self):
+        """
+        Forget the inference scheduler's history and the tracked people
+
+        Must run on the thread calling analyze_frame(); other threads request it
+        through change_exercise_mode().
+        """
+        if self.scheduler is not None:
+            self.scheduler.reset()
+        if self.tracker is not None:
+            self.tracker.reset()
+
+    def _load_saved_calibration(self):
+        """Look up the user's saved calibration for the current mode; it is applied on the next pose"""
+        self.saved_calibration = None
+        if (self.calibration_store is None or self.exercise_mode not in self.detectors or
+                self.tracker is not None):
+            return
+        self.saved_calibration = self.calibration_store.load(self.user, self.exercise_mode)
+        if self.saved_calibration is not None:
+            self.calibration_message = "Checking your saved calibration..."
+
+    def _apply_saved_calibration(self, timestamp, landmarks):
+        profile = self.saved_calibration
+        self.saved_calibration = None
+        detector = self.detectors.get(self.exercise_mode)
+        if detector is None or self.calibrating:
+            return
+        calibrated_ok = is_plausible(landmarks, profile["key_points"], CALIBRATION_MATCH_TOLERANCE)
+        if calibrated_ok:
+            detector.restore_calibration(profile["state"], profile["key_points"])
+            self.calibration_message = "Welcome back! Saved calibration loaded."
+        else:
+            self.calibration_message = "Saved calibration doesn't match. Press 'c' to calibrate."
+        if self.recorder is not None:
+            # A restored profile is recorded with its state, so replay restores the same calibration
+            restored_state = (pack_calibration_state(detector.CALIBRATION_FIELDS, profile["state"])
+                              if calibrated_ok else None)
+            self.recorder.record_calibration(timestamp, landmarks, self.exercise_mode, calibrated_ok,
+                                             restored_state)
 
     def calibrate_current_detector(self):
         if self.exercise_mode == 0:
@@ -116,23 +628,20 @@ class ExerciseRecognitionSystem:
             self.countdown_start = None
             self.capture_start = None
         else:
+            self.saved_calibration = None
             self.countdown_seconds = 10
             self.instruction_seconds = 7
             self.calibrating = True
-            self.countdown_start = time.time()
+            self.countdown_start = self.clock()
+            self.countdown_announced = None
             self.capture_start = None
             self.calibration_message = "Read the instructions carefully..."
         return True
 
     def process_calibration(self, frame):
-        current_time = time.time()
+        current_time = self.clock()
         if self.exercise_mode == 0 and self.calibrating:
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (0, frame.shape[0] - 80), (frame.shape[1], frame.shape[0]), (0, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
-            cv2.putText(frame, self.calibration_message,
-                        (20, frame.shape[0] - 40), cv2.FONT_HERSHEY_SIMPLEX,
-                        1.0, (255, 255, 255), 2, cv2.LINE_AA)
+            frame = draw_message_bar(frame, self.calibration_message)
             return frame
 
         # Calibration phase for exercise
@@ -144,30 +653,45 @@ class ExerciseRecognitionSystem:
 
             # Capture finished
             detector = self.detectors.get(self.exercise_mode)
-            if detector and self.latest_landmarks:
-                calibrated_ok = detector.calibrate(self.latest_landmarks)
+            if self.tracker is not None:
+                calibrated_people = self._calibrate_people()
+                if calibrated_people:
+                    self.calibration_message = f"Calibration complete for {calibrated_people} people!"
+                else:
+                    self.calibration_message = "Calibration failed! No body detected."
+            elif detector and self.latest_landmarks is not None:
+                key_points = self.pose_guide.extract_key_points(self.latest_landmarks, self.exercise_mode)
+                calibrated_ok = detector.calibrate(self.latest_landmarks, key_points)
+                if self.recorder is not None:
+                    self.recorder.record_calibration(current_time, self.latest_landmarks,
+                                                     self.exercise_mode, calibrated_ok)
                 if calibrated_ok:
                     self.calibration_message = "Calibration complete!"
+                    if self.calibration_store is not None:
+                        self.calibration_store.save(self.user, self.exercise_mode,
+                                                    detector.calibration_state(), key_points)
                 else:
                     self.calibration_message = "Calibration failed! No body detected."
             else:
                 self.calibration_message = "Calibration failed! No body detected."
+                if self.recorder is not None:
+                    self.recorder.record_calibration(current_time, None, self.exercise_mode, False)
             self.calibrating = False
             self.capture_start = None
 
         elif self.countdown_start is not None:
             elapsed = current_time - self.countdown_start
             remaining = max(0, self.countdown_seconds - int(elapsed))
+            if remaining != self.countdown_announced:
+                self.countdown_announced = remaining
+                detector = self.detectors.get(self.exercise_mode)
+                self.events.publish(CalibrationCountdown(current_time, detector.name if detector else None,
+                                                         None, remaining))
             if elapsed <= self.instruction_seconds:
                 frame = self.pose_guide.draw_pose_instructions(frame, self.exercise_mode, remaining)
             else:
+                # The message bar is drawn below
                 self.calibration_message = f"Get ready! {remaining}..."
-                overlay = frame.copy()
-                cv2.rectangle(overlay, (0, frame.shape[0] - 80), (frame.shape[1], frame.shape[0]), (0, 0, 0), -1)
-                cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
-                cv2.putText(frame, self.calibration_message,
-                            (20, frame.shape[0] - 40), cv2.FONT_HERSHEY_SIMPLEX,
-                            1.0, (255, 255, 255), 2, cv2.LINE_AA)
             if elapsed >= self.countdown_seconds:
                 self.countdown_start = None
                 self.capture_start = current_time
@@ -175,76 +699,139 @@ class ExerciseRecognitionSystem:
 
         if (self.countdown_start is None or
             (self.countdown_start and current_time - self.countdown_start > self.instruction_seconds)):
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (0, frame.shape[0] - 80), (frame.shape[1], frame.shape[0]), (0, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
-            cv2.putText(frame, self.calibration_message,
-                        (20, frame.shape[0] - 40), cv2.FONT_HERSHEY_SIMPLEX,
-                        1.0, (255, 255, 255), 2, cv2.LINE_AA)
+            frame = draw_message_bar(frame, self.calibration_message)
         return frame
 
-def main():
-    screen_width, screen_height = get_screen_size()
-    panel_width = PANEL_WIDTH
-    cam_width = max(400, screen_width - 2 * panel_width)
-    cam_height = int(screen_height * 0.8)
+class CameraReader:
+    """
+    Reads webcam frames into preallocated buffers.
 
-    cap = cv2.VideoCapture(0)
-    exercise_system = ExerciseRecognitionSystem()
+    Each read yields the raw camera image, which pose inference runs on with
+    the mirroring applied to the landmarks, and the mirrored display frame
+    scaled to the camera area. The flip runs on the raw image before upscaling
+    so it touches as few pixels as possible.
+    """
 
-    while cap.isOpened():
-        ret, frame = cap.read()
+    def __init__(self, cap, cam_width, cam_height, buffers=None, timings=None):
+        """
+        Args:
+            cap: Opened cv2.VideoCapture
+            cam_width: Width of the camera area in pixels
+            cam_height: Height of the camera area in pixels
+            buffers: FrameBufferPool for the frames handed out (default: a new
+                single-slot pool); read() can take a per-frame slot instead
+            timings: Optional StageTimer receiving capture and resize_flip latencies
+        """
+        self.cap = cap
+        self.cam_width = cam_width
+        self.cam_height = cam_height
+        self.buffers = buffers or FrameBufferPool()
+        self.timings = timings
+        self._scratch = FrameBufferPool()
+        raw_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        raw_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.raw_shape = (raw_height, raw_width, 3) if raw_width and raw_height else None
+
+    def read(self, out=None, slot=None):
+        """
+        Read the next frame.
+
+        Args:
+            out: Optional (cam_height, cam_width, 3) buffer receiving the display
+                frame, e.g. the compositor's camera view
+            slot: Optional FrameSlotPool slot whose buffers the frame is read into
+                instead of the reader's own pool
+
+        Returns:
+            CameraFrame: Raw and display frame, or None if the camera returned nothing
+        """
+        start = time.perf_counter()
+        buffers = slot or self.buffers
+        raw_buffer = buffers.get("raw", self.raw_shape) if self.raw_shape else None
+        ret, raw = self.cap.read(raw_buffer)
         if not ret:
-            break
+            return None
+        self.raw_shape = raw.shape
+        if self.timings is not None:
+            start = self.timings.lap("capture", start)
 
-        frame = cv2.resize(frame, (cam_width, cam_height))
-        frame = cv2.flip(frame, 1)
-        processed_frame = exercise_system.process_frame(frame, cam_width, cam_height)
-        if processed_frame is None:
-            processed_frame = np.zeros_like(frame)  # fallback to blank
+        if out is None:
+            out = buffers.get("display", (self.cam_height, self.cam_width, 3))
+        if raw.shape[:2] == (self.cam_height, self.cam_width):
+            cv2.flip(raw, 1, dst=out)
+        else:
+            mirrored = cv2.flip(raw, 1, dst=self._scratch.get("mirrored", raw.shape))
+            cv2.resize(mirrored, (self.cam_width, self.cam_height), dst=out)
+        if self.timings is not None:
+            self.timings.lap("resize_flip", start)
+        return CameraFrame(raw, out, slot)
 
-        canvas = np.zeros((cam_height, cam_width + 2 * panel_width, 3), dtype=np.uint8)
-        canvas[:, panel_width:panel_width + cam_width] = processed_frame
+def draw_instruction_panel(panel):
+    """Draw the static key bindings panel"""
+    cv2.putText(panel, "Instructions:", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    cv2.putText(panel, "Press 'm' to change exercise", (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
+    cv2.putText(panel, "Press 'c' to calibrate", (10, 140), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
+    cv2.putText(panel, "Press 'd' to toggle debug info", (10, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
+    cv2.putText(panel, "Press 'q' to quit", (10, 220), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
 
-        # Left panel: Instructions
-        cv2.putText(canvas, "Instructions:", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        cv2.putText(canvas, "Press 'm' to change exercise", (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
-        cv2.putText(canvas, "Press 'c' to calibrate", (10, 140), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
-        cv2.putText(canvas, "Press 'd' to toggle debug info", (10, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
-        cv2.putText(canvas, "Press 'q' to quit", (10, 220), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180, 180, 180), 2)
+def create_compositor(cam_width, cam_height, panel_width=PANEL_WIDTH):
+    """Preallocate the output canvas and render its static instruction panel"""
+    compositor = FrameCompositor(cam_width, cam_height, panel_width)
+    compositor.render_left_panel(draw_instruction_panel)
+    return compositor
 
-        # Right panel: Status and debug
-        cv2.putText(canvas, "Current Exercise:", (cam_width + panel_width + 10, 40),
+def compose_canvas(exercise_system, compositor, processed_frame):
+    """Place the processed camera frame between the instruction and status panels"""
+    mode = exercise_system.exercise_mode
+    calibrated = False
+    if mode in exercise_system.detectors:
+        calibrated = getattr(exercise_system.detectors[mode], 'calibrated', False)
+
+    # Right panel: Status (re-rendered only when the mode or calibration changes)
+    def draw_status(panel):
+        cv2.putText(panel, "Current Exercise:", (10, 40),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-        cv2.putText(canvas, EXERCISE_MODES.get(exercise_system.exercise_mode, "None"),
-                   (cam_width + panel_width + 10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 200, 0), 2)
-        calibrated = False
-        if exercise_system.exercise_mode in exercise_system.detectors:
-            detector = exercise_system.detectors[exercise_system.exercise_mode]
-            calibrated = getattr(detector, 'calibrated', False)
+        cv2.putText(panel, EXERCISE_MODES.get(mode, "None"),
+                   (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 200, 0), 2)
         status = "Calibrated" if calibrated else "Not Calibrated"
         color = (0, 255, 0) if calibrated else (0, 0, 255)
-        cv2.putText(canvas, f"Status: {status}", (cam_width + panel_width + 10, 120),
+        cv2.putText(panel, f"Status: {status}", (10, 120),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
 
-        # Body parts, debug info, etc. (as in your previous main)
-        if exercise_system.debug_mode:
-            if exercise_system.exercise_mode in exercise_system.detectors:
-                detector = exercise_system.detectors[exercise_system.exercise_mode]
-                debug_info = getattr(detector, "last_debug_info", None)
-                if debug_info:
-                    y_offset = 600
-                    cv2.putText(canvas, "Detector Debug Info:", (cam_width + panel_width + 10, y_offset),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 200, 255), 2)
-                    for i, (key, val) in enumerate(debug_info.items()):
-                        cv2.putText(canvas, f"{key}: {val}", (cam_width + panel_width + 10, y_offset + 30 + (i+1)*25),
-                                    cv2.FONT_HERSHEY_SIMPLEX, 0.65, (255,255,255), 1)
-
-        cv2.imshow('Exercise Recognition', canvas)
-
-        key = cv2.waitKey(1) & 0xFF
+    # Right panel: performance and detector debug info, redrawn every frame
+    def draw_debug(panel):
+        y = draw_performance_panel(panel, 10, 170, exercise_system.timings)
+        if exercise_system.scheduler is not None:
+            cv2.putText(panel, f"Pose inference every {exercise_system.scheduler.stride} frame(s)", (10, y + 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (180, 180, 180), 1)
+        if mode in exercise_system.detectors:
+            detector = exercise_system.detectors[mode]
+            debug_info = detector.debug_info()
+            if debug_info:
+                y_offset = 600
+                cv2.putText(panel, "Detector Debug Info:", (10, y_offset),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 200, 255), 2)
+                for i, (key, val) in enumerate(debug_info.items()):
+                    cv2.putText(panel, f"{key}: {val}", (10, y_offset + 30 + (i+1)*25),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.65, (255,255,255), 1)
+
+    compositor.update_right_panel((mode, calibrated), draw_status,
+                                  draw_debug if exercise_system.debug_mode else None)
+    return compositor.compose(processed_frame)
+
+def handle_key(exercise_system, key):
+    """
+    Apply a keyboard command to the exercise system.
+
+    Returns:
+        bool: False if the user asked to quit, True otherwise
+    """
+    with exercise_system.lock:
+        if key != 0xFF and exercise_system.presence is not None:
+            # Someone is at the keyboard
+            exercise_system.presence.wake(exercise_system.clock())
         if key == ord('q'):
-            break
+            return False
         elif key == ord('m'):
             exercise_system.change_exercise_mode()
         elif key == ord('c'):
@@ -255,9 +842,212 @@ def main():
                 exercise_system.calibrate_current_detector()
         elif key == ord('d'):
             exercise_system.debug_mode = not exercise_system.debug_mode
+    return True
+
+def present_frame(exercise_system, compositor, processed_frame):
+    """Compose and display the canvas and handle any pending key press; returns False to quit"""
+    timings = exercise_system.timings
+    start = time.perf_counter()
+    canvas = compose_canvas(exercise_system, compositor, processed_frame)
+    start = timings.lap("compose", start)
+    cv2.imshow('Exercise Recognition', canvas)
+    key = cv2.waitKey(1) & 0xFF
+    timings.lap("display", start)
+    timings.tick_frame()
+    if "first_frame" not in timings.milestones:
+        exercise_system.mark_startup("first_frame")
+    return handle_key(exercise_system, key)
+
+def run_sequential(cap, exercise_system, cam_width, cam_height):
+    """Capture, infer, draw and display each frame one after another"""
+    compositor = create_compositor(cam_width, cam_height)
+    reader = CameraReader(cap, cam_width, cam_height, timings=exercise_system.timings)
+    while cap.isOpened():
+        # Frames are mirrored straight into the canvas and overlays drawn there in place
+        frame = reader.read(out=compositor.camera_view)
+        if frame is None:
+            break
+
+        processed_frame = exercise_system.process_frame(frame.display, cam_width, cam_height,
+                                                        inference_frame=frame.raw)
+        if processed_frame is None:
+            frame.display.fill(0)  # fallback to blank
+            processed_frame = frame.display
+
+        if not present_frame(exercise_system, compositor, processed_frame):
+            break
+
+def run_pipelined(cap, exercise_system, cam_width, cam_height):
+    """
+    Run capture, pose inference and compositing/display as separate stages.
+
+    The capture thread always hands inference the newest frame, so latency from
+    camera to count stays at about one inference period even when a frame is slow.
+    """
+    compositor = create_compositor(cam_width, cam_height)
+    # Each in-flight frame holds its own buffer slot until the last stage releases it
+    slots = FrameSlotPool(FramePipeline.frames_in_flight(PIPELINE_QUEUE_SIZE))
+    reader = CameraReader(cap, cam_width, cam_height, timings=exercise_system.timings)
+
+    def present(frame, analysis):
+        # The capture thread owns frame; draw on a copy inside the canvas instead
+        np.copyto(compositor.camera_view, frame.display)
+        processed_frame = exercise_system.render_frame(compositor.camera_view, analysis, cam_width, cam_height)
+        return present_frame(exercise_system, compositor, processed_frame)
+
+    def capture():
+        while cap.isOpened() and not pipeline.stop_event.is_set():
+            slot = slots.acquire()
+            if slot is not None:
+                frame = reader.read(slot=slot)
+                if frame is None:
+                    slots.release(slot)
+                return frame
+            # Every slot is still held by inference or display: drop this camera frame
+            if not cap.grab():
+                return None
+        return None
+
+    def release(frame):
+        slots.release(frame.slot)
+
+    def analyze(frame):
+        return exercise_system.analyze_frame(frame.raw, mirrored=True)
+
+    pipeline = FramePipeline(
+        capture_fn=capture,
+        inference_fn=analyze,
+        present_fn=present,
+        queue_size=PIPELINE_QUEUE_SIZE,
+        release_fn=release)
+    pipeline.run()
+
+def main(pipelined=PIPELINED_MODE, record_path=None, metrics_path=None, record_telemetry=False,
+         user=CALIBRATION_DEFAULT_USER, send_address=None, station_id=0, audio=AUDIO_CUES,
+         history=SESSION_HISTORY):
+    # The first frame on screen waits on the camera, so it opens right away; the
+    # screen size (a Tk root) is queried on another thread meanwhile
+    screen = {}
+    screen_thread = threading.Thread(target=lambda: screen.update(size=get_screen_size()),
+                                     name="screen-size", daemon=True)
+    screen_thread.start()
+    if INFERENCE_NUM_THREADS:
+        cv2.setNumThreads(INFERENCE_NUM_THREADS)
+    cap = cv2.VideoCapture(0)
+
+    recorder = None
+    if record_path:
+        recorder = LandmarkRecorder(record_path)
+    elif send_address:
+        # Only landmarks leave the station; the server scores them centrally
+        host, port = send_address
+        recorder = LandmarkSender(host, port, station_id)
+        record_telemetry = False
+    # The pose models load in the background while the first frames are shown
+    exercise_system = ExerciseRecognitionSystem(recorder=recorder, metrics_path=metrics_path,
+                                                background_loading=True, started_at=PROCESS_START,
+                                                record_telemetry=record_telemetry, user=user)
+    services = {}
+    services_thread = threading.Thread(target=open_services,
+                                       args=(exercise_system, services, user, audio, history),
+                                       name="services", daemon=True)
+    services_thread.start()
+
+    screen_thread.join()
+    screen_width, screen_height = screen.get("size", (1280, 720))
+    panel_width = PANEL_WIDTH
+    cam_width = max(400, screen_width - 2 * panel_width)
+    cam_height = int(screen_height * 0.8)
+
+    try:
+        if pipelined:
+            run_pipelined(cap, exercise_system, cam_width, cam_height)
+        else:
+            run_sequential(cap, exercise_system, cam_width, cam_height)
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
+        services_thread.join()
+        exercise_system.close()
+        if exercise_system.calibration_store is not None:
+            exercise_system.calibration_store.close()
+        cues = services.get("cues")
+        if cues is not None:
+            cues.close()
+        store = services.get("store")
+        if store is not None:
+            # After exercise_system.close(): every published rep has reached the store
+            store.close()
+        if recorder is not None:
+            recorder.close()
+        if metrics_path:
+            exercise_system.timings.write_prometheus(metrics_path)
+
+def open_services(exercise_system, services, user, audio, history):
+    """
+    Load the calibration profiles and open the audio output and the session
+    history database. Runs on a background thread while the first frames are
+    shown, so none of this file and device I/O delays them.
+
+    Args:
+        exercise_system: ExerciseRecognitionSystem the services are attached to
+        services: Dict receiving the started "cues" (AudioCues) and "store" (SessionStore)
+        user: User the calibration profiles and session history belong to
+        audio: Start the audio cues
+        history: Store the session in the history database
+    """
+    if CALIBRATION_PROFILES:
+        calibration_store = CalibrationStore(CALIBRATION_STORE_PATH)
+        with exercise_system.lock:
+            exercise_system.calibration_store = calibration_store
+    if audio:
+        cues = AudioCues(AUDIO_SAMPLE_RATE, AUDIO_BLOCK_SIZE, AUDIO_VOLUME, AUDIO_CUE_FILES,
+                         timings=exercise_system.timings, stage_cues=AUDIO_STAGE_CUES)
+        if cues.start():
+            exercise_system.events.subscribe(cues.on_event, name="audio-cues")
+            services["cues"] = cues
+    if history:
+        store = SessionStore(SESSION_DB_PATH, SESSION_BATCH_SIZE, SESSION_FLUSH_INTERVAL, SESSION_MAX_PENDING)
+        store.start_session(user)
+        exercise_system.events.subscribe(store.on_event, kinds=(RepCompleted, CalibrationFinished),
+                                         name="session-store")
+        services["store"] = store
+
+def parse_address(value):
+    """HOST:PORT (or just HOST) -> (host, port)"""
+    host, _, port = value.rpartition(":")
+    if not host:
+        return value, NETWORK_PORT
+    try:
+        return host.strip("[]"), int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid address {value!r}, expected HOST:PORT")
 
-    cap.release()
-    cv2.destroyAllWindows()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Webcam exercise recognition and rep counting")
+    parser.add_argument("--pipelined", action="store_true", default=PIPELINED_MODE,
+                        help="run capture, inference and display as separate pipelined stages")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--record", metavar="PATH",
+                        help="append the session's landmark stream to a recording file")
+    output.add_argument("--send", metavar="HOST:PORT", type=parse_address,
+                        help="stream the session's landmarks to an aggregation server (network/server.py)")
+    parser.add_argument("--station-id", type=int, default=0,
+                        help="station ID sent with the landmarks (with --send)")
+    parser.add_argument("--record-telemetry", action="store_true",
+                        help="also record the active detector's per-frame telemetry (with --record)")
+    parser.add_argument("--audio", action="store_true", default=AUDIO_CUES,
+                        help="play audio cues for reps, stage changes and the calibration countdown")
+    parser.add_argument("--no-history", dest="history", action="store_false", default=SESSION_HISTORY,
+                        help="don't store the session's reps and calibrations in the history database")
+    parser.add_argument("--user", default=CALIBRATION_DEFAULT_USER,
+                        help="user whose saved calibration profiles are loaded and updated and whose history the session is stored in")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="periodically write per-stage latency metrics in Prometheus text format")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    main(pipelined=args.pipelined, record_path=args.record, metrics_path=args.metrics,
+         record_telemetry=args.record_telemetry, user=args.user, send_address=args.send,
+         station_id=args.station_id, audio=args.audio, history=args.history)
\ No newline at end of file
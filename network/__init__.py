@@ -0,0 +1,2 @@
+from network.protocol import PACKET_DTYPE, PacketEncoder, ProtocolError, decode_packet, decode_into
+from network.client import LandmarkSender
@@ -0,0 +1,69 @@
+"""
+Station side of the landmark protocol.
+"""
+import socket
+
+from network.protocol import PacketEncoder
+from utils.recording import (
+    KIND_FRAME, KIND_CALIBRATION, FLAG_CALIBRATING, FLAG_CALIBRATION_OK, FLAG_PREDICTED, FLAG_RESTORED
+)
+
+
+class LandmarkSender:
+    """
+    Send a station's landmark stream to an aggregation server over UDP.
+
+    Has the same record_frame()/record_calibration()/close() interface as
+    LandmarkRecorder, so it can be passed as the recorder of an
+    ExerciseRecognitionSystem. Sending never blocks the frame loop: datagrams
+    that cannot be sent right away are dropped, like frames lost on the network.
+    """
+
+    def __init__(self, host, port, station_id):
+        """
+        Args:
+            host: Aggregation server host name or address
+            port: Server UDP port
+            station_id: Unsigned 32-bit ID of this station
+        """
+        self.address = (host, port)
+        self.station_id = station_id
+        self.encoder = PacketEncoder(station_id)
+        family = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM)[0][0]
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._socket.connect(self.address)
+        self.dropped = 0
+        self.closed = False
+
+    def _send(self, kind, timestamp, exercise_mode, flags, landmarks):
+        try:
+            self._socket.send(self.encoder.encode(kind, timestamp, exercise_mode, flags, landmarks))
+        except OSError:
+            # Best effort: a full send buffer, the server not being up yet (ICMP port
+            # unreachable), an unreachable network or a downed interface only lose this packet
+            self.dropped += 1
+
+    def record_frame(self, timestamp, landmarks, exercise_mode, calibrating=False, predicted=False):
+        """Send one processed frame (arguments as in LandmarkRecorder.record_frame)"""
+        flags = (FLAG_CALIBRATING if calibrating else 0) | (FLAG_PREDICTED if predicted else 0)
+        self._send(KIND_FRAME, timestamp, exercise_mode, flags, landmarks)
+
+    def record_calibration(self, timestamp, landmarks, exercise_mode, success, restored_state=None):
+        """Send a calibration attempt (arguments as in LandmarkRecorder.record_calibration)"""
+        if restored_state is not None:
+            self._send(KIND_CALIBRATION, timestamp, exercise_mode, FLAG_CALIBRATION_OK | FLAG_RESTORED,
+                       restored_state)
+            return
+        self._send(KIND_CALIBRATION, timestamp, exercise_mode, FLAG_CALIBRATION_OK if success else 0, landmarks)
+
+    def close(self):
+        if not self.closed:
+            self._socket.close()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,114 @@
+"""
+Landmark streaming protocol.
+
+Stations run pose inference locally and send only landmarks: one UDP datagram
+per frame (or calibration event) holding the station ID, a sequence number,
+the timestamp, the exercise mode and, when a pose was found, the (33, 4)
+float32 landmark array. Kinds and flags are the same as in landmark
+recordings (utils.recording). A datagram is 24 bytes without a pose and 552
+bytes with one, well below a typical MTU, so no video ever leaves a station.
+
+Only depends on NumPy.
+"""
+import numpy as np
+
+from utils.landmarks import NUM_LANDMARKS, NUM_FIELDS
+from utils.recording import FLAG_HAS_POSE
+
+MAGIC = b"EXLN"
+PROTOCOL_VERSION = 1
+
+PACKET_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "u1"),
+    ("kind", "u1"),
+    ("exercise_mode", "u1"),
+    ("flags", "u1"),
+    ("station_id", "<u4"),
+    ("sequence", "<u4"),
+    ("timestamp", "<f8"),
+    ("landmarks", "<f4", (NUM_LANDMARKS, NUM_FIELDS)),
+])
+HEADER_SIZE = PACKET_DTYPE.fields["landmarks"][1]  # byte offset of the landmarks
+
+
+class ProtocolError(ValueError):
+    """A datagram that is not a valid landmark packet"""
+
+
+class PacketEncoder:
+    """Encodes packets for one station into a reused buffer"""
+
+    def __init__(self, station_id):
+        self._packet = np.zeros(1, dtype=PACKET_DTYPE)
+        self._record = self._packet[0]
+        self._record["magic"] = MAGIC
+        self._record["version"] = PROTOCOL_VERSION
+        self._record["station_id"] = station_id
+        self._buffer = memoryview(self._packet.view(np.uint8))
+        self.sequence = 0
+
+    def encode(self, kind, timestamp, exercise_mode, flags, landmarks):
+        """
+        Encode one packet
+
+        Args:
+            kind: KIND_FRAME or KIND_CALIBRATION
+            timestamp: Frame time in seconds
+            exercise_mode: Active exercise mode
+            flags: Record flags (FLAG_HAS_POSE is set from landmarks)
+            landmarks: (33, 4) landmark array, or None
+
+        Returns:
+            memoryview: Packet bytes, valid until the next encode() call
+        """
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        record = self._record
+        record["kind"] = kind
+        record["exercise_mode"] = exercise_mode
+        record["sequence"] = self.sequence
+        record["timestamp"] = timestamp
+        if landmarks is None:
+            record["flags"] = flags & ~FLAG_HAS_POSE
+            return self._buffer[:HEADER_SIZE]
+        record["flags"] = flags | FLAG_HAS_POSE
+        record["landmarks"] = landmarks
+        return self._buffer
+
+
+def decode_into(data, packets, index):
+    """
+    Decode a datagram into an element of a PACKET_DTYPE array
+
+    Args:
+        data: Bytes received from a station
+        packets: PACKET_DTYPE array receiving the packet
+        index: Element of packets to write
+
+    Returns:
+        np.void: The decoded record (a view of packets[index]); landmarks are NaN
+            when the packet has no pose
+
+    Raises:
+        ProtocolError: If the datagram is not a landmark packet
+    """
+    size = len(data)
+    if size != HEADER_SIZE and size != PACKET_DTYPE.itemsize:
+        raise ProtocolError(f"unexpected packet size {size}")
+    packets.view(np.uint8).reshape(len(packets), -1)[index, :size] = np.frombuffer(data, dtype=np.uint8)
+    record = packets[index]
+    if record["magic"] != MAGIC or record["version"] != PROTOCOL_VERSION:
+        raise ProtocolError("not a landmark packet or unsupported protocol version")
+    if size == HEADER_SIZE:
+        record["landmarks"] = np.nan
+    return record
+
+
+def decode_packet(data):
+    """
+    Decode a single datagram (see decode_into())
+
+    Returns:
+        np.void: PACKET_DTYPE record
+    """
+    return decode_into(data, np.zeros(1, dtype=PACKET_DTYPE), 0)
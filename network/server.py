@@ -0,0 +1,272 @@
+"""
+Central aggregation server for landmark streams.
+
+Receives landmark packets from any number of stations over UDP and runs each
+station's exercise detectors centrally. Packets are decoded straight into one
+shared array as they arrive; every tick the array is sorted by station and
+sequence number, stale and duplicate packets are dropped, and each station's
+new frames are scored with a single detect_batch() call per exercise run
+(see utils.recording.replay_records), the same way recordings are replayed.
+Live counts are served as JSON over HTTP.
+
+Example:
+    python -m network.server --port 9750 --http-port 9751
+    curl http://localhost:9751/stations
+"""
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+
+import numpy as np
+
+from exercise_detectors import (
+    StationaryRunningDetector,
+    PushupDetector,
+    SquatDetector,
+    JumpingJackDetector,
+)
+from network.protocol import PACKET_DTYPE, ProtocolError, decode_into
+from utils.recording import replay_records
+from config.settings import (
+    EXERCISE_MODES,
+    NETWORK_PORT,
+    NETWORK_HTTP_PORT,
+    NETWORK_TICK_INTERVAL,
+    NETWORK_STATION_TIMEOUT,
+    NETWORK_REORDER_WINDOW,
+)
+
+RECEIVE_BUFFER_BYTES = 4 * 1024 * 1024
+
+
+def create_detectors():
+    """One detector per exercise mode, as ExerciseRecognitionSystem creates them"""
+    return {
+        1: StationaryRunningDetector(),
+        2: PushupDetector(),
+        3: SquatDetector(),
+        4: JumpingJackDetector()
+    }
+
+
+class StationState:
+    """Detectors and stream position of one station"""
+
+    def __init__(self, station_id, detectors, now):
+        self.station_id = station_id
+        self.detectors = detectors
+        self.exercise_mode = None  # mode of the last scored packet
+        self.last_sequence = None
+        self.last_seen = now
+        self.packets = 0
+        self.late = 0  # duplicate or out-of-order packets that were dropped
+        self.reps = 0  # reps counted across all exercise runs
+        self.restarts = 0
+
+    def summary(self, now):
+        detector = self.detectors.get(self.exercise_mode)
+        return {
+            "exercise_mode": self.exercise_mode,
+            "exercise": EXERCISE_MODES.get(self.exercise_mode, "Unknown"),
+            "count": detector.counter if detector is not None else 0,
+            "stage": detector.stage if detector is not None else None,
+            "calibrated": bool(getattr(detector, "calibrated", False)),
+            "total_reps": self.reps,
+            "packets": self.packets,
+            "late": self.late,
+            "restarts": self.restarts,
+            "idle_seconds": round(now - self.last_seen, 3),
+        }
+
+
+class AggregationServer:
+    """
+    Scores the landmark streams of many stations.
+
+    receive() only decodes a datagram into the pending array; tick() does all
+    detector work. Both run on the asyncio loop thread (or are called directly
+    in tests and benchmarks).
+    """
+
+    def __init__(self, detector_factory=create_detectors, key_points_fn=None,
+                 station_timeout=NETWORK_STATION_TIMEOUT, reorder_window=NETWORK_REORDER_WINDOW,
+                 capacity=4096, clock=time.monotonic):
+        """
+        Args:
+            detector_factory: Callable returning a new exercise mode -> detector dict
+            key_points_fn: Optional callable(landmarks, exercise_mode) returning the key
+                points passed to calibrate() (default: PoseGuide().extract_key_points)
+            station_timeout: Seconds after which a silent station is dropped
+            reorder_window: A packet this many sequence numbers behind a station's
+                newest means the station restarted, and its state is reset
+            capacity: Initial number of pending packets (grows as needed)
+            clock: Time source for station timeouts
+        """
+        if key_points_fn is None:
+            from pose_guide import PoseGuide
+            key_points_fn = PoseGuide().extract_key_points
+        self.detector_factory = detector_factory
+        self.key_points_fn = key_points_fn
+        self.station_timeout = station_timeout
+        self.reorder_window = reorder_window
+        self.clock = clock
+        self.stations = {}
+        self.pending = np.zeros(capacity, dtype=PACKET_DTYPE)
+        self.pending_count = 0
+        self.invalid = 0
+
+    def receive(self, data):
+        """Queue one datagram for the next tick"""
+        if self.pending_count == len(self.pending):
+            grown = np.zeros(2 * len(self.pending), dtype=PACKET_DTYPE)
+            grown[:self.pending_count] = self.pending
+            self.pending = grown
+        try:
+            decode_into(data, self.pending, self.pending_count)
+        except ProtocolError:
+            self.invalid += 1
+            return
+        self.pending_count += 1
+
+    def tick(self):
+        """
+        Score all packets received since the last tick
+
+        Returns:
+            int: Number of packets scored
+        """
+        now = self.clock()
+        count = self.pending_count
+        self.pending_count = 0
+        if count:
+            pending = self.pending[:count]
+            order = np.lexsort((pending["sequence"], pending["station_id"]))
+            packets = pending[order]
+            station_ids = packets["station_id"]
+            starts = np.flatnonzero(np.diff(station_ids, prepend=station_ids[0] + 1) != 0)
+            for start, end in zip(starts, np.append(starts[1:], count)):
+                self._score_station(int(station_ids[start]), packets[start:end], now)
+
+        expired = [station_id for station_id, station in self.stations.items()
+                   if now - station.last_seen > self.station_timeout]
+        for station_id in expired:
+            del self.stations[station_id]
+        return count
+
+    def _score_station(self, station_id, packets, now):
+        station = self.stations.get(station_id)
+        if station is None:
+            station = self.stations[station_id] = StationState(station_id, self.detector_factory(), now)
+
+        sequences = packets["sequence"].astype(np.int64)
+        if station.last_sequence is not None and sequences[-1] + self.reorder_window < station.last_sequence:
+            # The station restarted and numbers its packets from 1 again
+            station.detectors = self.detector_factory()
+            station.exercise_mode = None
+            station.last_sequence = None
+            station.restarts += 1
+        keep = np.diff(sequences, prepend=-1) != 0
+        if station.last_sequence is not None:
+            keep &= sequences > station.last_sequence
+        station.packets += len(packets)
+        station.late += len(packets) - int(np.count_nonzero(keep))
+        station.last_seen = now
+        if not keep.any():
+            return
+        packets = packets[keep]
+
+        runs = replay_records(packets, station.detectors, self.key_points_fn, station.exercise_mode)
+        station.reps += sum(len(run["rep_times"]) for run in runs)
+        station.exercise_mode = int(packets["exercise_mode"][-1])
+        station.last_sequence = int(packets["sequence"][-1])
+
+    def snapshot(self):
+        """Live state of every station, keyed by station ID (JSON-serializable)"""
+        now = self.clock()
+        return {str(station_id): station.summary(now) for station_id, station in sorted(self.stations.items())}
+
+    async def _tick_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.tick()
+
+    async def _handle_http(self, reader, writer):
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.split()
+            path = parts[1].decode("ascii", "replace") if len(parts) > 1 else "/"
+            if path.rstrip("/") in ("", "/stations"):
+                status = "200 OK"
+                body = json.dumps({"stations": self.snapshot(), "invalid_packets": self.invalid}).encode()
+            else:
+                status = "404 Not Found"
+                body = b'{"error": "not found"}'
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="0.0.0.0", port=NETWORK_PORT, http_port=NETWORK_HTTP_PORT,
+                    tick_interval=NETWORK_TICK_INTERVAL):
+        """
+        Receive packets and score them every tick_interval seconds until cancelled
+
+        Args:
+            host: Address to listen on
+            port: UDP port for landmark packets
+            http_port: TCP port of the JSON endpoint (0 = no endpoint)
+            tick_interval: Seconds between detector batches
+        """
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(lambda: _PacketProtocol(self), local_addr=(host, port))
+        sock = transport.get_extra_info("socket")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_BYTES)
+        http_server = None
+        if http_port:
+            http_server = await asyncio.start_server(self._handle_http, host, http_port)
+        print(f"[SERVER] listening for landmarks on udp://{host}:{port}"
+              + (f", live counts on http://{host}:{http_port}/stations" if http_port else ""), file=sys.stderr)
+        try:
+            await self._tick_loop(tick_interval)
+        finally:
+            transport.close()
+            if http_server is not None:
+                http_server.close()
+                await http_server.wait_closed()
+
+
+class _PacketProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        self.server.receive(data)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score the landmark streams of many stations centrally")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=NETWORK_PORT, help="UDP port for landmark packets")
+    parser.add_argument("--http-port", type=int, default=NETWORK_HTTP_PORT,
+                        help="port of the live count JSON endpoint (0 = disabled)")
+    parser.add_argument("--tick", type=float, default=NETWORK_TICK_INTERVAL,
+                        help="seconds between detector batches")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = AggregationServer()
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.http_port, args.tick))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Simulated stations for testing the aggregation server on one machine.
+
+Each simulated station replays a landmark stream in real time through its own
+LandmarkSender: either a synthetic sequence from benchmarks.synthetic (one
+calibration packet on the first frame, then the motion) or a landmark
+recording made with main.py --record. With --check, the server's live counts
+are compared against the counts of scoring the same streams locally.
+
+Example:
+    python -m network.server &
+    python -m network.simulate --stations 200 --check
+    python -m network.simulate --recording session.exlm --stations 20
+"""
+import argparse
+import heapq
+import json
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks.synthetic import generate_motion
+from network.client import LandmarkSender
+from network.server import create_detectors
+from utils.recording import (
+    LandmarkRecording, RECORD_DTYPE, KIND_FRAME, KIND_CALIBRATION,
+    FLAG_HAS_POSE, FLAG_CALIBRATING, FLAG_CALIBRATION_OK, FLAG_PREDICTED, FLAG_RESTORED, replay_records,
+    store_landmarks, record_landmarks, record_values, values_to_landmarks
+)
+from config.settings import NETWORK_PORT, NETWORK_HTTP_PORT
+
+
+def synthetic_stream(exercise_mode, frames, fps=30.0, seed=0):
+    """
+    Records of a synthetic session: a calibration on the first frame, then every frame
+
+    Returns:
+        np.ndarray: RECORD_DTYPE records
+    """
+    sequence, _ = generate_motion(exercise_mode, frames=frames, fps=fps, seed=seed)
+    records = np.zeros(frames + 1, dtype=RECORD_DTYPE)
+    records["timestamp"][1:] = np.arange(frames) / fps
+    records["exercise_mode"] = exercise_mode
+    records["kind"][0] = KIND_CALIBRATION
+    records["flags"][0] = FLAG_HAS_POSE | FLAG_CALIBRATION_OK
+    store_landmarks(records[:1], sequence[:1])
+    records["kind"][1:] = KIND_FRAME
+    records["flags"][1:] = np.where(np.isnan(sequence[:, 0, 0]), 0, FLAG_HAS_POSE)
+    store_landmarks(records[1:], sequence)
+    return records
+
+def recorded_stream(path):
+    """Frame and calibration records of a landmark recording (telemetry records are not sent)"""
+    records = LandmarkRecording(path).records
+    return np.array(records[np.isin(records["kind"], (KIND_FRAME, KIND_CALIBRATION))])
+
+def send_record(sender, record, timestamp):
+    flags = int(record["flags"])
+    landmarks = record_landmarks(record) if flags & FLAG_HAS_POSE else None
+    mode = int(record["exercise_mode"])
+    if record["kind"] == KIND_CALIBRATION:
+        restored_state = values_to_landmarks(record_values(record)) if flags & FLAG_RESTORED else None
+        sender.record_calibration(timestamp, landmarks, mode, bool(flags & FLAG_CALIBRATION_OK), restored_state)
+    else:
+        sender.record_frame(timestamp, landmarks, mode, bool(flags & FLAG_CALIBRATING), bool(flags & FLAG_PREDICTED))
+
+def run_stations(streams, host="127.0.0.1", port=NETWORK_PORT, first_station_id=1, speed=1.0):
+    """
+    Send every stream from its own station, all paced by their record timestamps
+
+    Args:
+        streams: List of RECORD_DTYPE arrays, one per station
+        host: Server host
+        port: Server UDP port
+        first_station_id: Station ID of streams[0]; the others follow consecutively
+        speed: Playback speed relative to real time
+
+    Returns:
+        int: Datagrams the senders had to drop
+    """
+    senders = [LandmarkSender(host, port, first_station_id + index) for index in range(len(streams))]
+    start = time.time()
+    # (send time, station index, record index), merged across all stations
+    due = [(start, index, 0) for index, stream in enumerate(streams) if len(stream)]
+    heapq.heapify(due)
+    try:
+        while due:
+            send_at, index, position = heapq.heappop(due)
+            delay = send_at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            stream = streams[index]
+            send_record(senders[index], stream[position], send_at)
+            if position + 1 < len(stream):
+                offset = (stream["timestamp"][position + 1] - stream["timestamp"][0]) / speed
+                heapq.heappush(due, (start + offset, index, position + 1))
+    finally:
+        dropped = sum(sender.dropped for sender in senders)
+        for sender in senders:
+            sender.close()
+    return dropped
+
+def local_count(stream, key_points_fn):
+    """Counter of the stream's last exercise mode when scored without the network"""
+    detectors = create_detectors()
+    replay_records(stream, detectors, key_points_fn)
+    detector = detectors.get(int(stream["exercise_mode"][-1])) if len(stream) else None
+    return detector.counter if detector is not None else 0
+
+def fetch_counts(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.load(response)["stations"]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate exercise stations sending landmark streams")
+    parser.add_argument("--host", default="127.0.0.1", help="aggregation server host")
+    parser.add_argument("--port", type=int, default=NETWORK_PORT, help="server UDP port")
+    parser.add_argument("--stations", type=int, default=100, help="number of simulated stations")
+    parser.add_argument("--first-id", type=int, default=1, help="station ID of the first station")
+    parser.add_argument("--recording", metavar="PATH",
+                        help="replay this landmark recording on every station instead of synthetic motion")
+    parser.add_argument("--mode", type=int, choices=(1, 2, 3, 4),
+                        help="synthetic exercise mode (default: stations cycle through all four)")
+    parser.add_argument("--frames", type=int, default=600, help="synthetic frames per station")
+    parser.add_argument("--fps", type=float, default=30.0, help="synthetic frame rate")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed relative to real time")
+    parser.add_argument("--check", action="store_true",
+                        help="compare the server's counts with scoring the streams locally")
+    parser.add_argument("--http-port", type=int, default=NETWORK_HTTP_PORT,
+                        help="server HTTP port (for --check)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    streams = []
+    for index in range(args.stations):
+        if args.recording:
+            streams.append(recorded_stream(args.recording))
+        else:
+            mode = args.mode or 1 + index % 4
+            streams.append(synthetic_stream(mode, args.frames, args.fps, seed=args.first_id + index))
+
+    print(f"[SIM] {args.stations} stations -> udp://{args.host}:{args.port}", file=sys.stderr)
+    started = time.perf_counter()
+    dropped = run_stations(streams, args.host, args.port, args.first_id, args.speed)
+    sent = sum(len(stream) for stream in streams)
+    elapsed = time.perf_counter() - started
+    print(f"[SIM] sent {sent} packets in {elapsed:.1f}s ({sent / elapsed:.0f}/s), {dropped} dropped",
+          file=sys.stderr)
+
+    if not args.check:
+        return 0
+    from pose_guide import PoseGuide
+    key_points_fn = PoseGuide().extract_key_points
+    expected = {str(args.first_id + index): local_count(stream, key_points_fn)
+                for index, stream in enumerate(streams)}
+    time.sleep(0.5)  # let the server score its last tick
+    counts = fetch_counts(f"http://{args.host}:{args.http_port}/stations")
+    mismatched = {station_id: (counts.get(station_id, {}).get("count"), reps)
+                  for station_id, reps in expected.items()
+                  if counts.get(station_id, {}).get("count") != reps}
+    print(f"[SIM] {len(expected) - len(mismatched)}/{len(expected)} stations match local scoring",
+          file=sys.stderr)
+    for station_id, (count, reps) in sorted(mismatched.items(), key=lambda item: int(item[0]))[:10]:
+        print(f"[SIM]   station {station_id}: server {count}, local {reps}", file=sys.stderr)
+    return 1 if mismatched else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,11 @@
 import cv2
 import numpy as np
-import mediapipe as mp
+
+from utils.compositor import darken_region, put_text
+from utils.landmarks import (
+    NOSE, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, RIGHT_ELBOW, LEFT_WRIST, RIGHT_WRIST,
+    LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE, X, Z
+)
 
 class PoseGuide:
     """
@@ -58,10 +63,6 @@ class PoseGuide:
             }
         }
         
-        # MediaPipe pose setup
-        self.mp_pose = mp.solutions.pose
-        self.mp_drawing = mp.solutions.drawing_utils
-        
     def get_pose_instructions(self, exercise_mode):
         """
         Get the calibration pose instructions for a specific exercise mode.
@@ -79,7 +80,7 @@ class PoseGuide:
         Extract key body points relevant to the specific exercise mode.
         
         Args:
-            landmarks: MediaPipe pose landmarks
+            landmarks: (33, 4) landmark array (see utils.landmarks), or None
             exercise_mode: The exercise mode number
             
         Returns:
@@ -92,72 +93,56 @@ class PoseGuide:
         
         # Common measurements for all exercises
         # Store all key points as ratios to image dimensions for portability
-        
-        # Extract nose position (useful for most exercises)
-        nose = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
-        key_points['nose'] = (nose.x, nose.y, nose.z)
-        
-        # Extract shoulders
-        left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        key_points['left_shoulder'] = (left_shoulder.x, left_shoulder.y, left_shoulder.z)
-        key_points['right_shoulder'] = (right_shoulder.x, right_shoulder.y, right_shoulder.z)
-        
-        # Extract hips
-        left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
-        key_points['left_hip'] = (left_hip.x, left_hip.y, left_hip.z)
-        key_points['right_hip'] = (right_hip.x, right_hip.y, right_hip.z)
-        
-        # Extract knees
-        left_knee = landmarks[self.mp_pose.PoseLandmark.LEFT_KNEE.value]
-        right_knee = landmarks[self.mp_pose.PoseLandmark.RIGHT_KNEE.value]
-        key_points['left_knee'] = (left_knee.x, left_knee.y, left_knee.z)
-        key_points['right_knee'] = (right_knee.x, right_knee.y, right_knee.z)
-        
-        # Extract ankles
-        left_ankle = landmarks[self.mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_ankle = landmarks[self.mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-        key_points['left_ankle'] = (left_ankle.x, left_ankle.y, left_ankle.z)
-        key_points['right_ankle'] = (right_ankle.x, right_ankle.y, right_ankle.z)
-        
-        # Extract wrists
-        left_wrist = landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST.value]
-        right_wrist = landmarks[self.mp_pose.PoseLandmark.RIGHT_WRIST.value]
-        key_points['left_wrist'] = (left_wrist.x, left_wrist.y, left_wrist.z)
-        key_points['right_wrist'] = (right_wrist.x, right_wrist.y, right_wrist.z)
-        
-        # Exercise-specific measurements
+        # (one conversion to Python floats instead of per-point attribute lookups)
+        points = landmarks[:, X:Z + 1].tolist()
+        nose = points[NOSE]
+        left_shoulder, right_shoulder = points[LEFT_SHOULDER], points[RIGHT_SHOULDER]
+        left_hip, right_hip = points[LEFT_HIP], points[RIGHT_HIP]
+        left_knee, right_knee = points[LEFT_KNEE], points[RIGHT_KNEE]
+        left_ankle, right_ankle = points[LEFT_ANKLE], points[RIGHT_ANKLE]
+        left_wrist, right_wrist = points[LEFT_WRIST], points[RIGHT_WRIST]
+
+        key_points['nose'] = tuple(nose)
+        key_points['left_shoulder'] = tuple(left_shoulder)
+        key_points['right_shoulder'] = tuple(right_shoulder)
+        key_points['left_hip'] = tuple(left_hip)
+        key_points['right_hip'] = tuple(right_hip)
+        key_points['left_knee'] = tuple(left_knee)
+        key_points['right_knee'] = tuple(right_knee)
+        key_points['left_ankle'] = tuple(left_ankle)
+        key_points['right_ankle'] = tuple(right_ankle)
+        key_points['left_wrist'] = tuple(left_wrist)
+        key_points['right_wrist'] = tuple(right_wrist)
+        
+        # Exercise-specific measurements (index 1 = y, 0 = x)
         if exercise_mode == 1:  # Stationary Running - focus on knees and hips
             # Calculate standing knee height (average of left and right)
-            knee_y_avg = (left_knee.y + right_knee.y) / 2
-            hip_y_avg = (left_hip.y + right_hip.y) / 2
+            knee_y_avg = (left_knee[1] + right_knee[1]) / 2
+            hip_y_avg = (left_hip[1] + right_hip[1]) / 2
             key_points['knee_hip_distance'] = hip_y_avg - knee_y_avg
-            key_points['standing_height'] = 1.0 - ((left_ankle.y + right_ankle.y) / 2)
+            key_points['standing_height'] = 1.0 - ((left_ankle[1] + right_ankle[1]) / 2)
             
         elif exercise_mode == 2:  # Pushup - focus on shoulders, elbows, wrists
             # Calculate arm extension and body alignment
-            left_elbow = landmarks[self.mp_pose.PoseLandmark.LEFT_ELBOW.value]
-            right_elbow = landmarks[self.mp_pose.PoseLandmark.RIGHT_ELBOW.value]
-            key_points['left_elbow'] = (left_elbow.x, left_elbow.y, left_elbow.z)
-            key_points['right_elbow'] = (right_elbow.x, right_elbow.y, right_elbow.z)
+            key_points['left_elbow'] = tuple(points[LEFT_ELBOW])
+            key_points['right_elbow'] = tuple(points[RIGHT_ELBOW])
             
             # Calculate body alignment (straight line from shoulders to ankles)
-            shoulder_y_avg = (left_shoulder.y + right_shoulder.y) / 2
-            hip_y_avg = (left_hip.y + right_hip.y) / 2
+            shoulder_y_avg = (left_shoulder[1] + right_shoulder[1]) / 2
+            hip_y_avg = (left_hip[1] + right_hip[1]) / 2
             key_points['body_alignment'] = abs(shoulder_y_avg - hip_y_avg)
             
         elif exercise_mode == 3:  # Squat - focus on hip and knee angles
             # Calculate standing height and hip position
-            hip_y_avg = (left_hip.y + right_hip.y) / 2
-            ankle_y_avg = (left_ankle.y + right_ankle.y) / 2
+            hip_y_avg = (left_hip[1] + right_hip[1]) / 2
+            ankle_y_avg = (left_ankle[1] + right_ankle[1]) / 2
             key_points['hip_height'] = 1.0 - hip_y_avg
             key_points['hip_ankle_distance'] = hip_y_avg - ankle_y_avg
             
         elif exercise_mode == 4:  # Jumping Jack - focus on shoulder and hip width
             # Calculate shoulder width and hip width
-            shoulder_width = abs(right_shoulder.x - left_shoulder.x)
-            hip_width = abs(right_hip.x - left_hip.x)
+            shoulder_width = abs(right_shoulder[0] - left_shoulder[0])
+            hip_width = abs(right_hip[0] - left_hip[0])
             key_points['shoulder_width'] = shoulder_width
             key_points['hip_width'] = hip_width
             
@@ -179,32 +164,30 @@ class PoseGuide:
         if not instructions:
             return frame
             
-        # Create a semi-transparent overlay for better text readability
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (frame.shape[1], frame.shape[0]), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
+        # Darken the frame in place for better text readability
+        darken_region(frame, 0, frame.shape[0], alpha=0.5)
         
         # Draw title
-        cv2.putText(frame, "-" + instructions["title"], 
-                   (int(frame.shape[1] * 0.1), int(frame.shape[0] * 0.15)), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2)
+        put_text(frame, "-" + instructions["title"], 
+                 (int(frame.shape[1] * 0.1), int(frame.shape[0] * 0.15)), 
+                 cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2)
         
         # Draw instructions
         for i, instruction in enumerate(instructions["instructions"]):
             y_pos = int(frame.shape[0] * (0.25 + i * 0.08))
-            cv2.putText(frame, instruction, 
-                       (int(frame.shape[1] * 0.1), y_pos), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1)
+            put_text(frame, instruction, 
+                     (int(frame.shape[1] * 0.1), y_pos), 
+                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1)
         
         # Draw countdown timer
-        cv2.putText(frame, f"Time remaining: {time_remaining}s", 
-                   (int(frame.shape[1] * 0.1), int(frame.shape[0] * 0.8)), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 2)
+        put_text(frame, f"Time remaining: {time_remaining}s", 
+                 (int(frame.shape[1] * 0.1), int(frame.shape[0] * 0.8)), 
+                 cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 2)
         
         # Draw "Get Ready!" message
         if time_remaining <= 3:
-            cv2.putText(frame, "Get Ready!", 
-                       (int(frame.shape[1] * 0.3), int(frame.shape[0] * 0.9)), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 165, 255), 2)
+            put_text(frame, "Get Ready!", 
+                     (int(frame.shape[1] * 0.3), int(frame.shape[0] * 0.9)), 
+                     cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 165, 255), 2)
         
         return frame
\ No newline at end of file
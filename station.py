@@ -0,0 +1,242 @@
+"""
+Multi-camera station mode.
+
+Drives several exercise spots from one machine. Each camera gets a capture
+process that reads frames straight into a shared-memory frame ring and an
+inference worker process with its own pose model, detectors and calibration
+state, which draws its spot's overlays into a second ring. The main process
+only tiles the newest rendered frame of every spot into one window and routes
+key presses to the selected spot, so no frame is ever pickled and each spot's
+inference runs outside the others' GIL.
+
+Video files can stand in for cameras.
+
+Example:
+    python station.py 0 1 2
+    python station.py squats.mp4 pushups.mp4 --loop
+"""
+import argparse
+import multiprocessing
+import queue
+import sys
+import time
+
+import cv2
+
+from utils.compositor import TileCompositor, put_text
+from utils.frame_buffers import FrameBufferPool
+from utils.shared_frames import SharedFrameRing
+from config.settings import (
+    STATION_CAPTURE_WIDTH,
+    STATION_CAPTURE_HEIGHT,
+    STATION_TILE_WIDTH,
+    STATION_TILE_HEIGHT,
+    STATION_RING_SLOTS,
+)
+
+def parse_source(source):
+    """Camera index for numeric sources, otherwise a video file path"""
+    return int(source) if source.isdigit() else source
+
+def capture_camera(source, frame_spec, stop, loop=False):
+    """
+    Capture process: read a camera (or video file) into a shared frame ring.
+
+    Frames are read directly into the ring's next slot when the source already
+    delivers the ring's frame size, otherwise resized into it. Video files are
+    paced to their frame rate.
+
+    Args:
+        source: Camera index or video file path
+        frame_spec: SharedFrameRing.spec of the ring to write
+        stop: multiprocessing.Event ending the process
+        loop: Restart video files from the beginning when they end
+    """
+    frames = SharedFrameRing.attach(*frame_spec)
+    height, width = frames.shape[:2]
+    cap = cv2.VideoCapture(source)
+    is_file = isinstance(source, str)
+    if not is_file:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    fps = cap.get(cv2.CAP_PROP_FPS) if is_file else 0
+    frame_interval = 1.0 / fps if fps > 0 else 0.0
+    scratch = None
+    slot_view = image = None
+    next_frame = time.perf_counter()
+    try:
+        while not stop.is_set():
+            index, slot_view = frames.next_slot()
+            ret, image = cap.read(slot_view if scratch is None else scratch)
+            if not ret:
+                if is_file and loop and cap.get(cv2.CAP_PROP_POS_FRAMES) > 0:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                break
+            if image is not slot_view:
+                # The source delivers another size; keep reading into the same scratch buffer
+                scratch = image
+                cv2.resize(image, (width, height), dst=slot_view)
+            frames.publish(index)
+            if frame_interval:
+                next_frame += frame_interval
+                time.sleep(max(0.0, next_frame - time.perf_counter()))
+    finally:
+        cap.release()
+        slot_view = image = None
+        frames.close()
+
+def station_worker(spot, frame_spec, tile_spec, commands, stop, poll_interval=0.001):
+    """
+    Inference worker process for one spot.
+
+    Runs the full ExerciseRecognitionSystem (pose model, detectors,
+    calibration) on the newest captured frame and draws the mirrored,
+    annotated tile into the tile ring.
+
+    Args:
+        spot: Spot index (for messages)
+        frame_spec: SharedFrameRing.spec of the spot's capture ring
+        tile_spec: SharedFrameRing.spec of the ring receiving rendered tiles
+        commands: multiprocessing.Queue of key codes for this spot
+        stop: multiprocessing.Event ending the process
+        poll_interval: Seconds to wait before checking again for a new frame
+    """
+    # Imported here so the display process never loads MediaPipe
+    from main import ExerciseRecognitionSystem, handle_key
+
+    cv2.setNumThreads(1)
+    frames = SharedFrameRing.attach(*frame_spec)
+    tiles = SharedFrameRing.attach(*tile_spec)
+    tile_height, tile_width = tiles.shape[:2]
+    scratch = FrameBufferPool()
+    system = ExerciseRecognitionSystem(background_loading=True)
+    print(f"[STATION] spot {spot + 1}: worker started", file=sys.stderr)
+    last_seq = 0
+    frame = tile = None
+    try:
+        while not stop.is_set():
+            while True:
+                try:
+                    handle_key(system, commands.get_nowait())
+                except queue.Empty:
+                    break
+
+            seq, frame = frames.latest()
+            if seq == last_seq:
+                time.sleep(poll_interval)
+                continue
+            last_seq = seq
+            # Work on a private copy: the capture process may rewrite the slot while we read it
+            private = scratch.get("frame", frame.shape)
+            private[:] = frame
+            if not frames.valid(seq):
+                continue
+            frame = private
+            index, tile = tiles.next_slot()
+            mirrored = cv2.flip(frame, 1, dst=scratch.get("mirrored", frame.shape))
+            cv2.resize(mirrored, (tile_width, tile_height), dst=tile)
+            system.process_frame(tile, tile_width, tile_height, inference_frame=frame)
+            tiles.publish(index)
+    finally:
+        system.close()
+        frame = tile = mirrored = None
+        frames.close()
+        tiles.close()
+
+def run_station(sources, loop=False, columns=None):
+    """
+    Run one capture process and one inference worker per source and show the tiled results.
+
+    Keys 1-9 select the spot that receives the other key presses ('m', 'c', 'd');
+    'q' quits.
+
+    Args:
+        sources: Camera indices and/or video file paths
+        loop: Restart video files when they end (otherwise the station stops
+            once every source has ended)
+        columns: Tiles per row (default: as square a grid as possible)
+    """
+    # Workers are spawned, not forked, so no OpenCV/MediaPipe thread state is inherited
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    capture_shape = (STATION_CAPTURE_HEIGHT, STATION_CAPTURE_WIDTH, 3)
+    tile_shape = (STATION_TILE_HEIGHT, STATION_TILE_WIDTH, 3)
+    rings = []
+    tile_rings = []
+    commands = []
+    captures = []
+    workers = []
+    tile = None
+    try:
+        for spot, source in enumerate(sources):
+            frames = SharedFrameRing.create(capture_shape, STATION_RING_SLOTS)
+            tiles = SharedFrameRing.create(tile_shape, STATION_RING_SLOTS)
+            rings.extend((frames, tiles))
+            tile_rings.append(tiles)
+            commands.append(context.Queue())
+            captures.append(context.Process(target=capture_camera, args=(source, frames.spec, stop, loop),
+                                            name=f"capture-{spot + 1}", daemon=True))
+            workers.append(context.Process(target=station_worker,
+                                           args=(spot, frames.spec, tiles.spec, commands[spot], stop),
+                                           name=f"spot-{spot + 1}", daemon=True))
+        for process in captures + workers:
+            process.start()
+
+        compositor = TileCompositor(len(sources), STATION_TILE_WIDTH, STATION_TILE_HEIGHT, columns)
+        seen = [0] * len(sources)
+        selected = 0
+        while True:
+            for spot, tiles in enumerate(tile_rings):
+                seq, tile = tiles.latest()
+                if seq != seen[spot]:
+                    compositor.update(spot, tile)
+                    # A tile rewritten while it was copied is copied again on the next pass
+                    seen[spot] = seq if tiles.valid(seq) else 0
+                    put_text(compositor.tiles[spot], f"Spot {spot + 1}", (10, STATION_TILE_HEIGHT - 15),
+                             cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            tile = None
+            compositor.highlight(selected)
+            cv2.imshow("Exercise Station", compositor.canvas)
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
+                break
+            if ord('1') <= key < ord('1') + min(len(sources), 9):
+                selected = key - ord('1')
+            elif key != 0xFF:
+                commands[selected].put(key)
+
+            dead = [process.name for process in workers if not process.is_alive()]
+            if dead:
+                print(f"[STATION] worker {', '.join(dead)} exited; stopping", file=sys.stderr)
+                break
+            if not any(process.is_alive() for process in captures):
+                print("[STATION] all sources ended", file=sys.stderr)
+                break
+    finally:
+        stop.set()
+        for process in captures + workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        cv2.destroyAllWindows()
+        tile = None
+        for ring in rings:
+            ring.close()
+            ring.unlink()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run several exercise spots (cameras) from one machine")
+    parser.add_argument("sources", nargs="+",
+                        help="camera indices (e.g. 0 1) and/or video files used as fake cameras")
+    parser.add_argument("--loop", action="store_true", help="restart video files when they end")
+    parser.add_argument("--columns", type=int, help="tiles per row in the station window")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_station([parse_source(source) for source in args.sources], loop=args.loop, columns=args.columns)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
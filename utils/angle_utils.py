@@ -1,3 +1,5 @@
+import math
+
 import numpy as np
 
 def calculate_angle(a, b, c):
@@ -8,18 +10,48 @@ def calculate_angle(a, b, c):
         b: Mid point [x, y] (vertex)
         c: End point [x, y]
     Returns:
-        Angle in degrees
+        Angle in degrees (float)
     """
-    a = np.array(a)  # First point
-    b = np.array(b)  # Mid point
-    c = np.array(c)  # End point
-    
+    # Scalar fast path: plain floats and math.atan2, no temporary arrays
+    ax, ay = float(a[0]), float(a[1])
+    bx, by = float(b[0]), float(b[1])
+    cx, cy = float(c[0]), float(c[1])
+
     # Calculate vectors
-    radians = np.arctan2(c[1] - b[1], c[0] - b[0]) - np.arctan2(a[1] - b[1], a[0] - b[0])
-    angle = np.abs(radians * 180.0 / np.pi)
-    
+    radians = math.atan2(cy - by, cx - bx) - math.atan2(ay - by, ax - bx)
+    angle = abs(radians * 180.0 / math.pi)
+
     # Check if angle is greater than 180 degrees
     if angle > 180.0:
         angle = 360 - angle
-        
-    return angle
\ No newline at end of file
+
+    return angle
+
+def calculate_angles(points, triplets=None):
+    """
+    Calculate many angles in one vectorized call
+    Args:
+        points: Either an (N, 3, 2) array of (first, mid, end) point triplets,
+            or, when triplets is given, a landmark array of shape (33, >=2)
+            or a landmark sequence of shape (T, 33, >=2)
+        triplets: Optional list of (first, mid, end) landmark index triplets,
+            e.g. [(LEFT_HIP, LEFT_KNEE, LEFT_ANKLE)]
+    Returns:
+        np.ndarray: Angles in degrees, shape (N,) for point triplets, (K,) for
+            a single landmark frame or (T, K) for a landmark sequence, where
+            K = len(triplets). Frames with NaN landmarks give NaN angles.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if triplets is not None:
+        # (..., 33, F) -> (..., K, 3, 2)
+        points = points[..., np.asarray(triplets, dtype=np.intp), :2]
+
+    a = points[..., 0, :]
+    b = points[..., 1, :]
+    c = points[..., 2, :]
+
+    # Same formula as calculate_angle (results agree to within float rounding)
+    radians = (np.arctan2(c[..., 1] - b[..., 1], c[..., 0] - b[..., 0]) -
+               np.arctan2(a[..., 1] - b[..., 1], a[..., 0] - b[..., 0]))
+    angles = np.abs(radians * 180.0 / np.pi)
+    return np.where(angles > 180.0, 360.0 - angles, angles)
@@ -0,0 +1,195 @@
+"""
+Audio cues for reps, stage changes and the calibration countdown.
+
+One sounddevice output stream stays open for the whole session. Every cue is
+synthesized (or loaded from a WAV file) once, up front, into a float32 PCM
+buffer; play() only appends the cue name to a deque, and the stream's
+callback mixes the started cues into each output block. Nothing on the frame
+or event threads opens a device, allocates audio or waits for playback.
+
+The time from play() to the cue's first sample reaching the DAC is recorded
+as the "audio_cue" stage of a StageTimer, so it shows up in the debug panel
+and the Prometheus metrics next to the frame-loop stages.
+
+sounddevice (and its PortAudio library) is optional: without it start()
+returns False and the cues are silently skipped.
+"""
+import sys
+import time
+import wave
+from collections import deque
+
+import numpy as np
+
+from utils.events import RepCompleted, StageChanged, CalibrationFinished, CalibrationCountdown
+
+# Cue name -> (frequency in Hz, seconds) tone segments played back to back
+CUE_TONES = {
+    "rep": ((880.0, 0.09),),
+    "stage": ((660.0, 0.03),),
+    "countdown": ((440.0, 0.08),),
+    "go": ((880.0, 0.25),),
+    "calibration_ok": ((660.0, 0.09), (990.0, 0.14)),
+    "calibration_failed": ((440.0, 0.12), (300.0, 0.2)),
+}
+
+def synthesize_tone(segments, sample_rate, volume=0.3, fade_seconds=0.005):
+    """
+    Render tone segments into a mono float32 buffer
+
+    Args:
+        segments: Sequence of (frequency, seconds) pairs
+        sample_rate: Output sample rate in Hz
+        volume: Peak amplitude (0-1)
+        fade_seconds: Fade in/out of each segment, to avoid clicks
+
+    Returns:
+        np.ndarray: (N,) float32 samples
+    """
+    parts = []
+    for frequency, seconds in segments:
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        tone = np.sin(2 * np.pi * frequency * t)
+        fade = min(int(fade_seconds * sample_rate), len(t) // 2)
+        if fade:
+            ramp = np.linspace(0.0, 1.0, fade)
+            tone[:fade] *= ramp
+            tone[-fade:] *= ramp[::-1]
+        parts.append(tone)
+    return (volume * np.concatenate(parts)).astype(np.float32)
+
+def load_wav(path, sample_rate, volume=1.0):
+    """
+    Load a 16-bit PCM WAV file (e.g. a recorded voice prompt) as a mono float32 buffer
+
+    Args:
+        path: WAV file
+        sample_rate: Output sample rate in Hz; the file is linearly resampled to it
+        volume: Gain applied to the samples
+
+    Returns:
+        np.ndarray: (N,) float32 samples
+    """
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    samples = samples.reshape(-1, channels).mean(axis=1) / 32768.0
+    if rate != sample_rate and len(samples):
+        positions = np.arange(int(len(samples) * sample_rate / rate)) * rate / sample_rate
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return (volume * samples).astype(np.float32)
+
+
+class AudioCues:
+    """
+    Mixes precomputed cue buffers into one long-lived callback output stream.
+
+    Usage:
+        cues = AudioCues(timings=system.timings)
+        if cues.start():
+            system.events.subscribe(cues.on_event)
+        ...
+        cues.close()
+    """
+
+    def __init__(self, sample_rate=44100, block_size=256, volume=0.3, cue_files=None, timings=None,
+                 stage_cues=True, max_voices=8):
+        """
+        Args:
+            sample_rate: Output sample rate in Hz
+            block_size: Frames per callback; smaller blocks start cues sooner
+            volume: Peak amplitude of the synthesized tones (0-1)
+            cue_files: Optional dict cue name -> WAV file replacing the tone
+                (e.g. a spoken rep number prompt)
+            timings: Optional StageTimer receiving each cue's play()-to-DAC latency
+            stage_cues: Also play a short tick on every stage change
+            max_voices: Most cues mixed at once; further cues wait in the queue
+        """
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.timings = timings
+        self.stage_cues = stage_cues
+        self.max_voices = max_voices
+        self.buffers = {name: synthesize_tone(segments, sample_rate, volume)
+                        for name, segments in CUE_TONES.items()}
+        for name, path in (cue_files or {}).items():
+            self.buffers[name] = load_wav(path, sample_rate)
+        self._pending = deque()  # (buffer, requested_at); appended by play(), consumed by the callback
+        self._voices = []  # [buffer, position] of the cues being mixed (callback thread only)
+        self.stream = None
+        self.underflows = 0
+
+    def start(self):
+        """
+        Open and start the output stream
+
+        Returns:
+            bool: False if no audio output is available (cues are then ignored)
+        """
+        try:
+            import sounddevice as sd
+        except (ImportError, OSError) as exc:
+            # OSError: the sounddevice module is installed but PortAudio is not
+            print(f"[AUDIO] audio cues disabled ({exc})", file=sys.stderr)
+            return False
+        try:
+            self.stream = sd.OutputStream(samplerate=self.sample_rate, blocksize=self.block_size, channels=1,
+                                          dtype="float32", latency="low", callback=self._callback)
+            self.stream.start()
+        except Exception as exc:
+            print(f"[AUDIO] could not open the audio output ({exc}); audio cues disabled", file=sys.stderr)
+            self.stream = None
+            return False
+        return True
+
+    def play(self, name):
+        """Queue a cue; returns immediately (deque.append is thread-safe)"""
+        if self.stream is not None:
+            self._pending.append((self.buffers[name], time.perf_counter()))
+
+    def _callback(self, outdata, frames, time_info, status):
+        if status.output_underflow:
+            self.underflows += 1
+        out = outdata[:, 0]
+        out.fill(0.0)
+        while self._pending and len(self._voices) < self.max_voices:
+            buffer, requested_at = self._pending.popleft()
+            self._voices.append([buffer, 0])
+            if self.timings is not None:
+                # Waiting for this callback + the stream's output latency
+                dac_delay = max(0.0, time_info.outputBufferDacTime - time_info.currentTime)
+                self.timings.record("audio_cue", time.perf_counter() - requested_at + dac_delay)
+        finished = False
+        for voice in self._voices:
+            buffer, position = voice
+            chunk = buffer[position:position + frames]
+            out[:len(chunk)] += chunk
+            voice[1] = position + len(chunk)
+            finished |= voice[1] >= len(buffer)
+        if finished:
+            self._voices = [voice for voice in self._voices if voice[1] < len(voice[0])]
+        np.clip(out, -1.0, 1.0, out=out)
+
+    def on_event(self, event):
+        """EventBus consumer mapping detector events to cues"""
+        if isinstance(event, RepCompleted):
+            self.play("rep")
+        elif isinstance(event, StageChanged):
+            if self.stage_cues and event.previous is not None:
+                self.play("stage")
+        elif isinstance(event, CalibrationCountdown):
+            if event.seconds_left == 0:
+                self.play("go")
+            elif event.seconds_left <= 3:
+                self.play("countdown")
+        elif isinstance(event, CalibrationFinished):
+            self.play("calibration_ok" if event.success else "calibration_failed")
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
@@ -0,0 +1,139 @@
+"""
+Persisted calibration profiles.
+
+Successful calibrations are saved per user and exercise mode in a small JSON
+file: the detector's calibrated parameters (BaseExerciseDetector.calibration_state())
+and the key points PoseGuide.extract_key_points() measured. When the same user
+returns to an exercise, the profile is restored after a one-frame plausibility
+check instead of running the full calibration countdown again.
+"""
+import json
+import os
+import threading
+import time
+
+from utils.landmarks import LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, X, Y
+
+def torso_length(left_shoulder, right_shoulder, left_hip, right_hip):
+    """Normalized 2D distance between the shoulder and hip midpoints"""
+    dx = (left_shoulder[0] + right_shoulder[0] - left_hip[0] - right_hip[0]) / 2
+    dy = (left_shoulder[1] + right_shoulder[1] - left_hip[1] - right_hip[1]) / 2
+    return (dx * dx + dy * dy) ** 0.5
+
+def is_plausible(landmarks, key_points, tolerance=0.35):
+    """
+    Quick check that a saved calibration fits the person in front of the camera.
+
+    The torso length in normalized image coordinates depends on body size and
+    distance to the camera, so a saved profile only applies while it stays
+    close to the length measured at calibration time.
+
+    Args:
+        landmarks: (33, 4) landmark array of the current frame
+        key_points: Key points saved with the profile
+        tolerance: Maximum relative difference of the torso length
+
+    Returns:
+        bool: True if the profile can be reused
+    """
+    try:
+        saved = torso_length(key_points["left_shoulder"], key_points["right_shoulder"],
+                             key_points["left_hip"], key_points["right_hip"])
+    except KeyError:
+        return False
+    if saved <= 0:
+        return False
+    points = landmarks[:, X:Y + 1].tolist()
+    current = torso_length(points[LEFT_SHOULDER], points[RIGHT_SHOULDER], points[LEFT_HIP], points[RIGHT_HIP])
+    return abs(current - saved) <= tolerance * saved
+
+
+class CalibrationStore:
+    """
+    Calibration profiles keyed by user and exercise mode, kept in memory and
+    rewritten atomically to a JSON file after every save.
+
+    save() only updates the in-memory profiles; a background writer thread
+    rewrites the file, so a slow disk never stalls the frame loop when a
+    calibration finishes. Saves arriving while a write is running are
+    coalesced into the next write. close() writes any pending save.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: JSON file holding the profiles; created on the first save
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._profiles = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._profiles = json.load(f)
+        self._version = 0  # bumped by every save
+        self._written_version = 0
+        self._dirty = threading.Event()
+        self._closing = False
+        self._writer = threading.Thread(target=self._write_loop, name="calibration-store", daemon=True)
+        self._writer.start()
+
+    def load(self, user, exercise_mode):
+        """
+        Saved profile of a user for an exercise mode
+
+        Returns:
+            dict: {"state": ..., "key_points": ..., "saved_at": ...}, or None
+        """
+        with self._lock:
+            return self._profiles.get(user, {}).get(str(exercise_mode))
+
+    def save(self, user, exercise_mode, state, key_points):
+        """
+        Save (or replace) a user's calibration for an exercise mode
+
+        Args:
+            user: User identifier
+            exercise_mode: Exercise mode number
+            state: Detector parameters from calibration_state()
+            key_points: Key points from PoseGuide.extract_key_points()
+        """
+        profile = {
+            "state": state,
+            "key_points": {name: list(value) if isinstance(value, tuple) else value
+                           for name, value in key_points.items()},
+            "saved_at": time.time(),
+        }
+        with self._lock:
+            self._profiles.setdefault(user, {})[str(exercise_mode)] = profile
+            self._version += 1
+        self._dirty.set()
+
+    def _write_loop(self):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            # Read before the profiles, so every save made before close() is in this write
+            closing = self._closing
+            with self._lock:
+                version = self._version
+                data = json.dumps(self._profiles) if version != self._written_version else None
+            if data is not None:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+                self._written_version = version
+            if closing:
+                break
+
+    def close(self):
+        """Write any pending save and stop the writer thread"""
+        if self._writer.is_alive():
+            self._closing = True
+            self._dirty.set()
+            self._writer.join()
+
+    def users(self):
+        """Users with at least one saved profile"""
+        with self._lock:
+            return list(self._profiles)
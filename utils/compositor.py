@@ -0,0 +1,184 @@
+"""
+Frame compositing helpers.
+
+Overlays are drawn into preallocated buffers and only the pixels they cover
+are touched: regions are darkened in place instead of blending a full-frame
+copy, text is rasterized once and re-stamped from a cache, and static panels
+are rendered once and reused.
+"""
+import cv2
+import numpy as np
+
+def darken_region(frame, top, bottom, left=0, right=None, alpha=0.6):
+    """
+    Darken a rectangular region of the frame in place.
+
+    Equivalent to blending a filled black rectangle with opacity alpha over the
+    frame, but only the affected rows/columns are touched and no copy of the
+    frame is made.
+    """
+    roi = frame[max(0, top):bottom, max(0, left):right]
+    if roi.size:
+        cv2.addWeighted(roi, 1.0 - alpha, roi, 0, 0, dst=roi)
+    return frame
+
+
+class TextSpriteCache:
+    """
+    Cache of pre-rendered text sprites.
+
+    put_text() draws what cv2.putText would, but each distinct string/colour is
+    rasterized only once; later calls are a masked copy (or, for anti-aliased
+    text, an alpha blend) limited to the text's bounding box.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._sprites = {}
+
+    def _render(self, text, font_face, font_scale, color, thickness, line_type):
+        (width, height), baseline = cv2.getTextSize(text, font_face, font_scale, thickness)
+        pad = thickness + 2
+        mask = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+        origin = (pad, pad + height)
+        cv2.putText(mask, text, origin, font_face, font_scale, 255, thickness, line_type)
+
+        # Crop to the pixels actually drawn
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if not len(rows):
+            return None
+        mask = mask[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+        origin = (int(origin[0] - cols[0]), int(origin[1] - rows[0]))
+        patch = np.empty(mask.shape + (3,), dtype=np.uint8)
+        patch[:] = color
+        if line_type == cv2.LINE_AA:
+            # out = frame * (1 - alpha) + color * alpha
+            alpha = cv2.merge([mask.astype(np.float32) / 255.0] * 3)
+            return origin, mask, 1.0 - alpha, patch * alpha
+        return origin, mask, None, patch
+
+    def put_text(self, frame, text, org, font_face, font_scale, color, thickness=1, line_type=cv2.LINE_8):
+        key = (text, font_face, font_scale, tuple(color), thickness, line_type)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            if key in self._sprites:
+                return frame  # nothing to draw (e.g. empty text)
+            if len(self._sprites) >= self.max_entries:
+                self._sprites.clear()
+            sprite = self._sprites[key] = self._render(text, font_face, font_scale, color, thickness, line_type)
+            if sprite is None:
+                return frame
+        (origin_x, origin_y), mask, inverse_alpha, patch = sprite
+
+        # Place the sprite so its text origin lands on org, clipped to the frame
+        top = org[1] - origin_y
+        left = org[0] - origin_x
+        frame_height, frame_width = frame.shape[:2]
+        y0, x0 = max(top, 0), max(left, 0)
+        y1 = min(top + mask.shape[0], frame_height)
+        x1 = min(left + mask.shape[1], frame_width)
+        if y0 >= y1 or x0 >= x1:
+            return frame
+        roi = frame[y0:y1, x0:x1]
+        sprite_rows = slice(y0 - top, y1 - top)
+        sprite_cols = slice(x0 - left, x1 - left)
+        if inverse_alpha is None:
+            cv2.copyTo(patch[sprite_rows, sprite_cols], mask[sprite_rows, sprite_cols], roi)
+        else:
+            blended = cv2.multiply(roi, inverse_alpha[sprite_rows, sprite_cols], dtype=cv2.CV_32F)
+            cv2.add(blended, patch[sprite_rows, sprite_cols], dst=blended)
+            roi[:] = blended
+        return frame
+
+
+# Shared cache used by put_text(); the overlay text set is small and fixed
+text_sprites = TextSpriteCache()
+
+def put_text(frame, text, org, font_face, font_scale, color, thickness=1, line_type=cv2.LINE_8):
+    """Drop-in replacement for cv2.putText backed by the shared sprite cache"""
+    return text_sprites.put_text(frame, text, org, font_face, font_scale, color, thickness, line_type)
+
+
+class FrameCompositor:
+    """
+    Preallocated output canvas: left panel | camera area | right panel.
+
+    The camera area is a view into the canvas, so frames captured or drawn
+    directly into camera_view need no copy. The left panel is rendered once;
+    the right panel's static part is re-rendered only when its key changes
+    and is restored from a cached copy before per-frame content is drawn.
+    """
+
+    def __init__(self, cam_width, cam_height, panel_width):
+        self.cam_width = cam_width
+        self.cam_height = cam_height
+        self.panel_width = panel_width
+        self.canvas = np.zeros((cam_height, cam_width + 2 * panel_width, 3), dtype=np.uint8)
+        self.left_panel = self.canvas[:, :panel_width]
+        self.camera_view = self.canvas[:, panel_width:panel_width + cam_width]
+        self.right_panel = self.canvas[:, panel_width + cam_width:]
+        self._right_key = None
+        self._right_static = None
+        self._right_dirty = False
+
+    def render_left_panel(self, render):
+        """Render the (static) left panel once with render(panel)"""
+        self.left_panel[:] = 0
+        render(self.left_panel)
+
+    def update_right_panel(self, key, render_static, render_dynamic=None):
+        """
+        Refresh the right panel.
+
+        Args:
+            key: Hashable state the static part depends on; it is re-rendered only when this changes
+            render_static: Callable drawing the static part onto the panel
+            render_dynamic: Optional callable drawing per-frame content onto the panel
+        """
+        if key != self._right_key:
+            self.right_panel[:] = 0
+            render_static(self.right_panel)
+            self._right_static = self.right_panel.copy()
+            self._right_key = key
+        elif self._right_dirty:
+            np.copyto(self.right_panel, self._right_static)
+        self._right_dirty = render_dynamic is not None
+        if render_dynamic is not None:
+            render_dynamic(self.right_panel)
+
+    def compose(self, frame):
+        """Place a camera frame in the canvas (no copy if it already lives in camera_view)"""
+        if frame is not self.camera_view and not np.shares_memory(frame, self.camera_view):
+            np.copyto(self.camera_view, frame)
+        return self.canvas
+
+
+class TileCompositor:
+    """
+    Preallocated canvas showing several camera tiles in a grid (station mode).
+
+    tiles[i] is a view into the canvas; update() copies a tile's newest frame
+    there, so tiles that have no new frame simply keep their last image.
+    """
+
+    def __init__(self, count, tile_width, tile_height, columns=None):
+        self.count = count
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.columns = columns or int(np.ceil(np.sqrt(count)))
+        rows = int(np.ceil(count / self.columns))
+        self.canvas = np.zeros((rows * tile_height, self.columns * tile_width, 3), dtype=np.uint8)
+        self.tiles = []
+        for index in range(count):
+            row, column = divmod(index, self.columns)
+            self.tiles.append(self.canvas[row * tile_height:(row + 1) * tile_height,
+                                          column * tile_width:(column + 1) * tile_width])
+
+    def update(self, index, frame):
+        """Copy a tile-sized frame into tile index"""
+        np.copyto(self.tiles[index], frame)
+
+    def highlight(self, index, color=(0, 255, 255), thickness=3):
+        """Draw a border around tile index (e.g. the one receiving key presses)"""
+        cv2.rectangle(self.tiles[index], (0, 0), (self.tile_width - 1, self.tile_height - 1), color, thickness)
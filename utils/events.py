@@ -0,0 +1,148 @@
+"""
+Detector event bus.
+
+Detectors publish typed events (a rep was completed, the stage changed, a
+calibration finished) instead of acting on them inside detect(). Every
+consumer - a logger, audio cues, a network sender, analytics - gets its own
+bounded queue and worker thread, so publishing only appends the event to
+each queue and never waits for a consumer. When a consumer falls behind its
+queue fills up and further events for it are dropped (and counted) rather
+than stalling the frame loop.
+"""
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import namedtuple
+
+# Event types; detector is the detector's display name, person the track ID in
+# multi-person mode (None otherwise)
+# RepCompleted: duration in seconds and the detector's KEY_ANGLE range over the
+# rep (None when not tracked)
+RepCompleted = namedtuple("RepCompleted", ["timestamp", "detector", "person", "count", "duration",
+                                           "angle_min", "angle_max"])
+StageChanged = namedtuple("StageChanged", ["timestamp", "detector", "person", "previous", "stage"])
+CalibrationFinished = namedtuple("CalibrationFinished",
+                                 ["timestamp", "detector", "person", "success", "values"])
+# Published by the system once per second of the calibration countdown; 0 when capture starts
+CalibrationCountdown = namedtuple("CalibrationCountdown", ["timestamp", "detector", "person", "seconds_left"])
+
+
+class EventConsumer:
+    """A subscriber's queue and worker thread (returned by EventBus.subscribe())"""
+
+    def __init__(self, callback, kinds, max_pending, name):
+        self.callback = callback
+        self.kinds = tuple(kinds) if kinds else None
+        self.queue = queue.Queue(max_pending)
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def offer(self, event):
+        """Queue an event for the consumer without blocking"""
+        if self.kinds is not None and not isinstance(event, self.kinds):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                break
+            try:
+                self.callback(event)
+            except Exception:
+                print(f"[EVENTS] consumer {self.thread.name} failed:", file=sys.stderr)
+                traceback.print_exc()
+
+    def stop(self, timeout=None):
+        """Let the consumer finish its queued events, then end its thread"""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+
+class EventBus:
+    """
+    Fan-out of detector events to consumers running on their own threads.
+
+    Usage:
+        bus = EventBus()
+        bus.subscribe(play_rep_sound, kinds=(RepCompleted,))
+        detector.attach_events(bus)
+    """
+
+    def __init__(self, clock=time.time, max_pending=256):
+        """
+        Args:
+            clock: Time source for event timestamps (the system's clock)
+            max_pending: Default number of events a consumer may fall behind before
+                events for it are dropped
+        """
+        self.clock = clock
+        self.max_pending = max_pending
+        # Replaced, never mutated, so publish() can iterate it without a lock
+        self._consumers = ()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, kinds=None, max_pending=None, name=None):
+        """
+        Start delivering events to callback(event) on a new consumer thread
+
+        Args:
+            callback: Called with each event, in publish order
+            kinds: Optional event types to deliver (default: all)
+            max_pending: Queue length of this consumer (default: the bus's max_pending)
+            name: Thread name, for error messages
+
+        Returns:
+            EventConsumer: Pass to unsubscribe(); its dropped attribute counts lost events
+        """
+        consumer = EventConsumer(callback, kinds, max_pending or self.max_pending,
+                                 name or f"events-{getattr(callback, '__name__', 'consumer')}")
+        with self._lock:
+            self._consumers = self._consumers + (consumer,)
+        return consumer
+
+    def unsubscribe(self, consumer, timeout=None):
+        with self._lock:
+            self._consumers = tuple(c for c in self._consumers if c is not consumer)
+        consumer.stop(timeout)
+
+    def publish(self, event):
+        """Hand an event to every consumer; never blocks"""
+        for consumer in self._consumers:
+            consumer.offer(event)
+
+    def close(self, timeout=1.0):
+        """Deliver the queued events and stop every consumer"""
+        with self._lock:
+            consumers, self._consumers = self._consumers, ()
+        for consumer in consumers:
+            consumer.stop(timeout)
+
+
+def format_event(event):
+    """One-line description of an event, for logs"""
+    who = event.detector if event.person is None else f"{event.detector} #{event.person}"
+    if isinstance(event, RepCompleted):
+        duration = f" in {event.duration:.2f}s" if event.duration is not None else ""
+        return f"{who}: rep {event.count}{duration}"
+    if isinstance(event, StageChanged):
+        return f"{who}: {event.previous} -> {event.stage}"
+    if isinstance(event, CalibrationFinished):
+        outcome = "ok" if event.success else "failed"
+        values = ", ".join(f"{name}: {value:.4f}" for name, value in event.values.items())
+        return f"{who}: calibration {outcome}" + (f" ({values})" if values else "")
+    if isinstance(event, CalibrationCountdown):
+        return f"{who}: calibration in {event.seconds_left}s"
+    return repr(event)
+
+def log_event(event):
+    """Consumer printing events to stderr"""
+    tag = "[CALIBRATION]" if isinstance(event, CalibrationFinished) else "[EVENT]"
+    print(f"{tag} {format_event(event)}", file=sys.stderr)
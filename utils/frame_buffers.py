@@ -0,0 +1,90 @@
+from collections import deque
+
+import numpy as np
+
+class FrameBufferPool:
+    """
+    Fixed set of preallocated image buffers, reused frame after frame.
+
+    Every per-frame image (camera read, resize, flip, colour conversion) is
+    written through OpenCV's dst= argument into one of these buffers, so the
+    steady-state frame loop allocates no image memory.
+
+    Each named buffer has `slots` copies handed out round-robin. With one slot
+    the same buffer is returned every time. Round-robin slots are only safe
+    while every reader keeps up; frames handed between threads (pipelined
+    mode) take their buffers from a FrameSlotPool instead.
+    """
+
+    def __init__(self, slots=1):
+        self.slots = max(1, slots)
+        self._buffers = {}
+        self._next = {}
+
+    def allocate(self, name, shape, dtype=np.uint8):
+        """(Re)allocate all slots of a named buffer up front, sized for shape"""
+        size = int(np.prod(shape))
+        self._buffers[name] = [np.zeros(size, dtype=dtype) for _ in range(self.slots)]
+        self._next[name] = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Next slot of a named buffer.
+
+        Args:
+            name: Buffer name
+            shape: Required array shape; may vary between calls (e.g. crops of
+                different sizes), the memory is only reallocated when it must grow
+            dtype: Required dtype
+
+        Returns:
+            np.ndarray: C-contiguous array of the given shape; its previous contents are undefined
+        """
+        size = int(np.prod(shape))
+        buffers = self._buffers.get(name)
+        if buffers is None or buffers[0].size < size or buffers[0].dtype != dtype:
+            self.allocate(name, shape, dtype)
+            buffers = self._buffers[name]
+        index = self._next[name]
+        self._next[name] = (index + 1) % self.slots
+        return buffers[index][:size].reshape(shape)
+
+    def nbytes(self):
+        """Total memory held by the pool in bytes"""
+        return sum(buffer.nbytes for buffers in self._buffers.values() for buffer in buffers)
+
+
+class FrameSlotPool:
+    """
+    Per-frame buffer sets handed between threads through an explicit free list.
+
+    Each slot is a single-slot FrameBufferPool holding all buffers of one
+    frame. The producer acquire()s a free slot for every frame and the last
+    stage that uses the frame release()s it, so a slot is never reused while
+    a later stage still reads it; when every slot is held acquire() returns
+    None and the producer drops the frame instead.
+    """
+
+    def __init__(self, slots):
+        self.slots = [FrameBufferPool() for _ in range(max(1, slots))]
+        self._free = deque(self.slots)  # append/popleft are thread-safe
+
+    def acquire(self):
+        """
+        Take a free slot
+
+        Returns:
+            FrameBufferPool: The slot's buffers, or None if every slot is in use
+        """
+        try:
+            return self._free.popleft()
+        except IndexError:
+            return None
+
+    def release(self, slot):
+        """Return a slot once no stage reads its buffers anymore"""
+        self._free.append(slot)
+
+    def nbytes(self):
+        """Total memory held by the slots in bytes"""
+        return sum(slot.nbytes() for slot in self.slots)
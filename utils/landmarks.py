@@ -0,0 +1,107 @@
+import numpy as np
+
+# Pose landmark frames are float32 arrays of shape (NUM_LANDMARKS, 4) holding
+# normalized x, y, z and visibility per landmark. Row indices follow
+# MediaPipe's PoseLandmark numbering, so this module needs no MediaPipe import.
+NUM_LANDMARKS = 33
+NUM_FIELDS = 4
+LANDMARK_DTYPE = np.float32
+
+# Column indices
+X = 0
+Y = 1
+Z = 2
+VISIBILITY = 3
+
+# Row indices (same values as mediapipe.solutions.pose.PoseLandmark)
+NOSE = 0
+LEFT_EYE_INNER = 1
+LEFT_EYE = 2
+LEFT_EYE_OUTER = 3
+RIGHT_EYE_INNER = 4
+RIGHT_EYE = 5
+RIGHT_EYE_OUTER = 6
+LEFT_EAR = 7
+RIGHT_EAR = 8
+MOUTH_LEFT = 9
+MOUTH_RIGHT = 10
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_ELBOW = 13
+RIGHT_ELBOW = 14
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_PINKY = 17
+RIGHT_PINKY = 18
+LEFT_INDEX = 19
+RIGHT_INDEX = 20
+LEFT_THUMB = 21
+RIGHT_THUMB = 22
+LEFT_HIP = 23
+RIGHT_HIP = 24
+LEFT_KNEE = 25
+RIGHT_KNEE = 26
+LEFT_ANKLE = 27
+RIGHT_ANKLE = 28
+LEFT_HEEL = 29
+RIGHT_HEEL = 30
+LEFT_FOOT_INDEX = 31
+RIGHT_FOOT_INDEX = 32
+
+# Skeleton edges (same as mediapipe.solutions.pose.POSE_CONNECTIONS)
+POSE_CONNECTIONS = (
+    (0, 1), (0, 4), (1, 2), (2, 3), (3, 7), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (11, 23), (12, 14), (12, 24), (13, 15), (14, 16),
+    (15, 17), (15, 19), (15, 21), (16, 18), (16, 20), (16, 22), (17, 19),
+    (18, 20), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+    (27, 31), (28, 30), (28, 32), (29, 31), (30, 32),
+)
+
+# Row permutation that swaps every left landmark with its right counterpart
+MIRROR_INDICES = (
+    NOSE, RIGHT_EYE_INNER, RIGHT_EYE, RIGHT_EYE_OUTER, LEFT_EYE_INNER, LEFT_EYE,
+    LEFT_EYE_OUTER, RIGHT_EAR, LEFT_EAR, MOUTH_RIGHT, MOUTH_LEFT, RIGHT_SHOULDER,
+    LEFT_SHOULDER, RIGHT_ELBOW, LEFT_ELBOW, RIGHT_WRIST, LEFT_WRIST, RIGHT_PINKY,
+    LEFT_PINKY, RIGHT_INDEX, LEFT_INDEX, RIGHT_THUMB, LEFT_THUMB, RIGHT_HIP,
+    LEFT_HIP, RIGHT_KNEE, LEFT_KNEE, RIGHT_ANKLE, LEFT_ANKLE, RIGHT_HEEL,
+    LEFT_HEEL, RIGHT_FOOT_INDEX, LEFT_FOOT_INDEX,
+)
+
+
+def landmarks_to_array(pose_landmarks):
+    """
+    Convert MediaPipe pose landmarks into a landmark frame array.
+
+    Args:
+        pose_landmarks: MediaPipe NormalizedLandmarkList, or a sequence of landmarks
+
+    Returns:
+        np.ndarray: float32 array of shape (33, 4) with x, y, z, visibility,
+            or None if no landmarks were given
+    """
+    if pose_landmarks is None:
+        return None
+    landmarks = getattr(pose_landmarks, "landmark", pose_landmarks)
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks],
+                    dtype=LANDMARK_DTYPE)
+
+
+def mirror_landmarks(landmarks):
+    """
+    Landmarks as they would be detected on the horizontally flipped image.
+
+    x is mirrored and left/right landmarks swap rows, since a pose model labels
+    sides by how the body appears in the image. This lets pose inference run
+    on the unflipped camera frame while the display shows a mirror view.
+
+    Args:
+        landmarks: (33, 4) landmark array (or (T, 33, 4) sequence), or None
+
+    Returns:
+        np.ndarray: New mirrored array, or None
+    """
+    if landmarks is None:
+        return None
+    mirrored = landmarks[..., MIRROR_INDICES, :]
+    mirrored[..., X] = 1.0 - mirrored[..., X]
+    return mirrored
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+class RollingHistogram:
+    """
+    Fixed-size window of the most recent samples of one measurement.
+
+    Adding a sample is a single array store; percentiles are only computed
+    when asked for (e.g. when the debug panel is drawn).
+    """
+
+    def __init__(self, size=300):
+        self._samples = np.zeros(size, dtype=np.float64)
+        self._index = 0
+        self.count = 0  # total samples ever added
+        self.total = 0.0  # sum of all samples ever added
+
+    def add(self, value):
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % len(self._samples)
+        self.count += 1
+        self.total += value
+
+    def values(self):
+        """Samples currently in the window"""
+        return self._samples[:min(self.count, len(self._samples))]
+
+    def percentiles(self, quantiles=(50, 95, 99)):
+        """Percentiles of the window, or None if no samples were added"""
+        values = self.values()
+        if not len(values):
+            return None
+        return np.percentile(values, quantiles)
+
+
+class StageTimer:
+    """
+    Per-stage latency and frame-rate collector for the main loop.
+
+    Usage:
+        start = time.perf_counter()
+        ...capture...
+        start = timer.lap("capture", start)
+        ...resize...
+        start = timer.lap("resize_flip", start)
+    """
+
+    # Stages in pipeline order; unknown stage names are appended as they appear
+    STAGES = ("capture", "resize_flip", "color_convert", "pose_process", "detect",
+              "overlay", "compose", "display")
+
+    def __init__(self, window=300, summary_interval=0.5, metrics_path=None, metrics_interval=10.0,
+                 started_at=None):
+        """
+        Args:
+            window: Number of recent samples kept per stage
+            summary_interval: Seconds a computed summary is reused before recomputing
+            metrics_path: Optional file that tick_frame() periodically rewrites in
+                Prometheus text format
+            metrics_interval: Seconds between metrics file writes
+            started_at: time.perf_counter() value startup milestones are measured
+                from; mark() does nothing without it
+        """
+        self.window = window
+        self.summary_interval = summary_interval
+        self.metrics_path = metrics_path
+        self.metrics_interval = metrics_interval
+        self._last_dump = time.perf_counter()
+        self.stages = {stage: RollingHistogram(window) for stage in self.STAGES}
+        self.frame_times = RollingHistogram(window)
+        self._last_frame = None
+        self._summary = None
+        self._summary_time = 0.0
+        self._lock = threading.Lock()
+        self.started_at = started_at
+        self.milestones = {}
+
+    def mark(self, milestone):
+        """
+        Record a one-off startup milestone (e.g. "first_frame").
+
+        Returns:
+            float: Seconds since started_at, or None if the milestone was already
+                recorded or no started_at was given
+        """
+        if self.started_at is None:
+            return None
+        with self._lock:
+            if milestone in self.milestones:
+                return None
+            elapsed = time.perf_counter() - self.started_at
+            self.milestones[milestone] = elapsed
+        return elapsed
+
+    def record(self, stage, seconds):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, RollingHistogram(self.window))
+        histogram.add(seconds)
+
+    def lap(self, stage, start):
+        """Record the time since start for stage and return the current time"""
+        now = time.perf_counter()
+        self.record(stage, now - start)
+        return now
+
+    def tick_frame(self):
+        """Mark a displayed frame; frame-to-frame intervals give the FPS"""
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self.frame_times.add(now - self._last_frame)
+        self._last_frame = now
+        if self.metrics_path and now - self._last_dump >= self.metrics_interval:
+            self._last_dump = now
+            self.write_prometheus(self.metrics_path)
+
+    def fps(self):
+        values = self.frame_times.values()
+        if not len(values):
+            return 0.0
+        mean = values.mean()
+        return 1.0 / mean if mean > 0 else 0.0
+
+    def summary(self):
+        """
+        Latency percentiles per stage, recomputed at most every summary_interval.
+
+        Returns:
+            tuple: (fps, {stage: (p50, p95, p99) in milliseconds}) for stages with samples
+        """
+        now = time.perf_counter()
+        if self._summary is None or now - self._summary_time >= self.summary_interval:
+            stages = {}
+            for stage, histogram in list(self.stages.items()):
+                percentiles = histogram.percentiles()
+                if percentiles is not None:
+                    stages[stage] = tuple(percentiles * 1000.0)
+            self._summary = (self.fps(), stages)
+            self._summary_time = now
+        return self._summary
+
+    def prometheus_text(self, prefix="exercise"):
+        """Render all stages as Prometheus summaries (text exposition format)"""
+        lines = [
+            f"# HELP {prefix}_stage_latency_seconds Latency of each main loop stage.",
+            f"# TYPE {prefix}_stage_latency_seconds summary",
+        ]
+        for stage, histogram in list(self.stages.items()):
+            percentiles = histogram.percentiles()
+            if percentiles is None:
+                continue
+            for quantile, value in zip(("0.5", "0.95", "0.99"), percentiles):
+                lines.append(f'{prefix}_stage_latency_seconds{{stage="{stage}",quantile="{quantile}"}} {value:.6f}')
+            lines.append(f'{prefix}_stage_latency_seconds_sum{{stage="{stage}"}} {histogram.total:.6f}')
+            lines.append(f'{prefix}_stage_latency_seconds_count{{stage="{stage}"}} {histogram.count}')
+        lines.append(f"# HELP {prefix}_display_fps Displayed frames per second over the recent window.")
+        lines.append(f"# TYPE {prefix}_display_fps gauge")
+        lines.append(f"{prefix}_display_fps {self.fps():.3f}")
+        if self.milestones:
+            lines.append(f"# HELP {prefix}_startup_seconds Seconds from launch to each startup milestone.")
+            lines.append(f"# TYPE {prefix}_startup_seconds gauge")
+            for milestone, seconds in list(self.milestones.items()):
+                lines.append(f'{prefix}_startup_seconds{{milestone="{milestone}"}} {seconds:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix="exercise"):
+        """Atomically write the Prometheus text dump to path (e.g. for node_exporter's textfile collector)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text(prefix))
+        os.replace(tmp_path, path)
@@ -0,0 +1,147 @@
+import queue
+import threading
+
+
+class LatestQueue(queue.Queue):
+    """
+    Bounded queue that keeps only the newest items.
+
+    Producers call put_latest(), which discards the oldest queued item instead
+    of blocking when the queue is full, so consumers always see fresh data.
+    """
+
+    def __init__(self, maxsize=1, on_drop=None):
+        """
+        Args:
+            maxsize: Capacity of the queue
+            on_drop: Optional callback receiving each discarded item (e.g. to release its buffers)
+        """
+        super().__init__(maxsize=max(1, maxsize))
+        self.on_drop = on_drop
+        self.dropped = 0
+
+    def put_latest(self, item):
+        """Put an item, dropping the oldest queued item if the queue is full"""
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    stale = self.get_nowait()
+                except queue.Empty:
+                    continue
+                self.dropped += 1
+                if self.on_drop is not None:
+                    self.on_drop(stale)
+
+
+class FramePipeline:
+    """
+    Three-stage capture / inference / present pipeline.
+
+    Capture and inference run on daemon threads, the present stage runs on the
+    calling thread (OpenCV windows must be driven from the main thread). Stages
+    are connected by LatestQueue instances so a slow stage never makes the
+    previous one wait and stale frames are dropped instead of piling up.
+    """
+
+    def __init__(self, capture_fn, inference_fn, present_fn, queue_size=1, poll_timeout=0.05,
+                 release_fn=None):
+        """
+        Args:
+            capture_fn: Callable returning the next frame, or None when the source is exhausted
+            inference_fn: Callable taking a frame and returning its analysis
+            present_fn: Callable taking (frame, analysis); returns False to stop the pipeline
+            queue_size: Capacity of each inter-stage queue
+            poll_timeout: Seconds a stage waits on its input queue before re-checking for stop
+            release_fn: Optional callable taking a frame once no stage uses it anymore:
+                after present_fn returns, or when a queue drops it as stale
+        """
+        self.capture_fn = capture_fn
+        self.inference_fn = inference_fn
+        self.present_fn = present_fn
+        self.release_fn = release_fn
+        self.poll_timeout = poll_timeout
+
+        self.capture_queue = LatestQueue(queue_size, on_drop=release_fn)
+        self.result_queue = LatestQueue(queue_size, on_drop=release_fn and (lambda item: release_fn(item[0])))
+        self.stop_event = threading.Event()
+        self.error = None
+        self._threads = []
+
+    @staticmethod
+    def frames_in_flight(queue_size=1):
+        """
+        Maximum number of captured frames referenced at once: one per stage
+        plus the contents of both queues. With this many frame slots released
+        through release_fn, capture never has to drop a frame for lack of one.
+        """
+        return 3 + 2 * max(1, queue_size)
+
+    def _capture_loop(self):
+        try:
+            while not self.stop_event.is_set():
+                frame = self.capture_fn()
+                if frame is None:
+                    break
+                self.capture_queue.put_latest(frame)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.stop_event.set()
+
+    def _inference_loop(self):
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    frame = self.capture_queue.get(timeout=self.poll_timeout)
+                except queue.Empty:
+                    continue
+                analysis = self.inference_fn(frame)
+                self.result_queue.put_latest((frame, analysis))
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.stop_event.set()
+
+    def start(self):
+        """Start the capture and inference threads"""
+        self.stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=1.0):
+        """Signal all stages to stop and wait for the worker threads"""
+        self.stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run(self):
+        """
+        Run the pipeline until present_fn returns False or the source ends.
+
+        Raises:
+            Exception: Re-raises the first error hit by a worker thread
+        """
+        self.start()
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    frame, analysis = self.result_queue.get(timeout=self.poll_timeout)
+                except queue.Empty:
+                    continue
+                keep_running = self.present_fn(frame, analysis)
+                if self.release_fn is not None:
+                    self.release_fn(frame)
+                if keep_running is False:
+                    break
+        finally:
+            self.stop()
+        if self.error is not None:
+            raise self.error
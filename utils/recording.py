@@ -0,0 +1,462 @@
+"""
+Compact landmark recordings.
+
+A recording is an append-only binary file: a fixed 16-byte header followed by
+fixed-size records (RECORD_DTYPE), one per processed frame plus one per
+calibration attempt and, optionally, one per detector telemetry update. Fixed-size records let LandmarkRecording memory-map a
+file of any length and decode (T, 33, 4) landmark arrays without parsing.
+
+Landmarks are stored at reduced precision: x, y, z as float16 (about 0.0005
+of the image size near its edge, well under a pixel) and visibility as uint8.
+A record is 243 bytes, about 13 MB per 30-minute session at 30 fps (format
+version 1 stored float32 landmarks in 540-byte records; such files can still
+be read). Telemetry values and restored calibration states are stored as
+float32 in the same bytes (VALUES_DTYPE).
+
+This module only depends on NumPy so recordings can be replayed (and
+detectors re-run on them) without MediaPipe or OpenCV.
+"""
+import math
+import os
+import queue
+import struct
+import threading
+
+import numpy as np
+
+from utils.landmarks import NUM_LANDMARKS, NUM_FIELDS
+
+MAGIC = b"EXLM"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHHI4x")  # magic, version, header size, record size
+
+# Record kinds
+KIND_FRAME = 0
+KIND_CALIBRATION = 1
+KIND_TELEMETRY = 2  # detector telemetry values, stored flat at the start of the landmarks field
+
+# Record flags
+FLAG_HAS_POSE = 1  # landmarks are valid (NaN otherwise)
+FLAG_CALIBRATING = 2  # frame was captured while calibration was running
+FLAG_CALIBRATION_OK = 4  # calibration record: the detector accepted the calibration
+FLAG_PREDICTED = 8  # frame landmarks were extrapolated, pose inference was skipped
+# Calibration record: a saved profile was restored; the landmarks field holds the
+# restored calibration state (pack_calibration_state()) instead of landmarks
+FLAG_RESTORED = 16
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("kind", "u1"),
+    ("exercise_mode", "u1"),
+    ("flags", "u1"),
+    ("reserved", "u1"),
+    ("coords", "<f2", (NUM_LANDMARKS, 3)),  # x, y, z
+    ("visibility", "u1", (NUM_LANDMARKS,)),  # 0-255
+])
+# Same bytes as RECORD_DTYPE, the landmark block read as float32 values
+# (telemetry records, restored calibration states)
+VALUES_DTYPE = np.dtype({
+    "names": ["timestamp", "kind", "exercise_mode", "flags", "values"],
+    "formats": ["<f8", "u1", "u1", "u1", ("<f4", ((RECORD_DTYPE.itemsize - 12) // 4,))],
+    "offsets": [0, 8, 9, 10, 12],
+    "itemsize": RECORD_DTYPE.itemsize,
+})
+# Format version 1 (float32 landmarks), still readable
+RECORD_DTYPE_V1 = np.dtype([
+    ("timestamp", "<f8"),
+    ("kind", "u1"),
+    ("exercise_mode", "u1"),
+    ("flags", "u1"),
+    ("reserved", "u1"),
+    ("landmarks", "<f4", (NUM_LANDMARKS, NUM_FIELDS)),
+])
+RECORD_DTYPES = {1: RECORD_DTYPE_V1, FORMAT_VERSION: RECORD_DTYPE}
+
+def store_landmarks(records, landmarks):
+    """
+    Write landmarks into RECORD_DTYPE records at the recording precision
+
+    Args:
+        records: RECORD_DTYPE array (or a single record)
+        landmarks: (..., 33, 4) landmark array matching records' shape; NaN for no pose
+    """
+    landmarks = np.asarray(landmarks)
+    records["coords"] = landmarks[..., :3]
+    visibility = np.nan_to_num(landmarks[..., 3], nan=0.0)
+    records["visibility"] = np.rint(np.clip(visibility, 0.0, 1.0) * 255)
+
+def record_landmarks(records):
+    """
+    Decode the landmarks of records
+
+    Args:
+        records: RECORD_DTYPE array or record, or any record type with a float
+            "landmarks" field (RECORD_DTYPE_V1, network.protocol.PACKET_DTYPE)
+
+    Returns:
+        np.ndarray: (..., 33, 4) float32 landmarks; NaN where no pose was recorded
+    """
+    if "landmarks" in records.dtype.names:
+        return np.asarray(records["landmarks"])
+    coords = records["coords"]
+    landmarks = np.empty(coords.shape[:-1] + (NUM_FIELDS,), dtype=np.float32)
+    landmarks[..., :3] = coords
+    landmarks[..., 3] = records["visibility"]
+    landmarks[..., 3] *= 1.0 / 255
+    landmarks[..., 3][np.isnan(landmarks[..., 0])] = np.nan
+    return landmarks
+
+def record_values(records):
+    """
+    Flat float32 values of telemetry or restored-calibration records
+
+    Args:
+        records: RECORD_DTYPE array or record, or a record type with a "landmarks" field
+
+    Returns:
+        np.ndarray: (..., K) values; unused trailing values are NaN
+    """
+    if "landmarks" in records.dtype.names:
+        landmarks = np.asarray(records["landmarks"])
+        return landmarks.reshape(landmarks.shape[:-2] + (-1,))
+    return np.asarray(records).view(VALUES_DTYPE)["values"]
+
+def values_to_landmarks(values):
+    """Values stored flat in a NaN-padded (33, 4) float32 array, as they travel in landmark fields"""
+    packed = np.full((NUM_LANDMARKS, NUM_FIELDS), np.nan, dtype=np.float32)
+    packed.reshape(-1)[:len(values)] = values
+    return packed
+
+
+def pack_calibration_state(fields, state):
+    """
+    Store a detector's calibration state in a landmarks-shaped array, for restored-calibration records
+
+    Args:
+        fields: The detector's CALIBRATION_FIELDS
+        state: Dict returned by calibration_state()
+
+    Returns:
+        np.ndarray: (33, 4) float32 array, the values in field order followed by NaN
+    """
+    return values_to_landmarks([state.get(name, np.nan) for name in fields])
+
+def unpack_calibration_state(fields, packed):
+    """Inverse of pack_calibration_state(); unset (NaN) fields are left out"""
+    values = np.asarray(packed).reshape(-1)[:len(fields)].tolist()
+    return {name: value for name, value in zip(fields, values) if not math.isnan(value)}
+
+
+class LandmarkRecorder:
+    """
+    Append landmark frames and calibration events to a recording file.
+
+    Records are packed into a preallocated chunk on the calling thread (a few
+    field assignments per frame); full chunks are written by a background
+    thread so the frame loop never waits on disk.
+    """
+
+    def __init__(self, path, chunk_records=256):
+        """
+        Args:
+            path: Recording file; appended to if it already exists
+            chunk_records: Number of records buffered before a chunk is written
+        """
+        self.path = path
+        self.chunk_records = max(1, chunk_records)
+        if os.path.exists(path) and os.path.getsize(path):
+            # Appending is only possible to a recording in the current format
+            LandmarkRecording.read_header(path, versions=(FORMAT_VERSION,))
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, HEADER.size, RECORD_DTYPE.itemsize))
+        self._chunk = np.zeros(self.chunk_records, dtype=RECORD_DTYPE)
+        self._values = self._chunk.view(VALUES_DTYPE)["values"]
+        self._count = 0
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="landmark-recorder", daemon=True)
+        self._writer.start()
+        self.closed = False
+
+    def _write_loop(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            self._file.write(chunk.tobytes())
+            self._file.flush()
+
+    def _append(self, timestamp, kind, exercise_mode, flags, landmarks=None, values=None):
+        record = self._chunk[self._count]
+        record["timestamp"] = timestamp
+        record["kind"] = kind
+        record["exercise_mode"] = exercise_mode
+        record["flags"] = flags
+        if values is not None:
+            stored = self._values[self._count]
+            stored[:len(values)] = values
+            stored[len(values):] = np.nan
+        elif landmarks is None:
+            record["coords"] = np.nan
+            record["visibility"] = 0
+        else:
+            store_landmarks(record, landmarks)
+        self._count += 1
+        if self._count == self.chunk_records:
+            self.flush()
+
+    def record_frame(self, timestamp, landmarks, exercise_mode, calibrating=False, predicted=False):
+        """
+        Record one processed frame.
+
+        Args:
+            timestamp: Frame time in seconds
+            landmarks: (33, 4) landmark array, or None if no pose was found
+            exercise_mode: Active exercise mode
+            calibrating: True if calibration was running (detectors were not run)
+            predicted: True if the landmarks were extrapolated instead of inferred
+        """
+        flags = ((FLAG_HAS_POSE if landmarks is not None else 0) | (FLAG_CALIBRATING if calibrating else 0) |
+                 (FLAG_PREDICTED if predicted else 0))
+        self._append(timestamp, KIND_FRAME, exercise_mode, flags, landmarks)
+
+    def record_calibration(self, timestamp, landmarks, exercise_mode, success, restored_state=None):
+        """
+        Record a calibration attempt.
+
+        Args:
+            timestamp: Time of the attempt in seconds
+            landmarks: Landmarks the detector was calibrated with, or None if no body was found
+            exercise_mode: Exercise mode being calibrated
+            success: Whether the detector accepted the calibration
+            restored_state: Packed calibration state (pack_calibration_state()) when a
+                saved profile was restored instead; it is recorded in place of the landmarks
+        """
+        if restored_state is not None:
+            values = np.asarray(restored_state).reshape(-1)[:self._values.shape[1]]
+            self._append(timestamp, KIND_CALIBRATION, exercise_mode, FLAG_CALIBRATION_OK | FLAG_RESTORED,
+                         values=values)
+            return
+        flags = (FLAG_HAS_POSE if landmarks is not None else 0) | (FLAG_CALIBRATION_OK if success else 0)
+        self._append(timestamp, KIND_CALIBRATION, exercise_mode, flags, landmarks)
+
+    def record_telemetry(self, timestamp, exercise_mode, values):
+        """
+        Record one detector telemetry update.
+
+        Args:
+            timestamp: Frame time in seconds
+            exercise_mode: Exercise mode of the detector
+            values: 1-D array of telemetry values (DetectorTelemetry.values), at most
+                57 of them; NaN values mean the frame was not evaluated
+        """
+        self._append(timestamp, KIND_TELEMETRY, exercise_mode, 0, values=values)
+
+    def flush(self):
+        """Hand the records buffered so far to the writer thread"""
+        if self._count:
+            self._queue.put(self._chunk[:self._count].copy())
+            self._count = 0
+
+    def close(self):
+        """Write all pending records and close the file"""
+        if self.closed:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class LandmarkRecording:
+    """
+    Read-only, memory-mapped view of a recording file.
+
+    The record fields are exposed as array views (no copies); a trailing
+    partial record, e.g. from a crash mid-write, is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        version, header_size = self.read_header(path)
+        dtype = RECORD_DTYPES[version]
+        num_records = (os.path.getsize(path) - header_size) // dtype.itemsize
+        if num_records:
+            self.records = np.memmap(path, dtype=dtype, mode="r", offset=header_size, shape=(num_records,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+
+    @staticmethod
+    def read_header(path, versions=tuple(RECORD_DTYPES)):
+        """
+        Check a recording's header
+
+        Args:
+            path: Recording file
+            versions: Format versions accepted
+
+        Returns:
+            tuple: (format version, header size)
+
+        Raises:
+            ValueError: If the file is not a recording in one of the accepted versions
+        """
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a landmark recording (file too short)")
+        magic, version, header_size, record_size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a landmark recording")
+        if version not in versions or record_size != RECORD_DTYPES[version].itemsize:
+            raise ValueError(f"{path} uses unsupported recording format version {version}")
+        return version, header_size
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp"]
+
+    @property
+    def kinds(self):
+        return self.records["kind"]
+
+    @property
+    def exercise_modes(self):
+        return self.records["exercise_mode"]
+
+    @property
+    def flags(self):
+        return self.records["flags"]
+
+    @property
+    def landmarks(self):
+        """(N, 33, 4) decoded landmarks of every record; NaN where no pose was recorded"""
+        return record_landmarks(self.records)
+
+    def frame_indices(self, exercise_mode=None):
+        """Indices of frame records, optionally limited to one exercise mode"""
+        mask = self.kinds == KIND_FRAME
+        if exercise_mode is not None:
+            mask &= self.exercise_modes == exercise_mode
+        return np.flatnonzero(mask)
+
+    def calibration_indices(self):
+        """Indices of calibration records"""
+        return np.flatnonzero(self.kinds == KIND_CALIBRATION)
+
+    def telemetry(self, exercise_mode, num_fields):
+        """
+        Detector telemetry recorded for one exercise mode
+
+        Args:
+            exercise_mode: Exercise mode of the detector
+            num_fields: Number of telemetry fields (len(detector.TELEMETRY_FIELDS))
+
+        Returns:
+            tuple: (timestamps, values) - (N,) timestamps and (N, num_fields) values
+        """
+        indices = np.flatnonzero((self.kinds == KIND_TELEMETRY) & (self.exercise_modes == exercise_mode))
+        return self.timestamps[indices], record_values(self.records[indices])[:, :num_fields]
+
+
+def replay_session(recording, detectors, key_points_fn=None):
+    """
+    Re-run detectors over a recording the way the live app would have.
+
+    The recording is split into runs at calibration events and exercise mode
+    changes. A mode change gives that mode a fresh detector (as
+    change_exercise_mode does), successful calibration events re-calibrate it
+    with the recorded landmarks (or restore the recorded saved profile), and
+    failed ones leave it as it was, and each run is scored with one detect_batch() call on
+    the frames the live loop would have passed to detect().
+
+    Args:
+        recording: LandmarkRecording (or a path to one)
+        detectors: Dict mapping exercise mode -> detector; updated in place
+        key_points_fn: Optional callable(landmarks, exercise_mode) returning the key
+            points passed to calibrate(), as the live app does with
+            PoseGuide().extract_key_points
+
+    Returns:
+        list: One dict per scored run with exercise_mode, start, end (timestamps),
+            count (detector counter at the end of the run) and rep_times
+    """
+    if not isinstance(recording, LandmarkRecording):
+        recording = LandmarkRecording(recording)
+    return replay_records(recording.records, detectors, key_points_fn)
+
+
+def replay_records(records, detectors, key_points_fn=None, previous_mode=None):
+    """
+    Score a block of consecutive records, as replay_session() does for a whole recording.
+
+    Args:
+        records: Structured array with timestamp, kind, exercise_mode and flags
+            fields plus landmarks (RECORD_DTYPE, RECORD_DTYPE_V1 or network.protocol.PACKET_DTYPE)
+        detectors: Dict mapping exercise mode -> detector; updated in place
+        key_points_fn: As in replay_session()
+        previous_mode: Exercise mode of the record preceding the block, when the
+            block continues an earlier one (a different first mode resets its detector)
+
+    Returns:
+        list: Scored runs as in replay_session()
+    """
+    if len(records) == 0:
+        return []
+
+    kinds = np.asarray(records["kind"])
+    modes = np.asarray(records["exercise_mode"])
+    flags = np.asarray(records["flags"])
+    timestamps = records["timestamp"]
+
+    boundaries = np.flatnonzero((kinds == KIND_CALIBRATION) | (np.diff(modes, prepend=modes[0] + 1) != 0))
+    boundaries = np.append(boundaries, len(kinds))
+
+    runs = []
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        mode = int(modes[start])
+        if mode != previous_mode and previous_mode is not None and mode in detectors:
+            detectors[mode] = type(detectors[mode])()
+        previous_mode = mode
+        detector = detectors.get(mode)
+
+        if kinds[start] == KIND_CALIBRATION:
+            # Failed attempts left the live detector untouched
+            if detector is not None and flags[start] & FLAG_CALIBRATION_OK:
+                if flags[start] & FLAG_RESTORED:
+                    detector.restore_calibration(unpack_calibration_state(detector.CALIBRATION_FIELDS,
+                                                                          record_values(records[start])))
+                elif flags[start] & FLAG_HAS_POSE:
+                    calibration_landmarks = np.array(record_landmarks(records[start]))
+                    key_points = key_points_fn(calibration_landmarks, mode) if key_points_fn else None
+                    detector.calibrate(calibration_landmarks, key_points)
+            start += 1
+
+        if detector is None or not getattr(detector, "calibrated", False):
+            continue
+        run_flags = flags[start:end]
+        scored = np.flatnonzero((kinds[start:end] == KIND_FRAME) &
+                                ((run_flags & FLAG_HAS_POSE) != 0) &
+                                ((run_flags & FLAG_CALIBRATING) == 0)) + start
+        if not len(scored):
+            continue
+        # Only the scored frames are decoded, one run at a time
+        _, rep_indices, count = detector.detect_batch(record_landmarks(records[scored]))
+        runs.append({
+            "exercise_mode": mode,
+            "start": float(timestamps[scored[0]]),
+            "end": float(timestamps[scored[-1]]),
+            "count": count,
+            "rep_times": timestamps[scored[rep_indices]].tolist(),
+        })
+    return runs
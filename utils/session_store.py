@@ -0,0 +1,325 @@
+"""
+Session analytics store.
+
+Every counted rep (with its duration and the detector's KEY_ANGLE range),
+every calibration result and a per-exercise summary of each session are
+persisted to a local SQLite database in WAL mode, so a user's history can be
+queried across sessions.
+
+Writes never happen on the frame or event threads: on_event() and the other
+record methods only put a row on a bounded queue. A background writer thread
+owns the write connection and commits the queued rows in batches - one
+transaction per batch_size rows or flush_interval seconds, whichever comes
+first. When the writer falls behind the queue fills up and further reps are
+dropped (and counted) instead of growing memory. close() flushes everything
+still queued.
+
+The query helpers open their own read connections; with WAL they never block
+(and are never blocked by) the writer.
+"""
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import uuid
+from contextlib import closing
+
+from utils.events import RepCompleted, CalibrationFinished
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    user TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    total_reps INTEGER
+);
+CREATE TABLE IF NOT EXISTS reps (
+    session_id TEXT NOT NULL,
+    user TEXT NOT NULL,
+    person INTEGER,
+    timestamp REAL NOT NULL,
+    exercise TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    duration REAL,
+    angle_min REAL,
+    angle_max REAL
+);
+CREATE TABLE IF NOT EXISTS calibrations (
+    session_id TEXT NOT NULL,
+    user TEXT NOT NULL,
+    person INTEGER,
+    timestamp REAL NOT NULL,
+    exercise TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    calibration_values TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_summaries (
+    session_id TEXT NOT NULL,
+    user TEXT NOT NULL,
+    person INTEGER,
+    exercise TEXT NOT NULL,
+    reps INTEGER NOT NULL,
+    avg_duration REAL,
+    angle_min REAL,
+    angle_max REAL,
+    first_rep_at REAL,
+    last_rep_at REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_user ON sessions (user, started_at);
+CREATE INDEX IF NOT EXISTS reps_user ON reps (user, timestamp);
+CREATE INDEX IF NOT EXISTS reps_user_exercise ON reps (user, exercise, timestamp);
+CREATE INDEX IF NOT EXISTS reps_session ON reps (session_id);
+CREATE INDEX IF NOT EXISTS calibrations_user ON calibrations (user, exercise, timestamp);
+CREATE INDEX IF NOT EXISTS summaries_user ON session_summaries (user, exercise);
+"""
+
+INSERT_SESSION = "INSERT INTO sessions (id, user, started_at) VALUES (?, ?, ?)"
+INSERT_REP = ("INSERT INTO reps (session_id, user, person, timestamp, exercise, count, duration, angle_min, "
+              "angle_max) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+INSERT_CALIBRATION = ("INSERT INTO calibrations (session_id, user, person, timestamp, exercise, success, "
+                      "calibration_values) VALUES (?, ?, ?, ?, ?, ?, ?)")
+# Summarizes the session's reps per exercise and person, then closes the session row
+INSERT_SUMMARY = """
+INSERT INTO session_summaries
+SELECT session_id, user, person, exercise, COUNT(*), AVG(duration), MIN(angle_min), MAX(angle_max),
+       MIN(timestamp), MAX(timestamp)
+FROM reps WHERE session_id = ? GROUP BY person, exercise
+"""
+END_SESSION = ("UPDATE sessions SET ended_at = ?, total_reps = (SELECT COUNT(*) FROM reps WHERE session_id = ?) "
+               "WHERE id = ?")
+
+
+class SessionStore:
+    """
+    SQLite history of reps, calibrations and session summaries with a batched
+    background writer.
+
+    Usage:
+        store = SessionStore("sessions.db")
+        store.start_session(user)
+        system.events.subscribe(store.on_event, kinds=(RepCompleted, CalibrationFinished))
+        ...
+        store.close()
+        store.exercise_aggregates(user)
+    """
+
+    def __init__(self, path, batch_size=64, flush_interval=1.0, max_pending=10000):
+        """
+        Args:
+            path: SQLite database file; created with its tables and indexes if missing
+            batch_size: Most rows written per transaction
+            flush_interval: Longest time in seconds a queued row waits for its transaction
+            max_pending: Rows that may be queued for the writer before reps are dropped
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_id = None
+        self.user = None
+        self.dropped = 0
+        with closing(sqlite3.connect(path)) as conn:
+            # WAL is a property of the database file and persists for every later connection
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        self._queue = queue.Queue(max_pending)
+        self._writer = threading.Thread(target=self._run, name="session-store", daemon=True)
+        self._writer.start()
+
+    def start_session(self, user, started_at=None):
+        """
+        Begin a session; later reps and calibrations are stored under it
+
+        Args:
+            user: User the session belongs to
+            started_at: Epoch seconds (default: now)
+
+        Returns:
+            str: The new session ID
+        """
+        if self.session_id is not None:
+            self.end_session()
+        self.session_id = uuid.uuid4().hex
+        self.user = user
+        self._queue.put((INSERT_SESSION, (self.session_id, user, started_at or time.time())))
+        return self.session_id
+
+    def end_session(self, ended_at=None):
+        """Summarize the current session per exercise and close it"""
+        if self.session_id is None:
+            return
+        self._queue.put((INSERT_SUMMARY, (self.session_id,)))
+        self._queue.put((END_SESSION, (ended_at or time.time(), self.session_id, self.session_id)))
+        self.session_id = None
+
+    def record_rep(self, event):
+        """Queue a RepCompleted event without blocking"""
+        if self.session_id is None:
+            return
+        self._offer((INSERT_REP, (self.session_id, self.user, event.person, event.timestamp, event.detector,
+                                  event.count, event.duration, event.angle_min, event.angle_max)))
+
+    def record_calibration(self, event):
+        """Queue a CalibrationFinished event without blocking"""
+        if self.session_id is None:
+            return
+        values = json.dumps({name: float(value) for name, value in event.values.items()})
+        self._offer((INSERT_CALIBRATION, (self.session_id, self.user, event.person, event.timestamp,
+                                          event.detector, int(event.success), values)))
+
+    def on_event(self, event):
+        """EventBus consumer storing reps and calibration results"""
+        if isinstance(event, RepCompleted):
+            self.record_rep(event)
+        elif isinstance(event, CalibrationFinished):
+            self.record_calibration(event)
+
+    def _offer(self, row):
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        conn = sqlite3.connect(self.path)
+        # WAL + NORMAL: a commit doesn't fsync, a crash can only lose the last transactions
+        conn.execute("PRAGMA synchronous=NORMAL")
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                running = False
+            try:
+                self._write(conn, batch)
+            except sqlite3.Error:
+                print(f"[SESSIONS] writing {len(batch)} rows failed:", file=sys.stderr)
+                traceback.print_exc()
+        conn.close()
+
+    @staticmethod
+    def _write(conn, batch):
+        # One transaction per batch; consecutive rows of the same statement go through one executemany()
+        with conn:
+            start = 0
+            for end in range(1, len(batch) + 1):
+                if end == len(batch) or batch[end][0] != batch[start][0]:
+                    conn.executemany(batch[start][0], [params for _, params in batch[start:end]])
+                    start = end
+
+    def close(self, timeout=None):
+        """End the current session, write everything still queued and stop the writer"""
+        self.end_session()
+        self._queue.put(None)
+        self._writer.join(timeout)
+        if self.dropped:
+            print(f"[SESSIONS] {self.dropped} rows dropped (writer fell behind)", file=sys.stderr)
+
+    def _query(self, sql, params=()):
+        with closing(sqlite3.connect(self.path)) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def user_sessions(self, user, limit=20):
+        """
+        A user's most recent sessions
+
+        Returns:
+            list: Dicts with id, started_at, ended_at and total_reps, newest first
+        """
+        return self._query("SELECT id, started_at, ended_at, total_reps FROM sessions WHERE user = ? "
+                           "ORDER BY started_at DESC LIMIT ?", (user, limit))
+
+    def rep_history(self, user, exercise=None, since=None, limit=1000):
+        """
+        A user's individual reps
+
+        Args:
+            user: User to look up
+            exercise: Optional detector name (e.g. "Squats") to filter by
+            since: Optional epoch seconds; only later reps are returned
+            limit: Most reps returned
+
+        Returns:
+            list: Dicts with timestamp, exercise, session_id, person, count, duration,
+                angle_min and angle_max, newest first
+        """
+        sql = ("SELECT timestamp, exercise, session_id, person, count, duration, angle_min, angle_max "
+               "FROM reps WHERE user = ?")
+        params = [user]
+        if exercise is not None:
+            sql += " AND exercise = ?"
+            params.append(exercise)
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        return self._query(sql + " ORDER BY timestamp DESC LIMIT ?", params + [limit])
+
+    def daily_totals(self, user, exercise=None, days=30):
+        """
+        A user's reps per local calendar day and exercise
+
+        Args:
+            user: User to look up
+            exercise: Optional detector name to filter by
+            days: Number of days back from now to include
+
+        Returns:
+            list: Dicts with day ("YYYY-MM-DD"), exercise, reps and avg_duration, oldest first
+        """
+        sql = ("SELECT date(timestamp, 'unixepoch', 'localtime') AS day, exercise, COUNT(*) AS reps, "
+               "AVG(duration) AS avg_duration FROM reps WHERE user = ? AND timestamp >= ?")
+        params = [user, time.time() - days * 86400]
+        if exercise is not None:
+            sql += " AND exercise = ?"
+            params.append(exercise)
+        return self._query(sql + " GROUP BY day, exercise ORDER BY day, exercise", params)
+
+    def exercise_aggregates(self, user, since=None):
+        """
+        A user's totals per exercise over all (or recent) sessions
+
+        Returns:
+            list: Dicts with exercise, sessions, reps, avg_duration, min_duration,
+                angle_min, angle_max, first_rep_at and last_rep_at
+        """
+        sql = ("SELECT exercise, COUNT(DISTINCT session_id) AS sessions, COUNT(*) AS reps, "
+               "AVG(duration) AS avg_duration, MIN(duration) AS min_duration, MIN(angle_min) AS angle_min, "
+               "MAX(angle_max) AS angle_max, MIN(timestamp) AS first_rep_at, MAX(timestamp) AS last_rep_at "
+               "FROM reps WHERE user = ?")
+        params = [user]
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        return self._query(sql + " GROUP BY exercise ORDER BY exercise", params)
+
+    def session_summaries(self, session_id):
+        """Per-exercise summary rows of a finished session"""
+        return self._query("SELECT person, exercise, reps, avg_duration, angle_min, angle_max, first_rep_at, "
+                           "last_rep_at FROM session_summaries WHERE session_id = ? ORDER BY exercise",
+                           (session_id,))
+
+    def calibration_history(self, user, exercise=None, limit=100):
+        """
+        A user's calibration results, newest first
+
+        Returns:
+            list: Dicts with timestamp, exercise, success and values (dict)
+        """
+        sql = "SELECT timestamp, exercise, success, calibration_values FROM calibrations WHERE user = ?"
+        params = [user]
+        if exercise is not None:
+            sql += " AND exercise = ?"
+            params.append(exercise)
+        rows = self._query(sql + " ORDER BY timestamp DESC LIMIT ?", params + [limit])
+        return [{"timestamp": row["timestamp"], "exercise": row["exercise"], "success": bool(row["success"]),
+                 "values": json.loads(row["calibration_values"])} for row in rows]
@@ -0,0 +1,111 @@
+"""
+Shared-memory frame rings for passing images between processes.
+
+A ring is one multiprocessing.shared_memory block holding a small header and
+`slots` fixed-size frames. The writer fills the next slot in place (e.g. by
+passing it to cv2.VideoCapture.read() or as a dst= argument) and publishes it;
+readers look at the newest published slot directly in shared memory, so frames
+are never pickled or copied through a pipe.
+
+A published slot is only rewritten after slots - 1 newer frames have been
+published, so a reader must be done with a frame within that many frame
+periods (valid() tells whether it was overwritten meanwhile).
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+class SharedFrameRing:
+    """Single-writer, multi-reader ring of same-sized frames in shared memory"""
+
+    def __init__(self, shm, shape, slots, owner):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.owner = owner
+        # Header: sequence number of the newest published frame, then the sequence
+        # number held by each slot (0 = empty or being written)
+        self._header = np.ndarray((1 + slots,), dtype=np.int64, buffer=shm.buf)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=shm.buf,
+                                 offset=self._header.nbytes)
+        self._next_seq = int(self._header[0]) + 1
+
+    @classmethod
+    def create(cls, shape, slots=4):
+        """
+        Allocate a new ring
+
+        Args:
+            shape: Frame shape, e.g. (height, width, 3)
+            slots: Number of frames in the ring (at least 2)
+
+        Returns:
+            SharedFrameRing: The ring; call unlink() when every process is done with it
+        """
+        slots = max(2, slots)
+        size = 8 * (1 + slots) + slots * int(np.prod(shape))
+        ring = cls(shared_memory.SharedMemory(create=True, size=size), shape, slots, owner=True)
+        ring._header[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name, shape, slots):
+        """Open a ring created by another process (arguments as in spec)"""
+        return cls(shared_memory.SharedMemory(name=name), shape, slots, owner=False)
+
+    @property
+    def spec(self):
+        """(name, shape, slots), picklable arguments for attach()"""
+        return self.shm.name, self.shape, self.slots
+
+    def next_slot(self):
+        """
+        Claim the slot the next frame goes into (writer only)
+
+        Returns:
+            tuple: (slot index, writable frame view) - pass the index to publish()
+        """
+        index = self._next_seq % self.slots
+        self._header[1 + index] = 0
+        return index, self.frames[index]
+
+    def publish(self, index):
+        """Make the frame written into a slot the newest one (writer only)"""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._header[1 + index] = seq
+        self._header[0] = seq
+
+    def write(self, frame):
+        """Copy a frame into the next slot and publish it"""
+        index, slot = self.next_slot()
+        np.copyto(slot, frame)
+        self.publish(index)
+
+    def latest(self):
+        """
+        Newest published frame
+
+        Returns:
+            tuple: (sequence number, frame view in shared memory - do not modify), or (0, None)
+                before the first frame
+        """
+        seq = int(self._header[0])
+        if seq == 0:
+            return 0, None
+        return seq, self.frames[seq % self.slots]
+
+    def valid(self, seq):
+        """True while the frame with sequence number seq has not been overwritten"""
+        return int(self._header[1 + seq % self.slots]) == seq
+
+    def close(self):
+        """Detach this process from the ring"""
+        # The views must go before the buffer can be released
+        self._header = None
+        self.frames = None
+        self.shm.close()
+
+    def unlink(self):
+        """Free the shared memory (creator only, after every process has closed it)"""
+        self.shm.unlink()
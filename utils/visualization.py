@@ -1,12 +1,49 @@
 import cv2
+import numpy as np
 
-def draw_landmarks(frame, pose_landmarks, mp_pose, mp_drawing):
-    """Draw skeleton landmarks on the frame"""
-    mp_drawing.draw_landmarks(
-        frame, pose_landmarks, mp_pose.POSE_CONNECTIONS,
-        mp_drawing.DrawingSpec(color=(245, 117, 66), thickness=2, circle_radius=2),
-        mp_drawing.DrawingSpec(color=(245, 66, 230), thickness=2, circle_radius=2)
-    )
+from utils.compositor import darken_region, put_text
+from utils.landmarks import POSE_CONNECTIONS, NOSE, X, Y, VISIBILITY
+
+LANDMARK_COLOR = (245, 117, 66)
+CONNECTION_COLOR = (245, 66, 230)
+VISIBILITY_THRESHOLD = 0.5
+
+def draw_landmarks(frame, landmarks):
+    """
+    Draw skeleton landmarks on the frame
+
+    Args:
+        frame: BGR frame to draw on
+        landmarks: (33, 4) landmark array from utils.landmarks
+    """
+    if landmarks is None:
+        return frame
+    height, width = frame.shape[:2]
+    xs = landmarks[:, X]
+    ys = landmarks[:, Y]
+    # Same rules as MediaPipe's drawing utils: skip low-visibility and off-frame points
+    drawable = ((landmarks[:, VISIBILITY] >= VISIBILITY_THRESHOLD) &
+                (xs >= 0.0) & (xs <= 1.0) & (ys >= 0.0) & (ys <= 1.0))
+    px = np.minimum(xs * width, width - 1).astype(np.int32).tolist()
+    py = np.minimum(ys * height, height - 1).astype(np.int32).tolist()
+    drawable = drawable.tolist()
+
+    for start, end in POSE_CONNECTIONS:
+        if drawable[start] and drawable[end]:
+            cv2.line(frame, (px[start], py[start]), (px[end], py[end]), CONNECTION_COLOR, 2)
+    for i, visible in enumerate(drawable):
+        if visible:
+            cv2.circle(frame, (px[i], py[i]), 3, (255, 255, 255), 2)
+            cv2.circle(frame, (px[i], py[i]), 2, LANDMARK_COLOR, 2)
+    return frame
+
+def draw_person_label(frame, track_id, count, landmarks):
+    """Draw a tracked person's ID and rep count above their head"""
+    height, width = frame.shape[:2]
+    x = int(landmarks[NOSE, X] * width) - 30
+    y = int(landmarks[:, Y].min() * height) - 15
+    put_text(frame, f"#{track_id}: {count}", (max(0, x), max(25, y)),
+             cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
     return frame
 
 def draw_exercise_info(frame, exercise_name, count, stage):
@@ -25,6 +62,14 @@ def draw_calibration_status(frame, status_message):
                 (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2, cv2.LINE_AA)
     return frame
 
+def draw_message_bar(frame, message, bar_height=80):
+    """Draw a message on a darkened strip along the bottom of the frame"""
+    frame_height = frame.shape[0]
+    darken_region(frame, frame_height - bar_height, frame_height, alpha=0.6)
+    put_text(frame, message, (20, frame_height - 40), cv2.FONT_HERSHEY_SIMPLEX,
+             1.0, (255, 255, 255), 2, cv2.LINE_AA)
+    return frame
+
 def display_controls(frame):
     """Display control instructions on the frame"""
     cv2.putText(frame, "Press 'm' to change exercise mode", 
@@ -33,4 +78,23 @@ def display_controls(frame):
                 (10, frame.shape[0] - 40), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
     cv2.putText(frame, "Press 'q' to quit", 
                 (10, frame.shape[0] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
-    return frame
\ No newline at end of file
+    return frame
+
+def draw_performance_panel(canvas, x, y, timings):
+    """
+    Draw FPS and per-stage p50/p95/p99 latencies from a StageTimer
+
+    Returns:
+        int: y coordinate below the last line drawn
+    """
+    fps, stages = timings.summary()
+    cv2.putText(canvas, f"Performance: {fps:.1f} FPS", (x, y),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 200, 255), 2)
+    y += 25
+    cv2.putText(canvas, "stage  p50 / p95 / p99 ms", (x, y),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (180, 180, 180), 1)
+    for stage, (p50, p95, p99) in stages.items():
+        y += 22
+        cv2.putText(canvas, f"{stage}: {p50:.1f} / {p95:.1f} / {p99:.1f}", (x, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    return y + 10
\ No newline at end of file